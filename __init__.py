@@ -54,7 +54,10 @@ def register():
     from ocvl_addon.core.register_utils import reload_ocvl_modules
     from ocvl_addon.operatores import select_area
     from ocvl_addon.core import initial_handlers
-    reload_ocvl_modules()
+    from ocvl_addon.core import settings
+    if settings.DEBUG:
+        # Development only, reload of every module make start slow
+        reload_ocvl_modules()
     node_tree.register()
     sockets.register()
     operatores.register()
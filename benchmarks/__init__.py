@@ -0,0 +1,10 @@
+"""
+Benchmarks of nodes without Blender, Blender modules are replaced by ocvl.runtime.shim.
+
+    python -m ocvl_addon.benchmarks blur Canny --resolutions 256,1024 --output results.json
+    python -m ocvl_addon.benchmarks --compare results.json
+
+Report is JSON with environment (Python, numpy, OpenCV versions) and for every case and resolution
+statistics of process, wrapped_process and profiling phases in milliseconds, so runs of different releases
+can be compared (--compare).
+"""
@@ -0,0 +1,51 @@
+"""
+Command line: python -m ocvl_addon.benchmarks --resolutions 256,1024 --output results.json --compare baseline.json
+"""
+import argparse
+import sys
+
+from ocvl.benchmarks.cases import CASES, find_cases
+from ocvl.benchmarks.harness import compare_reports, load_report, run_benchmarks, save_report
+
+
+def print_result(result):
+    if "error" in result:
+        print("{case:>16} {resolution:>6}  error: {error}".format(**result), file=sys.stderr)
+        return
+    phases = result["phases"]
+    print("{:>16} {:>6}  process {:9.3f}ms  wrapped {:9.3f}ms  overhead {:7.3f}ms  "
+          "inputs {:7.3f}  cv {:9.3f}  outputs {:7.3f}  python {:7.3f}".format(
+              result["case"], result["resolution"], result["process"]["median"], result["wrapped_process"]["median"],
+              result["overhead_median"], *(phases[phase]["median"] for phase in ("inputs", "cv", "outputs", "python"))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="ocvl.benchmarks", description="Benchmark OCVL nodes without Blender.")
+    parser.add_argument("cases", nargs="*", help="Names of cases, default all: {}".format(
+        ", ".join(case.name for case in CASES)))
+    parser.add_argument("--resolutions", default="256,1024", help="Comma separated sides of square images.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", help="Save report to JSON file.")
+    parser.add_argument("--compare", help="Compare medians with report from JSON file.")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Relative change reported by --compare.")
+    args = parser.parse_args(argv)
+
+    resolutions = [int(value) for value in args.resolutions.split(",") if value]
+    report = run_benchmarks(find_cases(args.cases), resolutions, repeat=args.repeat, warmup=args.warmup,
+                            on_result=print_result)
+    if args.output:
+        save_report(report, args.output)
+
+    regressions = 0
+    if args.compare:
+        for case, resolution, old, new, ratio, status in compare_reports(load_report(args.compare), report,
+                                                                         threshold=args.threshold):
+            regressions += status == "regression"
+            print("{:>16} {:>6}  {:9.3f}ms -> {:9.3f}ms  x{:.2f}  {}".format(case, resolution, old, new, ratio, status))
+    errors = sum("error" in result for result in report["results"])
+    return 1 if errors or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Benchmark cases: node class, properties and generators of synthetic inputs for resolution.
+"""
+import cv2
+import numpy as np
+
+
+def grid_image(resolution, layers=3):
+    from ocvl.core.image_utils import gen_image_grid
+    return gen_image_grid(width=resolution, height=resolution, layers=layers, grid_width=max(resolution // 20, 1),
+                          grid_height=max(resolution // 20, 1))
+
+
+def gray_image(resolution):
+    return cv2.cvtColor(grid_image(resolution), cv2.COLOR_BGR2GRAY)
+
+
+def noise_image(resolution, layers=3):
+    return np.random.RandomState(resolution).randint(0, 256, (resolution, resolution, layers), dtype=np.uint8)
+
+
+class BenchmarkCase:
+    """
+    :param name: <string> name of case in report
+    :param bl_idname: <string> node class
+    :param module: <string> path of node file relative to addon
+    :param inputs: <dict> input socket name -> function(resolution) -> value
+    :param properties: <dict> node properties set after init
+    """
+
+    def __init__(self, name, bl_idname, module, inputs, properties=None):
+        self.name = name
+        self.bl_idname = bl_idname
+        self.module = module
+        self.inputs = inputs
+        self.properties = properties or {}
+
+    def make_inputs(self, resolution):
+        return {socket_name: make(resolution) for socket_name, make in self.inputs.items()}
+
+
+CASES = [
+    BenchmarkCase("blur", "OCVLblurNode", "nodes/imgproc/image_filtering/cv_blur.py",
+                  {"src_in": grid_image}, {"ksize_in": (5, 5)}),
+    BenchmarkCase("GaussianBlur", "OCVLGaussianBlurNode", "nodes/imgproc/image_filtering/cv_GaussianBlur.py",
+                  {"src_in": grid_image}, {"ksize_in": (5, 5)}),
+    BenchmarkCase("medianBlur", "OCVLmedianBlurNode", "nodes/imgproc/image_filtering/cv_medianBlur.py",
+                  {"src_in": noise_image}),
+    BenchmarkCase("bilateralFilter", "OCVLbilateralFilterNode", "nodes/imgproc/image_filtering/cv_bilateralFilter.py",
+                  {"src_in": noise_image}),
+    BenchmarkCase("dilate", "OCVLdilateNode", "nodes/imgproc/image_filtering/cv_dilate.py",
+                  {"src_in": grid_image, "kernel_in": lambda resolution: np.ones((3, 3), np.uint8)}),
+    BenchmarkCase("cvtColor", "OCVLcvtColorNode", "nodes/imgproc/misc_transformation/cv_cvtColor.py",
+                  {"src_in": grid_image}),
+    BenchmarkCase("threshold", "OCVLthresholdNode", "nodes/imgproc/misc_transformation/cv_threshold.py",
+                  {"src_in": noise_image}),
+    BenchmarkCase("Canny", "OCVLCannyNode", "nodes/imgproc/feature_detection/cv_Canny.py",
+                  {"image_in": gray_image}),
+    BenchmarkCase("equalizeHist", "OCVLequalizeHistNode", "nodes/imgproc/histograms/cv_equalizeHist.py",
+                  {"src_in": gray_image}),
+    BenchmarkCase("findContours", "OCVLfindContoursNode", "nodes/imgproc/structrural_analisis/cv_findContours.py",
+                  {"image_in": gray_image}),
+    BenchmarkCase("resize", "OCVLresizeNode", "nodes/imgproc/geom_transformation/cv_resize.py",
+                  {"src_in": grid_image}),
+    BenchmarkCase("warpAffine", "OCVLwarpAffineNode", "nodes/imgproc/geom_transformation/cv_warpAffine.py",
+                  {"src_in": grid_image, "M_in": lambda resolution: np.float32([[1, 0, 10], [0, 1, 5]])}),
+    BenchmarkCase("addWeighted", "OCVLaddWeightedNode", "nodes/core/cv_addWeighted.py",
+                  {"src1_in": grid_image, "src2_in": noise_image}),
+]
+
+
+def find_cases(names=None):
+    if not names:
+        return list(CASES)
+    cases = [case for case in CASES if case.name in names]
+    missing = set(names) - {case.name for case in cases}
+    if missing:
+        raise KeyError("Unknown benchmark cases: {}".format(", ".join(sorted(missing))))
+    return cases
@@ -0,0 +1,215 @@
+"""
+Benchmark harness: node classes from nodes/ are instantiated without Blender (ocvl.runtime.shim),
+inputs are fed from synthetic data and every run is timed.
+
+For every case and resolution harness measure:
+process - OCVLNodeBase.process_single (fingerprint, requirements, wrapped_process, state),
+wrapped_process - node work alone,
+phases - split of process from ocvl.core.profiling (inputs, cv, outputs, python).
+"""
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from ocvl.core.profiling import PHASES
+from ocvl.core.socket_cache import new_data_handle
+from ocvl.runtime import shim
+
+
+FEED_NODE_NAME = "Feed"
+
+
+class FeedNode:
+    """Stand-in upstream node, its outputs keep synthetic inputs for node under benchmark."""
+
+    def __init__(self, node_tree):
+        from ocvl.runtime.graph import HeadlessSockets
+        self.name = FEED_NODE_NAME
+        self.bl_idname = FEED_NODE_NAME
+        self.id_data = node_tree
+        self.inputs = HeadlessSockets(self, is_output=False)
+        self.outputs = HeadlessSockets(self, is_output=True)
+
+    def feed(self, node, socket_name, value):
+        from ocvl.core import globals as ocvl_globals
+        socket = self.outputs.get(socket_name)
+        if socket is None:
+            socket = self.outputs.new("OCVLImageSocket", socket_name)
+            self.id_data.links.new(socket, node.inputs[socket_name])
+        if isinstance(value, np.ndarray):
+            uuid_ = new_data_handle()
+            ocvl_globals.SOCKET_DATA_CACHE.set(uuid_, value, tree=self.id_data.name, node=self.name, refs=1)
+            socket.sv_set(uuid_)
+        else:
+            socket.sv_set([[value]])
+
+
+def summarize(values):
+    """:return: <dict> statistics of seconds in milliseconds"""
+    values = sorted(values)
+    return {
+        "min": values[0] * 1000,
+        "median": statistics.median(values) * 1000,
+        "mean": statistics.mean(values) * 1000,
+        "p90": values[min(int(round(0.9 * (len(values) - 1))), len(values) - 1)] * 1000,
+        "max": values[-1] * 1000,
+    }
+
+
+def create_bench_node(case, tree_name):
+    """
+    Node from case on own headless tree, outputs are exposed so they are published like linked ones.
+
+    :return: (<OCVLNodeBase> node, <FeedNode> feed)
+    """
+    from ocvl.runtime.graph import HeadlessNodeTree, create_node
+    node_tree = HeadlessNodeTree(tree_name)
+    node_data = {"name": case.name, "bl_idname": case.bl_idname, "module": case.module}
+    node = create_node(node_tree, node_data)
+    node_tree.nodes.append(node)
+    node.init(None)
+    for prop_name, value in case.properties.items():
+        node.__dict__[prop_name] = value
+    for socket in node.outputs:
+        socket.is_exposed = True
+    feed = FeedNode(node_tree)
+    return node, feed
+
+
+def run_case(case, resolution, repeat, warmup):
+    """
+    :return: <dict> result of case for resolution
+    """
+    from ocvl.core import globals as ocvl_globals
+    tree_name = "bench_{}_{}".format(case.name, resolution)
+    node, feed = create_bench_node(case, tree_name)
+    for socket_name, value in case.make_inputs(resolution).items():
+        feed.feed(node, socket_name, value)
+
+    ocvl_globals.NODE_PROFILES.pop(node.node_key, None)
+    for _ in range(warmup):
+        node.process_single(force=True)
+    if node.n_error:
+        ocvl_globals.SOCKET_DATA_CACHE.drop_tree(tree_name)
+        return {"case": case.name, "resolution": resolution, "error": node.n_error}
+
+    ocvl_globals.NODE_PROFILES.pop(node.node_key, None)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        process_times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            node.process_single(force=True)
+            process_times.append(time.perf_counter() - start)
+
+        profile = ocvl_globals.NODE_PROFILES.get(node.node_key)
+        phases = {}
+        if profile is not None and profile.records:
+            phases = {phase: summarize([record.phases[phase] for record in profile.records]) for phase in PHASES}
+
+        wrapped_times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            node.wrapped_process()
+            wrapped_times.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    process = summarize(process_times)
+    wrapped = summarize(wrapped_times)
+    result = {
+        "case": case.name,
+        "node": case.bl_idname,
+        "resolution": resolution,
+        "repeat": repeat,
+        "process": process,
+        "wrapped_process": wrapped,
+        "overhead_median": process["median"] - wrapped["median"],
+        "phases": phases,
+    }
+    ocvl_globals.SOCKET_DATA_CACHE.drop_tree(tree_name)
+    ocvl_globals.NODE_PROFILES.pop(node.node_key, None)
+    ocvl_globals.NODE_FINGERPRINTS.pop(node.node_key, None)
+    return result
+
+
+def get_environment():
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "opencv_threads": cv2.getNumThreads(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_benchmarks(cases, resolutions, repeat=20, warmup=3, on_result=None):
+    """
+    :param cases: <list> BenchmarkCase
+    :param resolutions: <list> <int> side of square image
+    :return: <dict> report for JSON
+    """
+    shim.install()
+    from ocvl.core import settings
+    settings.IS_HEADLESS = True
+    settings.IS_NODE_PROFILING = True
+    # Repeated runs with the same inputs would be served from memo of node
+    settings.IS_NODE_MEMO = False
+
+    results = []
+    for case in cases:
+        for resolution in resolutions:
+            try:
+                result = run_case(case, resolution, repeat, warmup)
+            except Exception as e:
+                result = {"case": case.name, "resolution": resolution, "error": "{}: {}".format(type(e).__name__, e)}
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    return {"format": "ocvl-benchmark", "version": 1, "environment": get_environment(),
+            "settings": {"repeat": repeat, "warmup": warmup, "resolutions": list(resolutions)},
+            "results": results}
+
+
+def save_report(report, filepath):
+    with open(filepath, "w") as f:
+        json.dump(report, f, indent=1)
+
+
+def load_report(filepath):
+    with open(filepath) as f:
+        return json.load(f)
+
+
+def compare_reports(baseline, current, metric="process", threshold=0.1):
+    """
+    Compare median times of two reports.
+
+    :param threshold: <float> relative change reported as regression or improvement
+    :return: <list> (case, resolution, baseline ms, current ms, ratio, status)
+    """
+    baseline_results = {(result["case"], result["resolution"]): result
+                        for result in baseline["results"] if "error" not in result}
+    rows = []
+    for result in current["results"]:
+        key = result["case"], result["resolution"]
+        if "error" in result or key not in baseline_results:
+            continue
+        old = baseline_results[key][metric]["median"]
+        new = result[metric]["median"]
+        ratio = new / old if old > 0 else float("inf")
+        status = "regression" if ratio > 1 + threshold else "improvement" if ratio < 1 - threshold else "same"
+        rows.append((key[0], key[1], old, new, ratio, status))
+    return rows
@@ -0,0 +1,259 @@
+"""
+Asynchronous processing of node trees.
+
+With OCVLNodeTree.use_async_process change of node property (update_node) don't block Blender UI:
+pass of scheduler runs on background thread, like worker thread it holds BATON only in nodes and
+defers writes to Blender data. After every level deferred writes are applied on main thread by
+bpy.app.timers callback, so downstream nodes read published outputs.
+
+Newer change supersedes pass in progress: pass is cancelled before next node, writes of its current level
+are discarded and new pass starts with roots of both. Call of cv2 function can't be stopped, its result
+is discarded. Nodes waiting for result have NODE_COLOR_COMPUTING color.
+
+Nodes which are not parallel safe (previews, nodes changing their sockets) are processed on main thread by
+timer callback, pass thread waits for them (see ocvl.core.parallel.run_on_main_thread). Edits of tree on main
+thread (links, removed nodes) cancel pass in progress (cancel_pass), it is started again with the same roots.
+
+Tasks are kept in OCVL_REGISTERED_TASKS (ocvl.core.globals), key tree name.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+import bpy
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.exceptions import ProcessCancelledException
+from ocvl.core.parallel import BATON, async_thread, holding_baton
+from ocvl.core.scheduler import collect_downstream, get_scheduler, is_processable
+
+
+logger = getLogger(__name__)
+
+
+EXECUTOR_KEY = "async_executor"
+
+_timer = {"is_registered": False}
+
+
+def get_async_executor():
+    executor = ocvl_globals.THREAD_WORKERS.get(EXECUTOR_KEY)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocvl_async")
+        ocvl_globals.THREAD_WORKERS[EXECUTOR_KEY] = executor
+    return executor
+
+
+def is_computing_color(color):
+    return all(abs(a - b) < 1e-3 for a, b in zip(color, settings.NODE_COLOR_COMPUTING))
+
+
+class AsyncTreeTask:
+    """
+    Asynchronous passes of one node tree.
+
+    :param generation: <int> incremented by every change, pass of older generation is cancelled
+    :param roots: <set> names of changed nodes not processed yet
+    :param computing: <set> names of nodes with computing color
+    :param batches: <list> (deferred writes, event) of levels waiting for main thread
+    """
+
+    def __init__(self, tree_name):
+        self.tree_name = tree_name
+        self.generation = 0
+        self.pass_generation = None
+        self.pass_roots = set()
+        self.roots = set()
+        self.computing = set()
+        self.batches = []
+        self.future = None
+        self.is_closed = False
+        self.lock = threading.Lock()
+        self.stats = {"passes": 0, "cancelled": 0}
+
+    @property
+    def is_running(self):
+        return self.future is not None
+
+    def is_cancelled(self):
+        return self.is_closed or self.pass_generation != self.generation
+
+    def get_node_tree(self):
+        return bpy.data.node_groups.get(self.tree_name)
+
+    def schedule(self, names):
+        """Called on main thread when nodes changed."""
+        self.generation += 1
+        self.roots.update(names)
+        self._mark_computing(names)
+        if self.future is None:
+            self._start()
+        register_timer()
+
+    def _mark_computing(self, names):
+        node_tree = self.get_node_tree()
+        if node_tree is None:
+            return
+        nodes = [node_tree.nodes[name] for name in names if name in node_tree.nodes]
+        for name, node in collect_downstream(nodes)[0].items():
+            if not is_processable(node):
+                continue
+            node.use_custom_color = True
+            node.color = settings.NODE_COLOR_COMPUTING
+            self.computing.add(name)
+
+    def _clear_computing(self):
+        node_tree = self.get_node_tree()
+        for name in self.computing:
+            node = node_tree.nodes.get(name) if node_tree is not None else None
+            # Processed nodes have own state already, skipped nodes keep their last result
+            if node is not None and node.use_custom_color and is_computing_color(node.color):
+                node.use_custom_color = False
+        self.computing.clear()
+
+    def _start(self):
+        self.pass_generation = self.generation
+        self.pass_roots = set(self.roots)
+        self.stats["passes"] += 1
+        self.future = get_async_executor().submit(self._run_pass, self.pass_roots)
+
+    def _run_pass(self, roots):
+        with async_thread(self):
+            with holding_baton():
+                node_tree = self.get_node_tree()
+                if node_tree is None:
+                    return
+                nodes = [node_tree.nodes[name] for name in roots if name in node_tree.nodes]
+            try:
+                get_scheduler(node_tree).process_many(nodes)
+            except ProcessCancelledException:
+                # Writes of cancelled level are discarded, fingerprints of its nodes are not valid
+                for name in collect_downstream(nodes)[0]:
+                    ocvl_globals.NODE_FINGERPRINTS.pop((self.tree_name, name), None)
+                raise
+
+    def apply_on_main_thread(self, deferred):
+        """Called by pass thread after level, wait until main thread apply deferred writes or discard them."""
+        event = threading.Event()
+        with self.lock:
+            self.batches.append((deferred, event))
+        while not event.wait(0.1):
+            if self.is_closed:
+                return
+
+    def poll(self):
+        """
+        Called on main thread by timer.
+
+        :return: <bool> True while task has work
+        """
+        with self.lock:
+            batches, self.batches = self.batches, []
+        for deferred, event in batches:
+            if not self.is_cancelled():
+                with BATON:
+                    for fn, args, kwargs in deferred:
+                        try:
+                            fn(*args, **kwargs)
+                        except Exception:
+                            logger.exception("Deferred write of asynchronous pass fail, tree: {}".format(self.tree_name))
+            event.set()
+
+        if self.future is not None and self.future.done():
+            error = self.future.exception()
+            self.future = None
+            if isinstance(error, ProcessCancelledException):
+                self.stats["cancelled"] += 1
+            else:
+                if error is not None:
+                    logger.error("Asynchronous pass fail, tree: {}, error: {}".format(self.tree_name, error))
+                self.roots -= self.pass_roots
+            self.pass_roots = set()
+
+        if self.future is None:
+            if self.roots and not self.is_closed:
+                self._start()
+            else:
+                self._clear_computing()
+                return False
+        return True
+
+    def cancel(self):
+        """Pass in progress is stopped before next node, roots stay for next pass."""
+        self.generation += 1
+
+    def close(self):
+        self.is_closed = True
+        with self.lock:
+            batches, self.batches = self.batches, []
+        for _, event in batches:
+            event.set()
+
+
+def get_task(tree_name):
+    task = ocvl_globals.OCVL_REGISTERED_TASKS.get(tree_name)
+    if task is None:
+        task = ocvl_globals.OCVL_REGISTERED_TASKS[tree_name] = AsyncTreeTask(tree_name)
+    return task
+
+
+def is_tree_busy(tree_name):
+    task = ocvl_globals.OCVL_REGISTERED_TASKS.get(tree_name)
+    return task is not None and task.is_running
+
+
+def cancel_pass(tree_name):
+    """
+    Called on main thread before or after edit of tree. BATON is taken, so pass is not in Python part of node,
+    after it pass don't read nodes and links of tree anymore.
+    """
+    task = ocvl_globals.OCVL_REGISTERED_TASKS.get(tree_name)
+    if task is None or not task.is_running:
+        return
+    with BATON:
+        task.cancel()
+    register_timer()
+
+
+def schedule_nodes(node_tree, nodes):
+    """Process nodes and downstream on background thread, called on main thread."""
+    scheduler = get_scheduler(node_tree)
+    if scheduler.is_running and not is_tree_busy(node_tree.name):
+        # Change made by node in synchronous pass, processed by that pass
+        scheduler.process_many(nodes)
+        return
+    get_task(node_tree.name).schedule([node.name for node in nodes])
+
+
+def schedule_process(node):
+    schedule_nodes(node.id_data, [node])
+
+
+def register_timer():
+    if _timer["is_registered"]:
+        return
+    _timer["is_registered"] = True
+    bpy.app.timers.register(_poll_tasks, first_interval=settings.ASYNC_POLL_INTERVAL)
+
+
+def _poll_tasks():
+    is_active = False
+    for task in list(ocvl_globals.OCVL_REGISTERED_TASKS.values()):
+        is_active = task.poll() or is_active
+    if is_active:
+        return settings.ASYNC_POLL_INTERVAL
+    _timer["is_registered"] = False
+    return None
+
+
+def shutdown_async():
+    for task in ocvl_globals.OCVL_REGISTERED_TASKS.values():
+        task.close()
+    executor = ocvl_globals.THREAD_WORKERS.pop(EXECUTOR_KEY, None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+    ocvl_globals.OCVL_REGISTERED_TASKS.clear()
+    if _timer["is_registered"] and bpy.app.timers.is_registered(_poll_tasks):
+        bpy.app.timers.unregister(_poll_tasks)
+    _timer["is_registered"] = False
@@ -0,0 +1,97 @@
+"""
+Call plans of node classes.
+
+get_from_props of not linked property and clean_kwargs repeat the same decisions for every process:
+kind of property value, conversion of enum item to cv2 constant, of color to BGR tuple, name of keyword
+argument. Plan of class keeps resolver chosen for every property and cleaned names of keyword arguments,
+so per call work is dict lookup and conversion cached by value.
+
+Plan is built on first use of property, from its value like get_from_props did it before (bl_rna of
+headless runtime don't describe size or subtype of property). Module don't import bpy.
+"""
+import cv2
+import numpy as np
+
+
+MAX_CACHED_VALUES = 4096
+
+sentinel = object()
+
+_constants = {}
+_colors = {}
+
+
+def resolve_value(value):
+    return value
+
+
+def resolve_tuple(value):
+    return tuple(value)
+
+
+def resolve_constant(value):
+    """Enum item (example 'BORDER_DEFAULT') to cv2 constant, other strings unchanged."""
+    constant = _constants.get(value, sentinel)
+    if constant is sentinel:
+        constant = getattr(cv2, value, value)
+        if len(_constants) >= MAX_CACHED_VALUES:
+            _constants.clear()
+        _constants[value] = constant
+    return constant
+
+
+def resolve_color(value):
+    """RGBA property to BGR tuple in 0-255 range."""
+    value = tuple(value)
+    color = _colors.get(value)
+    if color is None:
+        color = tuple(np.array([value[2], value[1], value[0]]) * 255)
+        if len(_colors) >= MAX_CACHED_VALUES:
+            _colors.clear()
+        _colors[value] = color
+    return color
+
+
+def choose_resolver(key, value, is_color=False):
+    if isinstance(value, (int, float, bool, type(None))):
+        return resolve_value
+    if isinstance(value, str):
+        return resolve_constant
+    if len(value) == 4 and ("color" in key.lower() or is_color):
+        return resolve_color
+    return resolve_tuple
+
+
+def get_kwarg_name(key):
+    return key.replace("_in", "")
+
+
+class CallPlan:
+    """
+    :param resolvers: <dict> (property name, is_color) -> resolver of property value
+    :param kwarg_names: <dict> key of kwargs passed to process_cv -> name of argument of cv2 function
+    """
+
+    def __init__(self):
+        self.resolvers = {}
+        self.kwarg_names = {}
+
+    def resolve(self, node, key, is_color=False):
+        value = getattr(node, key, None)
+        resolver = self.resolvers.get((key, is_color))
+        if resolver is None:
+            resolver = self.resolvers[(key, is_color)] = choose_resolver(key, value, is_color)
+        return resolver(value)
+
+    def get_kwarg_name(self, key):
+        name = self.kwarg_names.get(key)
+        if name is None:
+            name = self.kwarg_names[key] = get_kwarg_name(key)
+        return name
+
+
+def get_call_plan(cls):
+    plan = cls.__dict__.get("_call_plan")
+    if plan is None:
+        plan = cls._call_plan = CallPlan()
+    return plan
@@ -0,0 +1,295 @@
+"""
+Persistent on-disk cache of node results, shared between sessions.
+
+Key of entry is Merkle-style hash of node: class, resolved properties (without output properties and UUIDs of
+socket data, they differ in every session), salt of node (get_content_salt, example:
+modification time of image file) and hashes of upstream nodes with names of linked sockets. Node which
+is not reproducible (n_always_process, random content) and every node downstream of it has no hash.
+
+Entry is directory with one .npy file for every array output (loaded memory-mapped, read only) and
+pickled other outputs. Only results of nodes processed longer than settings.DISK_CACHE_MIN_SECONDS are
+stored, writes are made on background thread. Entries are evicted least recently used first when
+cache is bigger than settings.DISK_CACHE_MAX_BYTES.
+
+Module don't import bpy.
+"""
+import hashlib
+import os
+import pickle
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+import cv2
+import numpy as np
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.link_index import get_upstream_socket
+
+
+logger = getLogger(__name__)
+
+
+FORMAT_VERSION = 1
+META_FILENAME = "meta.pkl"
+EXECUTOR_KEY = "disk_cache_writer"
+
+_disk_cache = {"instance": None}
+
+
+def get_upstream(socket):
+    """:return: (<node>, <string> output socket name) linked to input socket, reroutes collapsed, or None"""
+    from_socket = get_upstream_socket(socket)
+    if from_socket is None:
+        return None
+    return from_socket.node, from_socket.name
+
+
+def freeze_property(value):
+    """Value of property stable between sessions, ValueError if property can't be part of hash."""
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    try:
+        return tuple(freeze_property(item) for item in value)
+    except TypeError:
+        raise ValueError("Property value {} can't be hashed".format(type(value)))
+
+
+def get_content_hash(node, hashes=None, visiting=None):
+    """
+    Merkle hash of node.
+
+    :param hashes: <dict> node name -> hash, shared by nodes of one pass of scheduler
+    :return: <string> hex digest or None if result of node is not reproducible
+    """
+    hashes = {} if hashes is None else hashes
+    visiting = set() if visiting is None else visiting
+    if node.name in hashes:
+        return hashes[node.name]
+    if node.name in visiting or not hasattr(node, "get_content_salt") or node.n_always_process:
+        return None
+    visiting.add(node.name)
+    try:
+        salt = node.get_content_salt()
+        if salt is None:
+            return None
+        output_names = {output.name for output in node.outputs}
+        props = []
+        for prop_name in node._get_fingerprint_props():
+            if prop_name in output_names or node._is_linked(prop_name):
+                continue
+            value = getattr(node, prop_name, None)
+            if isinstance(value, str) and node.is_uuid(value):
+                continue
+            try:
+                props.append((prop_name, freeze_property(value)))
+            except ValueError:
+                return None
+        upstream = []
+        for socket in node.inputs:
+            linked = get_upstream(socket)
+            if linked is None:
+                continue
+            from_node, from_socket_name = linked
+            from_hash = get_content_hash(from_node, hashes, visiting)
+            if from_hash is None:
+                return None
+            upstream.append((socket.name, from_hash, from_socket_name))
+        content = (FORMAT_VERSION, cv2.__version__, node.bl_idname, node.n_module_path, tuple(props), salt, tuple(upstream))
+        digest = hashlib.sha1(repr(content).encode("utf-8")).hexdigest()
+    finally:
+        visiting.discard(node.name)
+    hashes[node.name] = digest
+    return digest
+
+
+def capture_outputs(node):
+    """:return: <list> (output name, is UUID data, value) of linked outputs"""
+    outputs = []
+    for output in node.outputs:
+        if not output.is_linked:
+            continue
+        value = getattr(node, output.name, None)
+        if isinstance(value, str) and node.is_uuid(value):
+            if value not in node.socket_data_cache:
+                return None
+            outputs.append((output.name, True, node.socket_data_cache[value]))
+        else:
+            outputs.append((output.name, False, value))
+    return outputs
+
+
+class DiskCache:
+    """
+    :param root: <string> directory of cache
+    :param max_bytes: <int> size of cache on disk
+    :param index: <dict> key -> [bytes, last use time], loaded from directory on first use
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index = None
+        self.lock = threading.RLock()
+        self.stats = {"hits": 0, "stores": 0, "evicted": 0}
+
+    def _path(self, key):
+        return os.path.join(self.root, key)
+
+    def _load_index(self):
+        if self.index is not None:
+            return
+        self.index = {}
+        if not os.path.isdir(self.root):
+            return
+        for entry in os.scandir(self.root):
+            meta_path = os.path.join(entry.path, META_FILENAME)
+            if not entry.is_dir() or not os.path.exists(meta_path):
+                continue
+            size = sum(item.stat().st_size for item in os.scandir(entry.path) if item.is_file())
+            self.index[entry.name] = [size, os.path.getmtime(meta_path)]
+
+    def __contains__(self, key):
+        with self.lock:
+            self._load_index()
+            return key in self.index
+
+    def total_bytes(self):
+        with self.lock:
+            self._load_index()
+            return sum(size for size, _ in self.index.values())
+
+    def load(self, key):
+        """:return: <list> (output name, is UUID data, value) or None"""
+        if key not in self:
+            return None
+        path = self._path(key)
+        try:
+            with open(os.path.join(path, META_FILENAME), "rb") as f:
+                meta = pickle.load(f)
+            outputs = []
+            for name, is_uuid_type, filename, value in meta["outputs"]:
+                if filename:
+                    value = np.load(os.path.join(path, filename), mmap_mode="r", allow_pickle=False)
+                outputs.append((name, is_uuid_type, value))
+        except Exception as e:
+            logger.warning("Disk cache entry {} broken: {}".format(key, e))
+            self.remove(key)
+            return None
+        with self.lock:
+            if key in self.index:
+                self.index[key][1] = time.time()
+            self.stats["hits"] += 1
+        try:
+            os.utime(os.path.join(path, META_FILENAME))
+        except OSError:
+            pass
+        return outputs
+
+    def store(self, key, outputs):
+        """Write entry, called on background thread."""
+        path = self._path(key)
+        tmp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+        try:
+            os.makedirs(tmp_path)
+            meta_outputs = []
+            for index, (name, is_uuid_type, value) in enumerate(outputs):
+                if isinstance(value, np.ndarray) and value.dtype != object:
+                    filename = "{}.npy".format(index)
+                    np.save(os.path.join(tmp_path, filename), value, allow_pickle=False)
+                    meta_outputs.append((name, is_uuid_type, filename, None))
+                else:
+                    meta_outputs.append((name, is_uuid_type, None, value))
+            with open(os.path.join(tmp_path, META_FILENAME), "wb") as f:
+                pickle.dump({"version": FORMAT_VERSION, "outputs": meta_outputs}, f)
+            size = sum(item.stat().st_size for item in os.scandir(tmp_path))
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            # Not picklable outputs (example: cv2 objects), full disk
+            logger.info("Disk cache entry {} not stored: {}".format(key, e))
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return
+        with self.lock:
+            self._load_index()
+            self.index[key] = [size, time.time()]
+            self.stats["stores"] += 1
+            self.evict()
+
+    def evict(self):
+        with self.lock:
+            total = self.total_bytes()
+            for key, (size, _) in sorted(self.index.items(), key=lambda item: item[1][1]):
+                if total <= self.max_bytes:
+                    break
+                self.remove(key)
+                total -= size
+                self.stats["evicted"] += 1
+
+    def remove(self, key):
+        with self.lock:
+            if self.index is not None:
+                self.index.pop(key, None)
+        # Memory-mapped arrays of entry in use stay valid on POSIX, on Windows removal can fail
+        shutil.rmtree(self._path(key), ignore_errors=True)
+
+    def clear(self):
+        with self.lock:
+            self._load_index()
+            for key in list(self.index):
+                self.remove(key)
+
+
+def get_disk_cache():
+    if _disk_cache["instance"] is None:
+        _disk_cache["instance"] = DiskCache(settings.DISK_CACHE_DIR, settings.DISK_CACHE_MAX_BYTES)
+    return _disk_cache["instance"]
+
+
+def get_writer():
+    executor = ocvl_globals.THREAD_WORKERS.get(EXECUTOR_KEY)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocvl_disk_cache")
+        ocvl_globals.THREAD_WORKERS[EXECUTOR_KEY] = executor
+    return executor
+
+
+def is_disk_cacheable(node):
+    # Runtime without Blender (batch, pipeline) process new inputs, its results are not stored
+    return settings.IS_DISK_CACHE and not settings.IS_HEADLESS and node.n_disk_cache and not node.n_always_process
+
+
+def restore_node(node, key):
+    """
+    Publish outputs of node from disk cache.
+
+    :return: <bool> True if outputs were restored
+    """
+    outputs = get_disk_cache().load(key)
+    if outputs is None:
+        return False
+    linked = {output.name for output in node.outputs if output.is_linked}
+    if not linked <= {name for name, _, _ in outputs}:
+        return False
+    for name, is_uuid_type, value in outputs:
+        if name in linked:
+            node.refresh_output_socket(name, value, is_uuid_type=is_uuid_type)
+    return True
+
+
+def store_node(node, key):
+    """Write linked outputs of node to disk cache on background thread."""
+    outputs = capture_outputs(node)
+    if outputs:
+        get_writer().submit(get_disk_cache().store, key, outputs)
+
+
+def shutdown_disk_cache():
+    executor = ocvl_globals.THREAD_WORKERS.pop(EXECUTOR_KEY, None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+    _disk_cache["instance"] = None
@@ -12,3 +12,8 @@ class LackRequiredTypeDataSocketException(OCVLNodeException):
 
 class IncorrectTypeInStringSocketException(OCVLNodeException):
     pass
+
+
+class ProcessCancelledException(Exception):
+    """Asynchronous pass of node tree superseded by newer change, see ocvl.core.async_process."""
+    pass
@@ -1,5 +1,9 @@
+from collections import OrderedDict
+
 import cv2
 
+from ocvl.core.socket_cache import create_socket_data_cache
+
 cv2.DAISY_NRM_NONE = cv2.xfeatures2d.DAISY_NRM_NONE
 cv2.DAISY_NRM_PARTIAL = cv2.xfeatures2d.DAISY_NRM_PARTIAL
 cv2.DAISY_NRM_FULL = cv2.xfeatures2d.DAISY_NRM_FULL
@@ -7,8 +11,15 @@ cv2.DAISY_NRM_SIFT = cv2.xfeatures2d.DAISY_NRM_SIFT
 
 # For OCVLPreviewNodeBase common texture cache
 TEXTURE_CACHE = {}
+# Preview textures shared by nodes, key (socket data UUID, version, width, height) or node id, see ocvl.core.preview_textures
+PREVIEW_TEXTURES = {}
 # For OCVLNodeBase common data socket cache
-SOCKET_DATA_CACHE = {}
+SOCKET_DATA_CACHE = create_socket_data_cache()
+# Pixels of bpy.data.images as ndarrays, key image name, least recently used first,
+# bounded by settings.BLENDER_IMAGE_CACHE_BUDGET, see ocvl.core.image_utils.read_blender_pixels
+BLENDER_IMAGE_CACHE = OrderedDict()
+# Counters of pixel updates of bpy.data.images, key image name
+IMAGE_UPDATE_COUNTERS = {}
 # For draw_handler_add callback cache
 CALLBACK_DICT = {}
 # Video capture for default camera
@@ -19,7 +30,25 @@ FEATURE2D_INSTANCES_DICT = {}
 DESCRIPTORMATCHER_INSTANCES_DICT = {}
 # Dict to keep workers, daemons and threads
 THREAD_WORKERS = {}
-# Registered tasks for ioloop
+# Resolved links of node trees, key tree name, see ocvl.core.link_index
+LINK_INDEXES = {}
+# Topological schedulers for node trees
+TREE_SCHEDULERS = {}
+# Fingerprints of inputs from last successful process, key (tree name, node name)
+NODE_FINGERPRINTS = {}
+# Profiles of node runs, key (tree name, node name), see ocvl.core.profiling
+NODE_PROFILES = {}
+# Last results of nodes with n_memo_size, key (tree name, node name), see ocvl.core.memo
+NODE_MEMOS = {}
+# Images decoded ahead by batch runner for OCVLImageSampleNode, key file path
+PREFETCHED_IMAGES = {}
+# Nodes with property updates waiting for end of burst, key (tree name, node name), see ocvl.core.update_queue
+PENDING_UPDATES = {}
+# Names of trees queued for evaluation after load of file, in order of evaluation, see ocvl.core.load_planner
+PENDING_LOAD_TREES = []
+# Names of trees not shown in node editors after load of file, evaluated when they are shown
+HIDDEN_LOAD_TREES = []
+# Asynchronous passes of node trees, key tree name, see ocvl.core.async_process
 OCVL_REGISTERED_TASKS = {}
 #
 OCVL_REQUEST_RESPONSE = {}
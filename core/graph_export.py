@@ -0,0 +1,174 @@
+"""
+Portable JSON format of OCVL node tree.
+
+Graph keep nodes (class, module file, resolved properties, sockets), links between real sockets
+(reroutes collapsed) and reroutes only for information. Runtime from ocvl.runtime load graph
+and process it without Blender.
+
+Module don't import bpy on module level, so runtime can use load_graph.
+
+{
+    "format": "ocvl-graph",
+    "version": 1,
+    "name": "NodeTree",
+    "nodes": [{"name", "bl_idname", "addon", "module", "location", "properties", "inputs", "outputs"}],
+    "links": [{"from_node", "from_socket", "to_node", "to_socket"}],
+    "reroutes": [{"name", "location", "from": [node, socket] or None, "to": [[node, socket], ...]}]
+}
+"""
+import json
+from logging import getLogger
+
+from ocvl.core.scheduler import REROUTE_NODE_IDNAME, is_reroute
+
+
+logger = getLogger(__name__)
+
+
+GRAPH_FORMAT_NAME = "ocvl-graph"
+GRAPH_FORMAT_VERSION = 1
+
+# Properties added by register_node and runtime state of node, not part of graph
+SKIP_EXPORT_PROPS = ("n_id", "n_meta", "n_error", "n_error_line", "rna_type", "name", "label")
+SKIP_EXPORT_PROP_TYPES = ("POINTER", "COLLECTION")
+
+
+class GraphFormatException(Exception):
+    pass
+
+
+def export_value(value):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    try:
+        return [export_value(item) for item in value]
+    except TypeError:
+        return None
+
+
+def export_properties(node):
+    properties = {}
+    for prop in node.bl_rna.properties:
+        if not prop.is_runtime or prop.identifier in SKIP_EXPORT_PROPS or prop.type in SKIP_EXPORT_PROP_TYPES:
+            continue
+        try:
+            properties[prop.identifier] = export_value(getattr(node, prop.identifier))
+        except AttributeError as e:
+            logger.debug("Property {} of {} not exported: {}".format(prop.identifier, node.name, e))
+    return properties
+
+
+def resolve_image_filepath(node, properties):
+    """Image from Blender data is not available outside Blender, export path of its file instead."""
+    name_image = properties.get("loc_name_image")
+    if not name_image or properties.get("loc_filepath"):
+        return
+    import bpy
+    image = bpy.data.images.get(name_image)
+    if image is not None and image.filepath_raw:
+        properties["loc_filepath"] = bpy.path.abspath(image.filepath_raw)
+
+
+def export_sockets(sockets):
+    return [{"name": socket.name, "identifier": socket.identifier, "bl_idname": socket.bl_idname,
+             "prop_name": getattr(socket, "prop_name", "")} for socket in sockets]
+
+
+def export_node(node):
+    cls = node.__class__
+    properties = export_properties(node)
+    resolve_image_filepath(node, properties)
+    return {
+        "name": node.name,
+        "label": node.label,
+        "bl_idname": node.bl_idname,
+        "addon": getattr(cls, "n_addon_module", None),
+        "module": getattr(cls, "n_module_path", None),
+        "location": list(node.location),
+        "width": node.width,
+        "properties": properties,
+        "inputs": export_sockets(node.inputs),
+        "outputs": export_sockets(node.outputs),
+    }
+
+
+def resolve_from_socket(link):
+    """First real output socket upstream of link, None if reroute chain is not connected."""
+    socket = link.from_socket
+    while is_reroute(socket.node):
+        input_socket = socket.node.inputs[0]
+        if not input_socket.is_linked or not input_socket.links:
+            return None
+        socket = input_socket.links[0].from_socket
+    return socket
+
+
+def export_links(node_tree):
+    links = []
+    for link in node_tree.links:
+        if is_reroute(link.to_node):
+            continue
+        from_socket = resolve_from_socket(link)
+        if from_socket is None:
+            continue
+        links.append({
+            "from_node": from_socket.node.name,
+            "from_socket": from_socket.name,
+            "to_node": link.to_node.name,
+            "to_socket": link.to_socket.name,
+        })
+    return links
+
+
+def export_reroutes(node_tree):
+    reroutes = []
+    for node in node_tree.nodes:
+        if node.bl_idname != REROUTE_NODE_IDNAME:
+            continue
+        input_links = node.inputs[0].links
+        reroutes.append({
+            "name": node.name,
+            "location": list(node.location),
+            "from": [input_links[0].from_node.name, input_links[0].from_socket.name] if input_links else None,
+            "to": [[link.to_node.name, link.to_socket.name] for link in node.outputs[0].links],
+        })
+    return reroutes
+
+
+def export_node_tree(node_tree):
+    """
+    Export node tree to dict in portable graph format.
+
+    :param node_tree: <OCVLNodeTree> node tree
+    :return: <dict> graph
+    """
+    return {
+        "format": GRAPH_FORMAT_NAME,
+        "version": GRAPH_FORMAT_VERSION,
+        "name": node_tree.name,
+        "nodes": [export_node(node) for node in node_tree.nodes if node.bl_idname != REROUTE_NODE_IDNAME and
+                  hasattr(node, "wrapped_process")],
+        "links": export_links(node_tree),
+        "reroutes": export_reroutes(node_tree),
+    }
+
+
+def check_graph(graph):
+    if graph.get("format") != GRAPH_FORMAT_NAME:
+        raise GraphFormatException("Unknown graph format: {}".format(graph.get("format")))
+    if graph.get("version", 0) > GRAPH_FORMAT_VERSION:
+        raise GraphFormatException("Graph version {} is newer than supported {}".format(
+            graph.get("version"), GRAPH_FORMAT_VERSION))
+    return graph
+
+
+def save_graph(graph, filepath):
+    with open(filepath, "w") as graph_file:
+        json.dump(graph, graph_file, indent=2)
+
+
+def load_graph(filepath):
+    with open(filepath) as graph_file:
+        return check_graph(json.load(graph_file))
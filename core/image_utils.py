@@ -8,7 +8,8 @@ import bgl
 import numpy as np
 from gpu_extras.batch import batch_for_shader
 
-from ocvl.core.globals import CALLBACK_DICT
+from ocvl.core import settings
+from ocvl.core.globals import BLENDER_IMAGE_CACHE, CALLBACK_DICT, IMAGE_UPDATE_COUNTERS
 from ocvl.core.scene_utils import filter_areas
 
 
@@ -25,7 +26,13 @@ def tag_redraw_all_nodeviews():
 
 def extract_bind_code(node):
     try:
-        return node.texture[node.node_id]['name'][0]
+        entry = node.texture[node.node_id]
+        preview = entry.get("texture")
+        if preview is not None:
+            # Preview prepared on worker thread is uploaded here, where GL context is active
+            preview.upload()
+            entry["name"] = preview.name
+        return entry['name'][0] if entry['name'] is not None else 0
     except (KeyError, IndexError) as e:
         logger.error("Node {} hasn't bide texture.".format(node))
         raise
@@ -69,15 +76,105 @@ def callback_disable(n_id):
     tag_redraw_all_nodeviews()
 
 
+def get_dtype_scale(dtype):
+    """Value of full intensity: maximum of integer types, 255 for float images (OpenCV convention of nodes)."""
+    dtype = np.dtype(dtype)
+    if dtype.kind in "ui":
+        return float(np.iinfo(dtype).max)
+    if dtype == np.bool_:
+        return 1.
+    return 255.
+
+
+def get_image_update_counter(name):
+    return IMAGE_UPDATE_COUNTERS.get(name, 0)
+
+
+def bump_image_update_counter(name):
+    """Pixels of Blender image changed, cached arrays of image are stale."""
+    IMAGE_UPDATE_COUNTERS[name] = IMAGE_UPDATE_COUNTERS.get(name, 0) + 1
+
+
+def get_image_cache_bytes(entry):
+    return entry["pixels"].nbytes + sum(image.nbytes for image in entry["images"].values())
+
+
+def drop_blender_image(name):
+    """Arrays of removed or renamed image are released."""
+    BLENDER_IMAGE_CACHE.pop(name, None)
+    IMAGE_UPDATE_COUNTERS.pop(name, None)
+
+
+def prune_blender_image_cache(budget=None):
+    """
+    Drop entries of images no longer in bpy.data.images, next least recently used entries over budget.
+    The most recently used entry is kept even if it is alone over budget.
+    """
+    budget = settings.BLENDER_IMAGE_CACHE_BUDGET if budget is None else budget
+    images = getattr(bpy.data, "images", None)
+    if images is not None:
+        for name in [name for name in BLENDER_IMAGE_CACHE if images.get(name) is None]:
+            drop_blender_image(name)
+    total = sum(get_image_cache_bytes(entry) for entry in BLENDER_IMAGE_CACHE.values())
+    while total > budget and len(BLENDER_IMAGE_CACHE) > 1:
+        _, entry = BLENDER_IMAGE_CACHE.popitem(last=False)
+        total -= get_image_cache_bytes(entry)
+
+
+def read_blender_pixels(image_gl):
+    """
+    Pixels of Blender image read by foreach_get into preallocated buffer, reused while size is unchanged.
+
+    :param image_gl: <bpy.types.Image>
+    :return: <ndarray> float32 (height, width, channels), 0-1, first row is bottom of image, read only
+    """
+    name = image_gl.name
+    counter = get_image_update_counter(name)
+    width, height = image_gl.size
+    shape = height, width, image_gl.channels
+    entry = BLENDER_IMAGE_CACHE.get(name)
+    if entry is not None and entry["pixels"].shape == shape:
+        if entry["counter"] == counter:
+            BLENDER_IMAGE_CACHE.move_to_end(name)
+            return entry["pixels"]
+        pixels = entry["pixels"]
+        pixels.setflags(write=True)
+    else:
+        pixels = np.empty(shape, np.float32)
+    image_gl.pixels.foreach_get(pixels.reshape(-1))
+    pixels.setflags(write=False)
+    BLENDER_IMAGE_CACHE[name] = {"counter": counter, "pixels": pixels, "images": {}}
+    BLENDER_IMAGE_CACHE.move_to_end(name)
+    prune_blender_image_cache()
+    return pixels
+
+
+def write_blender_pixels(image_gl, image):
+    """
+    :param image_gl: <bpy.types.Image>
+    :param image: <ndarray> float32 (height, width, 4) from convert_to_gl_image
+    """
+    image_gl.pixels.foreach_set(np.ascontiguousarray(image, dtype=np.float32).reshape(-1))
+    bump_image_update_counter(image_gl.name)
+
+
 def convert_to_gl_image(image_cv):
-    image_cv = cv2.flip(image_cv, 0)
-    if len(image_cv.shape) == 3:
-        image_gl = cv2.cvtColor(image_cv, cv2.COLOR_BGR2RGBA) / 255
-    if len(image_cv.shape) == 2:
-        r = g = b = image_cv / 255
-        a = np.ones(image_cv.shape, dtype=r.dtype)
-        image_gl = cv2.merge((r, g, b, a))
-    image_gl.astype(np.uint8)
+    """
+    :param image_cv: <ndarray> BGR, BGRA or gray image
+    :return: <ndarray> float32 RGBA (height, width, 4), 0-1, first row is bottom of image
+    """
+    height, width = image_cv.shape[:2]
+    image_gl = np.empty((height, width, 4), np.float32)
+    flipped = image_cv[::-1]
+    scale = 1. / get_dtype_scale(image_cv.dtype)
+    if len(image_cv.shape) == 2 or image_cv.shape[2] == 1:
+        np.multiply(flipped.reshape(height, width, 1), scale, out=image_gl[..., :3], casting="unsafe")
+    else:
+        np.multiply(flipped[..., 2::-1], scale, out=image_gl[..., :3], casting="unsafe")
+    if len(image_cv.shape) == 3 and image_cv.shape[2] == 4:
+        np.multiply(flipped[..., 3], scale, out=image_gl[..., 3], casting="unsafe")
+    else:
+        image_gl[..., 3] = 1.
     return image_gl
 
 
@@ -96,12 +193,37 @@ def init_texture(width, height, texname, texture, internalFormat, format):
     )
 
 
-def convert_to_cv_image(image_gl):
-    image_cv = np.array(image_gl.pixels, dtype=np.float32)
-    image_cv = image_cv.reshape((image_gl.size[1], image_gl.size[0], image_gl.channels))
-    image_cv = cv2.cvtColor(image_cv, cv2.COLOR_RGBA2BGR) * 255
-    image_cv = cv2.flip(image_cv, 0)
-    image_cv.astype(np.uint8)
+def convert_to_cv_image(image_gl, dtype=np.float32):
+    """
+    BGR image from Blender image, cached per image name and update counter.
+
+    :param image_gl: <bpy.types.Image>
+    :param dtype: <numpy dtype> of result, values are scaled by get_dtype_scale
+    :return: <ndarray> (height, width, 3), read only
+    """
+    pixels = read_blender_pixels(image_gl)
+    images = BLENDER_IMAGE_CACHE[image_gl.name]["images"]
+    dtype = np.dtype(dtype)
+    image_cv = images.get(dtype)
+    if image_cv is not None:
+        return image_cv
+
+    flipped = pixels[::-1]
+    if pixels.shape[2] >= 3:
+        bgr = flipped[..., 2::-1]
+    else:
+        bgr = np.repeat(flipped[..., :1], 3, axis=2)
+    scale = get_dtype_scale(dtype)
+    if dtype.kind == "f":
+        image_cv = np.multiply(bgr, scale, dtype=dtype)
+    else:
+        image_cv = np.empty(bgr.shape, np.float32)
+        np.multiply(bgr, scale, out=image_cv)
+        np.clip(image_cv, 0, scale, out=image_cv)
+        image_cv = np.rint(image_cv, out=image_cv).astype(dtype)
+    image_cv.setflags(write=False)
+    images[dtype] = image_cv
+    prune_blender_image_cache()
     return image_cv
 
 
@@ -153,21 +275,42 @@ def gen_image_grid(width=200, height=200, layers=3, grid_width=10, grid_height=1
     return cv2.bitwise_xor(img_1, img_2)
 
 
-def add_background_to_image(image):
-    height = image.shape[0]
-    width = image.shape[1]
-    bg_image = gen_image_grid(width=width, height=height)
-
-    for y in range(height):
-        for x in range(width):
-            alpha = image[y, x, 3]
-            if alpha > 0:
-                alpha = alpha / 255.
-                image[y, x, 0] = int((alpha * image[y,x,0]) + ((1-alpha) * bg_image[y,x,0]))
-                image[y, x, 1] = int((alpha * image[y,x,1]) + ((1-alpha) * bg_image[y,x,1]))
-                image[y, x, 2] = int((alpha * image[y,x,2]) + ((1-alpha) * bg_image[y,x,2]))
-            else:
-                image[y, x, 0] = bg_image[y, x, 0]
-                image[y, x, 1] = bg_image[y, x, 1]
-                image[y, x, 2] = bg_image[y, x, 2]
-    return image
\ No newline at end of file
+# Checkerboard backgrounds for RGBA previews, key (width, height)
+_BACKGROUND_CACHE = {}
+_BACKGROUND_CACHE_SIZE = 16
+
+
+def get_background(width, height):
+    """
+    Checkerboard background as float32 for alpha compositing, cached per size.
+
+    :return: <ndarray> (height, width, 3) read only
+    """
+    background = _BACKGROUND_CACHE.get((width, height))
+    if background is None:
+        side = max(width, height)
+        background = gen_image_grid(width=side, height=side)[:height, :width].astype(np.float32)
+        background.setflags(write=False)
+        if len(_BACKGROUND_CACHE) >= _BACKGROUND_CACHE_SIZE:
+            _BACKGROUND_CACHE.clear()
+        _BACKGROUND_CACHE[(width, height)] = background
+    return background
+
+
+def add_background_to_image(image, premultiplied=False):
+    """
+    Composite RGBA image over checkerboard background in place, alpha channel is kept.
+
+    :param image: <ndarray> (height, width, 4) BGRA image, alpha 0-255
+    :param premultiplied: <bool> color channels are already multiplied by alpha
+    :return: <ndarray> image
+    """
+    height, width = image.shape[:2]
+    alpha = image[..., 3:4].astype(np.float32)
+    alpha *= 1 / 255.
+    color = image[..., :3].astype(np.float32)
+    if not premultiplied:
+        color *= alpha
+    color += get_background(width, height) * (1 - alpha)
+    image[..., :3] = color
+    return image
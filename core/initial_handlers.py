@@ -1,25 +1,78 @@
 import bpy
 from bpy.app.handlers import persistent
 
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.image_utils import bump_image_update_counter, prune_blender_image_cache
+from ocvl.core.link_index import invalidate_link_index
+from ocvl.core.node_categories import register_pending_nodes
+from ocvl.core.load_planner import clear_load_plan, start_load_evaluation
+
 
 @persistent
 def refresh_after_load(*args):
 
-    try:
-        node_groups = bpy.data.node_groups
-    except AttributeError as e:
-        return
+    ocvl_globals.BLENDER_IMAGE_CACHE.clear()
+    invalidate_link_index()
+    # Visible trees first, one pass per tree in background steps (see ocvl.core.load_planner)
+    start_load_evaluation()
+
+
+@persistent
+def cancel_load_evaluation(*args):
+    """Trees of previous file waiting for evaluation are dropped."""
+    clear_load_plan()
+
+
+@persistent
+def register_nodes_before_load(*args):
+    """Nodes of loaded file need their classes, classes not registered in background yet are registered now."""
+    register_pending_nodes()
+
+
+@persistent
+def drop_link_indexes(*args):
+    """Undo and redo reallocate sockets, pointers in indexes are not valid."""
+    invalidate_link_index()
 
-    for node_group in node_groups:
-        for node in node_group.nodes:
-            node.process()
+
+@persistent
+def count_image_updates(scene, depsgraph=None):
+    """
+    Images changed in Blender (paint, reload, edit) invalidate arrays in BLENDER_IMAGE_CACHE,
+    arrays of removed and renamed images are released.
+    """
+    if ocvl_globals.BLENDER_IMAGE_CACHE:
+        prune_blender_image_cache()
+    if depsgraph is None:
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Image):
+            bump_image_update_counter(update.id.name)
 
 
 def register(settings):
+    if not register_nodes_before_load in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.append(register_nodes_before_load)
+    if not cancel_load_evaluation in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.append(cancel_load_evaluation)
     if not refresh_after_load in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.append(refresh_after_load)
+    if not count_image_updates in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(count_image_updates)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if not drop_link_indexes in handlers:
+            handlers.append(drop_link_indexes)
 
 
 def unregister(settings):
+    if register_nodes_before_load in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(register_nodes_before_load)
+    if cancel_load_evaluation in bpy.app.handlers.load_pre:
+        bpy.app.handlers.load_pre.remove(cancel_load_evaluation)
     if refresh_after_load in bpy.app.handlers.load_post:
-        bpy.app.handlers.load_post.remove(refresh_after_load)
\ No newline at end of file
+        bpy.app.handlers.load_post.remove(refresh_after_load)
+    if count_image_updates in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(count_image_updates)
+    for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+        if drop_link_indexes in handlers:
+            handlers.remove(drop_link_indexes)
\ No newline at end of file
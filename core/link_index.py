@@ -0,0 +1,99 @@
+"""
+Resolved links of node trees.
+
+Index of tree maps every linked input socket to socket id of its upstream output (key of data in
+SOCKET_DATA_CACHE), reroutes collapsed, so reading of socket don't walk reroutes and hash names on every call.
+Index is built on first lookup and dropped by OCVLNodeTree.update when links change. Sockets and nodes
+are identified by pointers, ids of linked outputs are computed once, so writer and readers of socket agree
+on id until next rebuild (also after rename of node).
+
+Indexes are kept in LINK_INDEXES (ocvl.core.globals), key tree name. Module don't import bpy.
+"""
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.scheduler import is_reroute
+
+
+def get_socket_id(tree_name, node_name, identifier):
+    return str(hash(tree_name + node_name + identifier))
+
+
+def get_upstream_socket(socket):
+    """:return: output socket of real node linked to input socket, reroutes collapsed, or None"""
+    while socket.is_linked and socket.links:
+        from_socket = socket.links[0].from_socket
+        if not is_reroute(from_socket.node):
+            return from_socket
+        socket = from_socket.node.inputs[0]
+    return None
+
+
+class LinkIndex:
+    """
+    :param pointer: <int> pointer of node tree, index of other tree with the same name is not valid
+    :param upstream: <dict> pointer of linked input -> socket id of upstream output, None if there is no real node
+    :param inputs: <dict> (pointer of node, input name) -> socket id of upstream output or None, linked inputs only
+    :param outputs: <dict> pointer of linked output -> socket id
+    """
+
+    def __init__(self, node_tree):
+        self.tree_name = node_tree.name
+        self.pointer = node_tree.as_pointer()
+        self.upstream = {}
+        self.inputs = {}
+        self.outputs = {}
+        for node in node_tree.nodes:
+            if is_reroute(node):
+                continue
+            node_pointer = node.as_pointer()
+            for socket in node.inputs:
+                if not socket.is_linked:
+                    continue
+                from_socket = get_upstream_socket(socket)
+                socket_id = None
+                if from_socket is not None:
+                    from_pointer = from_socket.as_pointer()
+                    socket_id = self.outputs.get(from_pointer)
+                    if socket_id is None:
+                        socket_id = get_socket_id(self.tree_name, from_socket.node.name, from_socket.identifier)
+                        self.outputs[from_pointer] = socket_id
+                self.upstream[socket.as_pointer()] = socket_id
+                self.inputs[(node_pointer, socket.name)] = socket_id
+
+
+def get_link_index(node_tree):
+    index = ocvl_globals.LINK_INDEXES.get(node_tree.name)
+    if index is None or index.pointer != node_tree.as_pointer():
+        index = ocvl_globals.LINK_INDEXES[node_tree.name] = LinkIndex(node_tree)
+    return index
+
+
+def invalidate_link_index(tree_name=None):
+    """Drop index of tree, all indexes if tree_name is None."""
+    if tree_name is None:
+        ocvl_globals.LINK_INDEXES.clear()
+    else:
+        ocvl_globals.LINK_INDEXES.pop(tree_name, None)
+
+
+def get_output_socket_id(socket):
+    """Socket id of output socket, for linked outputs the one known by readers."""
+    socket_id = get_link_index(socket.id_data).outputs.get(socket.as_pointer())
+    if socket_id is None:
+        socket_id = get_socket_id(socket.id_data.name, socket.node.name, socket.identifier)
+    return socket_id
+
+
+def get_upstream_socket_id(socket):
+    """:return: socket id of data read by input socket, None if socket is not linked to real node"""
+    node_tree = socket.id_data
+    index = get_link_index(node_tree)
+    pointer = socket.as_pointer()
+    if pointer not in index.upstream and socket.is_linked:
+        # Link made after last update of tree
+        invalidate_link_index(node_tree.name)
+        index = get_link_index(node_tree)
+    return index.upstream.get(pointer)
+
+
+def is_input_linked(node, name):
+    return (node.as_pointer(), name) in get_link_index(node.id_data).inputs
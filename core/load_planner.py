@@ -0,0 +1,158 @@
+"""
+Evaluation of node trees after load of file.
+
+Every tree is evaluated by one pass of scheduler (topological order, every node once, nodes with results in
+disk cache restored, see ocvl.core.disk_cache). Trees shown in node editors are evaluated first, one tree per
+step of bpy.app.timers callback, so Blender stays responsive and window manager shows progress. Trees not shown
+wait in HIDDEN_LOAD_TREES (ocvl.core.globals) until they are shown, with settings.LOAD_EVALUATION 'ALL' they are
+queued after visible trees, with 'SYNC' every tree is evaluated at once in load handler.
+"""
+import time
+from logging import getLogger
+
+import bpy
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.scheduler import get_scheduler
+from ocvl.core.update_queue import process_now
+
+
+logger = getLogger(__name__)
+
+
+LOAD_VISIBLE = "VISIBLE"
+LOAD_ALL = "ALL"
+LOAD_SYNC = "SYNC"
+
+_timer = {"is_registered": False}
+_progress = {"total": 0, "done": 0, "is_shown": False}
+
+
+def get_ocvl_trees():
+    try:
+        node_groups = bpy.data.node_groups
+    except AttributeError:
+        return []
+    return [node_group for node_group in node_groups if node_group.bl_idname == settings.OCVL_NODE_TREE_TYPE]
+
+
+def get_visible_tree_names():
+    """:return: <set> names of OCVL trees shown in node editors of all windows"""
+    names = set()
+    for window_manager in bpy.data.window_managers:
+        for window in window_manager.windows:
+            for area in window.screen.areas:
+                if area.type != 'NODE_EDITOR':
+                    continue
+                space = area.spaces.active
+                if space.tree_type != settings.OCVL_NODE_TREE_TYPE:
+                    continue
+                for node_tree in (space.node_tree, space.edit_tree):
+                    if node_tree is not None:
+                        names.add(node_tree.name)
+    return names
+
+
+def plan_load(tree_names, visible_names, mode=None):
+    """
+    :return: <list> names of trees to evaluate in order, <list> names of trees waiting until they are shown
+    """
+    mode = mode or settings.LOAD_EVALUATION
+    visible = [name for name in tree_names if name in visible_names]
+    hidden = [name for name in tree_names if name not in visible_names]
+    if mode == LOAD_ALL:
+        return visible + hidden, []
+    return visible, hidden
+
+
+def evaluate_tree(tree_name):
+    node_tree = bpy.data.node_groups.get(tree_name)
+    if node_tree is None:
+        return
+    start = time.perf_counter()
+    process_now(node_tree, list(node_tree.nodes))
+    logger.info("Tree {} evaluated after load ({}/{}) in {:.3f}s".format(
+        tree_name, _progress["done"] + 1, _progress["total"], time.perf_counter() - start))
+
+
+def start_load_evaluation():
+    """Called by load_post handler, plan replace plan of previous file."""
+    clear_load_plan()
+    node_trees = get_ocvl_trees()
+    if settings.LOAD_EVALUATION == LOAD_SYNC or bpy.app.background:
+        # Without event loop timers don't run
+        for node_tree in node_trees:
+            get_scheduler(node_tree).process_many(list(node_tree.nodes))
+        return
+
+    queued, hidden = plan_load([node_tree.name for node_tree in node_trees], get_visible_tree_names())
+    ocvl_globals.PENDING_LOAD_TREES.extend(queued)
+    ocvl_globals.HIDDEN_LOAD_TREES.extend(hidden)
+    _progress["total"] = len(queued)
+    if queued or hidden:
+        register_timer()
+
+
+def queue_shown_trees():
+    visible_names = get_visible_tree_names()
+    for name in [name for name in ocvl_globals.HIDDEN_LOAD_TREES if name in visible_names]:
+        ocvl_globals.HIDDEN_LOAD_TREES.remove(name)
+        ocvl_globals.PENDING_LOAD_TREES.append(name)
+        _progress["total"] += 1
+
+
+def _update_progress():
+    window_manager = getattr(bpy.context, "window_manager", None)
+    if window_manager is None:
+        return
+    if not _progress["is_shown"]:
+        window_manager.progress_begin(0, _progress["total"])
+        _progress["is_shown"] = True
+    window_manager.progress_update(_progress["done"])
+
+
+def _end_progress():
+    if _progress["is_shown"]:
+        window_manager = getattr(bpy.context, "window_manager", None)
+        if window_manager is not None:
+            window_manager.progress_end()
+    _progress["total"] = _progress["done"] = 0
+    _progress["is_shown"] = False
+
+
+def register_timer():
+    if _timer["is_registered"]:
+        return
+    _timer["is_registered"] = True
+    bpy.app.timers.register(_load_step, first_interval=settings.LOAD_STEP_INTERVAL)
+
+
+def _load_step():
+    if ocvl_globals.HIDDEN_LOAD_TREES:
+        queue_shown_trees()
+    if ocvl_globals.PENDING_LOAD_TREES:
+        tree_name = ocvl_globals.PENDING_LOAD_TREES.pop(0)
+        _update_progress()
+        try:
+            evaluate_tree(tree_name)
+        except Exception:
+            logger.exception("Evaluation of tree {} after load fail".format(tree_name))
+        _progress["done"] += 1
+        _update_progress()
+        if ocvl_globals.PENDING_LOAD_TREES:
+            return settings.LOAD_STEP_INTERVAL
+    _end_progress()
+    if ocvl_globals.HIDDEN_LOAD_TREES:
+        return settings.LOAD_VISIBILITY_INTERVAL
+    _timer["is_registered"] = False
+    return None
+
+
+def clear_load_plan():
+    ocvl_globals.PENDING_LOAD_TREES.clear()
+    ocvl_globals.HIDDEN_LOAD_TREES.clear()
+    _end_progress()
+    if _timer["is_registered"] and bpy.app.timers.is_registered(_load_step):
+        bpy.app.timers.unregister(_load_step)
+    _timer["is_registered"] = False
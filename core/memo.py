@@ -0,0 +1,126 @@
+"""
+Memoization of node results for the last parameter sets.
+
+Node opt in by n_memo_size (number of kept results). Key of result is made from fingerprint of node
+(UUIDs of linked socket data and raw properties, see OCVLNodeBase.get_fingerprint), called function and
+resolved non-array arguments of process_cv. On hit process_cv return stored result without call of function,
+refresh_output_socket republish stored array under the UUID it had before, so downstream nodes with memo
+hit too when slider is moved back to visited value.
+
+Memos are kept in NODE_MEMOS (ocvl.core.globals), key (tree name, node name). Module don't import bpy.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+
+
+MISSING = object()
+
+
+def freeze_argument(value):
+    """Hashable value of process_cv argument, arrays are identified by fingerprint of node, not by content."""
+    if isinstance(value, np.ndarray):
+        return np.ndarray
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_argument(item) for item in value)
+    return id(value)
+
+
+def iter_arrays(value):
+    if isinstance(value, np.ndarray):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from iter_arrays(item)
+
+
+class NodeMemo:
+    """
+    LRU of results of node.
+
+    :param size: <int> maximal number of kept results
+    :param results: <OrderedDict> key -> result of process_cv, last used at end
+    :param uuids: <dict> id of array from results -> UUID under which array was published
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.results = OrderedDict()
+        self.uuids = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(fn, fingerprint, args, kwargs):
+        """:return: hashable key or None if arguments can't be frozen"""
+        try:
+            key = (fn, fingerprint, freeze_argument(tuple(args)),
+                   tuple(sorted((name, freeze_argument(value)) for name, value in (kwargs or {}).items())))
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def get(self, key):
+        with self.lock:
+            result = self.results.get(key, MISSING)
+            if result is MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.results.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        with self.lock:
+            self.results[key] = result
+            self.results.move_to_end(key)
+            while len(self.results) > self.size:
+                _, dropped = self.results.popitem(last=False)
+                for array in iter_arrays(dropped):
+                    self.uuids.pop(id(array), None)
+
+    def get_uuid(self, array):
+        """UUID of array from results published before, None for other arrays."""
+        with self.lock:
+            return self.uuids.get(id(array))
+
+    def remember_uuid(self, array, uuid_):
+        with self.lock:
+            if any(array is stored for result in self.results.values() for stored in iter_arrays(result)):
+                self.uuids[id(array)] = uuid_
+
+    def clear(self):
+        with self.lock:
+            self.results.clear()
+            self.uuids.clear()
+
+
+def get_memo(node):
+    """:return: <NodeMemo> of node or None if node don't use memo"""
+    size = node.n_memo_size
+    if not size or not settings.IS_NODE_MEMO or node.n_always_process:
+        return None
+    memo = ocvl_globals.NODE_MEMOS.get(node.node_key)
+    if memo is None or memo.size != size:
+        memo = ocvl_globals.NODE_MEMOS[node.node_key] = NodeMemo(size)
+    return memo
+
+
+def drop_memo(node):
+    memo = ocvl_globals.NODE_MEMOS.pop(node.node_key, None)
+    if memo is not None:
+        memo.clear()
+
+
+def clear_memos():
+    for memo in ocvl_globals.NODE_MEMOS.values():
+        memo.clear()
+    ocvl_globals.NODE_MEMOS.clear()
@@ -1,19 +1,31 @@
 import sys
 import textwrap
 import time
-import uuid
 from itertools import chain
 from logging import getLogger
 from uuid import UUID
 
-import bgl
 import bpy
 import cv2
 import numpy as np
-from ocvl_addon.core import settings
-from ocvl_addon.core import globals as ocvl_globals
-from ocvl_addon.core.exceptions import LackRequiredSocketException, LackRequiredTypeDataSocketException
-from ocvl_addon.core.image_utils import (callback_disable, callback_enable, init_texture, add_background_to_image)
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.exceptions import (LackRequiredSocketException, LackRequiredTypeDataSocketException,
+                                  ProcessCancelledException)
+from ocvl.core.async_process import cancel_pass
+from ocvl.core.call_plan import get_call_plan
+from ocvl.core.disk_cache import get_content_hash, is_disk_cacheable, restore_node, store_node
+from ocvl.core.image_utils import callback_disable, callback_enable
+from ocvl.core.link_index import is_input_linked
+from ocvl.core.memo import MISSING, NodeMemo, drop_memo, get_memo
+from ocvl.core.output_buffers import add_output_buffers, is_reused_buffer, next_version
+from ocvl.core.parallel import defer, is_worker_thread, released_baton
+from ocvl.core.preview_textures import release_texture, update_preview
+from ocvl.core.process_pool import submit
+from ocvl.core.profiling import is_trace_recording, measure, measured, profile_run
+from ocvl.core.scheduler import get_scheduler
+from ocvl.core.socket_cache import DataHandle, new_data_handle
+from ocvl.core.update_queue import queue_update
 
 
 logger = getLogger(__name__)
@@ -188,7 +200,11 @@ def node_id(node):
 
 
 def update_node(self, context):
-    self.process()
+    if settings.IS_HEADLESS:
+        self.process()
+    else:
+        # Burst of changes (dragged slider) is coalesced, see ocvl.core.update_queue
+        queue_update(self)
 
 
 class Category:
@@ -196,6 +212,41 @@ class Category:
     filters = "filters"
 
 
+FINGERPRINT_PROPS_SUFFIXES = ("_in", "_init")
+FINGERPRINT_PROPS_PREFIXES = ("loc_",)
+
+
+def freeze_value(value):
+    """Convert socket/property value to hashable value used in fingerprint."""
+    if isinstance(value, DataHandle):
+        return str(value), value.version
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, np.ndarray):
+        return id(value), value.shape, value.dtype.str
+    try:
+        return tuple(freeze_value(item) for item in value)
+    except TypeError:
+        return id(value)
+
+
+def get_read_only_view(array):
+    """View on array data without copy, writing raise error instead of change data in socket cache."""
+    if not isinstance(array, np.ndarray) or not array.flags.writeable:
+        return array
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def is_equal_data(old_value, new_value):
+    if not isinstance(old_value, np.ndarray) or not isinstance(new_value, np.ndarray):
+        return False
+    if old_value is new_value:
+        return True
+    return old_value.shape == new_value.shape and old_value.dtype == new_value.dtype and np.array_equal(old_value, new_value)
+
+
 def get_channels_number(np_image):
     if not isinstance(np_image, np.ndarray):
         raise TypeError("NumPy ndarry type needed.")
@@ -224,6 +275,20 @@ class OCVLNodeBase(bpy.types.Node):
     :param n_note: <string> addition note to documentation
     :param n_quick_link_requirements: <dict> specification to quic_link socket
     :param n_input_output_only: node don't make copy input image
+    :param n_mutable_inputs: <tuple> kwargs names of inputs which process_cv function mutates in place, only they are copied
+    :param n_always_process: node depends on external state (camera, text block), never skipped by fingerprint
+    :param n_memo_size: <int> number of last results of process_cv kept for revisited parameters, 0 - off,
+        only for nodes which don't change result of process_cv in place, see ocvl.core.memo
+    :param n_disk_cache: result of node can be stored in disk cache and restored in next session when content hash
+        match, False for nodes with side effects in wrapped_process (previews), see ocvl.core.disk_cache
+    :param n_output_buffers: <dict> name of argument of process_cv function -> output property, array published by
+        last run is passed to function as the argument when nobody else use it, see ocvl.core.output_buffers
+    :param n_is_sink: node shows or writes result (viewer, stethoscope), in PULL evaluation mode of tree only
+        sinks and their upstream are processed, see ocvl.core.scheduler
+    :param n_parallel_safe: node can be processed on worker thread together with independent nodes,
+        False for nodes which write Blender data (textures, sockets, properties) directly in wrapped_process
+    :param n_addon_module: <string> addon module of node file {'ocvl', 'ocvl_pro'}, set by auto register
+    :param n_module_path: <string> path of node file relative to addon directory, set by auto register
     :param bl_idname: <string> id for Blender scope
     :param bl_label: <string> the node label
     :param bl_icon: <string> the node icon
@@ -245,6 +310,15 @@ class OCVLNodeBase(bpy.types.Node):
     n_requirements = {}
     n_quick_link_requirements = {}
     n_input_output_only = False
+    n_always_process = False
+    n_memo_size = 0
+    n_disk_cache = True
+    n_output_buffers = {}
+    n_parallel_safe = True
+    n_is_sink = False
+    n_mutable_inputs = ()
+    n_addon_module = None
+    n_module_path = None
 
     bl_idname = None
     bl_label = None
@@ -256,6 +330,11 @@ class OCVLNodeBase(bpy.types.Node):
     color = (0.33, 0.33, 0.33)
 
     def is_uuid(self, prop):
+        if isinstance(prop, DataHandle):
+            return True
+        if isinstance(prop, str) and len(prop) < 32:
+            # Enum items and other short strings, UUID has at least 32 hex digits
+            return False
         try:
             UUID(prop)
             return True
@@ -274,7 +353,7 @@ class OCVLNodeBase(bpy.types.Node):
         socket = self.inputs.get("image_in")
         try:
             prop = socket.sv_get()
-            return self.socket_data_cache[prop]
+            return get_read_only_view(self.socket_data_cache[prop])
         except LackRequiredSocketException as e:
             # fn = getattr(self, "report", lambda *args, **kwargs: None)
             # fn({'INFO'}, "No data in props: {}".format("image_in"))
@@ -282,11 +361,12 @@ class OCVLNodeBase(bpy.types.Node):
             return np.zeros([10, 10], np.uint8)
 
     def _is_linked(self, key):
-        return self.inputs.get(key) and self.inputs.get(key).is_linked
+        return is_input_linked(self, key)
 
+    @measured("inputs")
     def get_from_props(self, key, is_color=False):
         if key == "image_out":
-            return self.socket_data_cache[self.image_out]
+            return get_read_only_view(self.socket_data_cache[self.image_out])
         elif key == "flags_in":
             return self._get_flag_from_prop()
         elif key == "image_in":
@@ -295,13 +375,14 @@ class OCVLNodeBase(bpy.types.Node):
             return getattr(cv2, self.dtype_in, -1)
 
         if self._is_linked(key):
-            socket = self.inputs.get(key)
-            prop = socket.sv_get()
-            if isinstance(prop, (int, float, bool)):
+            prop = self.inputs[key].sv_get()
+            if isinstance(prop, DataHandle):
+                return get_read_only_view(self.socket_data_cache[prop])
+            elif isinstance(prop, (int, float, bool)):
                 return prop
             elif isinstance(prop, (str,)):
                 if self.is_uuid(prop):
-                    return self.socket_data_cache[prop]
+                    return get_read_only_view(self.socket_data_cache[prop])
                 else:
                     return prop
             elif len(prop[0]) > 1:
@@ -314,16 +395,7 @@ class OCVLNodeBase(bpy.types.Node):
             else:
                 return prop[0][0]
         else:
-            prop = getattr(self, key, None)
-            if isinstance(prop, (int, float, bool, type(None))):
-                return prop
-            elif isinstance(prop, (str,)):
-                return getattr(cv2, prop, prop)
-            elif len(prop) == 4 and ("color" in key.lower() or is_color):
-                color = list(prop)
-                return tuple(np.array([color[2], color[1], color[0]]) * 255)
-            else:
-                return tuple(prop)
+            return get_call_plan(self.__class__).resolve(self, key, is_color)
 
     def _get_sockets_by_socket_name(self, socket_name):
         if socket_name.endswith("_in") or socket_name.startswith("loc_"):
@@ -413,9 +485,10 @@ class OCVLNodeBase(bpy.types.Node):
                     raise LackRequiredSocketException("Inputs[{}] not linked".format(requirement))
 
     def clean_kwargs(self, kwargs_in):
+        plan = get_call_plan(self.__class__)
         kwargs_out = {}
         for key, value in kwargs_in.items():
-            if settings.IS_WORK_ON_COPY_INPUT and isinstance(value, np.ndarray):
+            if isinstance(value, np.ndarray) and (key in self.n_mutable_inputs or settings.IS_WORK_ON_COPY_INPUT):
                 value = value.copy()
 
             if isinstance(value, (str,)):
@@ -423,79 +496,233 @@ class OCVLNodeBase(bpy.types.Node):
                     continue
                 if (self.is_uuid(value) and key not in self.n_requirements.get("__and__", {})):  # OCVL-161
                     continue
-            kwargs_out[key.replace("_in", "")] = value
+            kwargs_out[plan.get_kwarg_name(key)] = value
 
         return kwargs_out
 
     def process(self):
-        self.n_meta = ""
-        self.n_error = ""
-        self.use_custom_color = False
+        """Process node and every node downstream, each exactly once in topological order."""
+        get_scheduler(self.id_data).process(self)
+
+    @property
+    def node_key(self):
+        return self.id_data.name, self.name
+
+    def _get_fingerprint_props(self):
+        cls = self.__class__
+        if "_fingerprint_props" not in cls.__dict__:
+            cls._fingerprint_props = tuple(
+                prop.identifier for prop in self.bl_rna.properties
+                if prop.identifier.endswith(FINGERPRINT_PROPS_SUFFIXES) or prop.identifier.startswith(FINGERPRINT_PROPS_PREFIXES)
+            )
+        return cls._fingerprint_props
+
+    def _get_socket_data_key(self, socket):
+        try:
+            return freeze_value(socket.sv_get())
+        except (LackRequiredSocketException, LookupError, AttributeError):
+            return None
+
+    def get_content_salt(self):
+        """
+        Addition to content hash of node for state outside properties (example: modification time of file).
+
+        :return: <tuple> or None if result of node is not reproducible
+        """
+        return ()
+
+    def get_fingerprint(self):
+        """
+        Fingerprint of resolved inputs: for linked sockets key of data in SOCKET_DATA_CACHE (UUID or value),
+        for others raw values of properties which get_from_props resolve.
+        """
+        fingerprint = []
+        for socket in self.inputs:
+            if socket.is_linked:
+                fingerprint.append((socket.name, self._get_socket_data_key(socket)))
+        for prop_name in self._get_fingerprint_props():
+            if self._is_linked(prop_name):
+                continue
+            fingerprint.append((prop_name, freeze_value(getattr(self, prop_name, None))))
+        return tuple(fingerprint)
+
+    def _get_published_handle(self, prop_name, uuid_):
+        """:return: <DataHandle> handle of uuid_ published by output socket, with its version"""
+        output = self.outputs[prop_name]
+        published = self.socket_data_cache.get(self.id_data.name, {}).get(output.socket_id)
+        if isinstance(published, DataHandle) and published == uuid_:
+            return published
+        return DataHandle(uuid_)
+
+    def _is_output_cached(self):
+        tree_data = self.socket_data_cache.get(self.id_data.name, {})
+        for output in self.outputs:
+            if not output.is_linked:
+                continue
+            if output.socket_id not in tree_data:
+                return False
+            value = getattr(self, output.name, None)
+            if isinstance(value, str) and self.is_uuid(value) and value not in self.socket_data_cache:
+                return False
+        return True
+
+    def is_up_to_date(self, fingerprint):
+        if self.n_always_process:
+            return False
+        return ocvl_globals.NODE_FINGERPRINTS.get(self.node_key) == fingerprint and self._is_output_cached()
+
+    def process_single(self, force=True, use_disk_cache=True):
+        """
+        Process only this node, called by scheduler.
+
+        :param force: <bool> if False skip node with unchanged fingerprint and outputs still in cache
+        :param use_disk_cache: <bool> if False node is always processed, never restored from disk cache
+        :return: <bool> True if node was processed
+        """
+        fingerprint = self.get_fingerprint()
+        if not force and self.is_up_to_date(fingerprint):
+            logger.debug("Node up to date, skip - {}".format(self))
+            return False
+
+        defer(self._set_state, n_meta="", n_error="", use_custom_color=False)
+        # Hash is computed only when node can be restored (outputs not in memory, after load) or stored (slow node)
+        hashes = None
+        if use_disk_cache and is_disk_cacheable(self):
+            hashes = get_scheduler(self.id_data).get_content_hashes()
+        if hashes is not None and not self._is_output_cached():
+            disk_key = get_content_hash(self, hashes)
+            if disk_key is not None and restore_node(self, disk_key):
+                ocvl_globals.NODE_FINGERPRINTS[self.node_key] = fingerprint
+                defer(self._append_meta, "\nRestored from disk cache")
+                return True
+        error, color = "", None
         start = time.time()
+        with profile_run(self) as record:
+            error, color = self._process_guarded()
+            if record is not None:
+                record.error = error
+        elapsed = time.time() - start
+        meta = "\nProcess time: {0:.2f}ms ".format(elapsed * 1000)
+        if error:
+            defer(self._set_state, n_error=error, use_custom_color=True, color=color)
+            meta += error
+            ocvl_globals.NODE_FINGERPRINTS.pop(self.node_key, None)
+        else:
+            ocvl_globals.NODE_FINGERPRINTS[self.node_key] = fingerprint
+            disk_key = get_content_hash(self, hashes) if hashes is not None and \
+                elapsed >= settings.DISK_CACHE_MIN_SECONDS else None
+            if disk_key is not None:
+                # After deferred refresh_output_socket, outputs are published
+                defer(store_node, self, disk_key)
+        defer(self._append_meta, meta)
+        return True
+
+    def _process_guarded(self):
+        """
+        Call wrapped_process, exceptions of node are turned into error message.
+
+        :return: (<string> error, <tuple> color), empty error on success
+        """
+        error, color = "", None
         try:
             self.check_input_requirements(self.n_requirements)
             self.wrapped_process()
         except LackRequiredSocketException as e:
             logger.info("SOCKET UNLINKED - {}".format(self))
-            self.n_error = "LackRequiredSocketException"
-            self.use_custom_color = True
-            self.color = settings.NODE_COLOR_REQUIRE_DATE
+            error, color = "LackRequiredSocketException", settings.NODE_COLOR_REQUIRE_DATE
         except LackRequiredTypeDataSocketException as e:
             logger.info("SOCKET DATA IN WRONG TYPE - {}".format(self))
-            self.n_error = "LackRequiredTypeDataSocketException"
-            self.use_custom_color = True
-            self.color = settings.NODE_COLOR_REQUIRE_TYPE_DATE
+            error, color = "LackRequiredTypeDataSocketException", settings.NODE_COLOR_REQUIRE_TYPE_DATE
         except cv2.error as e:
-            self.n_error = str(e)
-            self.use_custom_color = True
-            self.color = settings.NODE_COLOR_CV_ERROR
+            error, color = str(e), settings.NODE_COLOR_CV_ERROR
         except Exception as e:
             type_, value, traceback = sys.exc_info()
             if "LackRequiredSocketException" in str(type_):
-                self.n_error = "LackRequiredSocketException"
-                self.use_custom_color = True
-                self.color = settings.NODE_COLOR_REQUIRE_DATE
+                error, color = "LackRequiredSocketException", settings.NODE_COLOR_REQUIRE_DATE
             else:
-                self.n_error = str(e)
-                self.use_custom_color = True
-                self.color = settings.NODE_COLOR_CV_ERROR
+                error, color = str(e), settings.NODE_COLOR_CV_ERROR
                 if settings.DEBUG:
                     raise
-        finally:
-            self.n_meta += "\nProcess time: {0:.2f}ms ".format((time.time() - start) * 1000)
-            if self.n_error:
-                self.n_meta += self.n_error
+        return error, color
 
-        for output in self.outputs:
-            if output.is_linked:
-                for link in output.links:
-                    try:
-                        link.to_node.check_input_requirements()
-                    except Exception as e:
-                        logger.debug(f"Quick link requirements fall: {e}")
-                    else:
-                        link.to_node.process()
+    def _set_state(self, **props):
+        for prop_name, value in props.items():
+            setattr(self, prop_name, value)
+
+    def _append_meta(self, meta):
+        self.n_meta += meta
 
     def process_cv(self, fn=None, args=(), kwargs=None):
-        kwargs = self.clean_kwargs(kwargs)
+        memo = get_memo(self)
+        memo_key = None
+        if memo is not None:
+            memo_key = NodeMemo.make_key(fn, self.get_fingerprint(), args, kwargs)
+            out = memo.get(memo_key) if memo_key is not None else MISSING
+            if out is not MISSING:
+                defer(self._set_state, n_meta="\nCV memo hit ")
+                return out
+        with measure("inputs"):
+            kwargs = self.clean_kwargs(kwargs)
+            if memo is None and self.n_output_buffers:
+                kwargs = add_output_buffers(self, kwargs)
         start = time.time()
         try:
-            out = fn(*args, **kwargs)
+            with released_baton(), measure("cv"):
+                out = fn(*args, **kwargs)
+        except ProcessCancelledException:
+            raise
         except Exception as e:
             logger.warning("CV process problem: fn={}, kwargs={}, self={}, exception={} ".format(fn, kwargs, self, e))
             raise
-        self.n_meta = "\nCV time: {0:.2f}ms ".format((time.time() - start) * 1000)
+        defer(self._set_state, n_meta="\nCV time: {0:.2f}ms ".format((time.time() - start) * 1000))
+        if memo_key is not None:
+            memo.put(memo_key, out)
+        return out
+
+    def process_in_pool(self, fn=None, args=(), kwargs=None):
+        """
+        Like process_cv for pure Python work, fn is called in worker process if process pool is enabled.
+        fn must be module level function from module without bpy, example: ocvl.core.process_worker.
+        """
+        start = time.time()
+        try:
+            with released_baton(), measure("cv"):
+                out = submit(fn, args=args, kwargs=kwargs)
+        except Exception as e:
+            logger.warning("Pool process problem: fn={}, self={}, exception={} ".format(fn, self, e))
+            raise
+        defer(self._set_state, n_meta="\nPool time: {0:.2f}ms ".format((time.time() - start) * 1000))
         return out
 
+    @measured("outputs")
     def refresh_output_socket(self, prop_name=None, prop_value=None, is_uuid_type=False):
+        if is_worker_thread():
+            # Node processed on thread pool, write to Blender data on main thread
+            defer(self.refresh_output_socket, prop_name, prop_value, is_uuid_type)
+            return
         if self.outputs[prop_name].is_linked:
             if is_uuid_type:
-                _uuid = str(uuid.uuid4())
                 old_uuid = getattr(self, prop_name, None)
+                if is_reused_buffer(self, prop_name, prop_value):
+                    # Result written into array published before, the same UUID with new version
+                    self.outputs[prop_name].sv_set(DataHandle(old_uuid, version=next_version()))
+                    return
+                if settings.IS_REUSE_EQUAL_OUTPUT and is_equal_data(self.socket_data_cache.get(old_uuid), prop_value):
+                    # Same data as before, keep old UUID and its published version so downstream fingerprints
+                    # don't change, version 0 could stand for other content of buffer reused in place
+                    self.outputs[prop_name].sv_set(self._get_published_handle(prop_name, old_uuid))
+                    return
+                memo = get_memo(self)
+                # Result from memo is published under its previous UUID, downstream memo can hit too
+                _uuid = DataHandle((memo.get_uuid(prop_value) if memo is not None else None) or new_data_handle())
                 setattr(self, prop_name, _uuid)
-                self.socket_data_cache[_uuid] = prop_value
+                self.socket_data_cache.set(_uuid, prop_value, tree=self.id_data.name, node=self.name,
+                                           refs=len(self.outputs[prop_name].links))
                 self.outputs[prop_name].sv_set(_uuid)
-                self.socket_data_cache.pop(old_uuid, None)
+                if old_uuid != _uuid:
+                    self.socket_data_cache.pop(old_uuid, None)
+                if memo is not None:
+                    memo.remember_uuid(prop_value, _uuid)
             else:
                 setattr(self, prop_name, prop_value)
                 self.outputs[prop_name].sv_set([[prop_value]])
@@ -510,6 +737,15 @@ class OCVLNodeBase(bpy.types.Node):
         for msg in self.n_meta.split("\n"):
             layout.label(text=msg)
 
+        cache_bytes = self.socket_data_cache.get_bytes(tree=self.id_data.name, node=self.name)
+        layout.label(text="Cache: {0:.2f}MB".format(cache_bytes / 1024 ** 2))
+        scheduler_stats = get_scheduler(self.id_data).last_stats
+        if scheduler_stats:
+            layout.label(text="Scheduler: executed {executed}, skipped {skipped}, cascade {cascade}, saved {saved}".format(**scheduler_stats))
+            layout.label(text="Parallel: workers {workers}, nodes {parallel_nodes}, levels {levels}, "
+                              "parallelism {parallelism:.2f}".format(**scheduler_stats))
+        self.draw_profile(layout)
+
         if self.n_error:
             layout.label(text="Error(in line {}): ".format(self.n_error_line))
             layout.label(text="*" * settings.WRAP_TEXT_SIZE_FOR_ERROR_DISPLAY)
@@ -518,6 +754,17 @@ class OCVLNodeBase(bpy.types.Node):
                 layout.label(text=line)
             layout.label(text="*" * settings.WRAP_TEXT_SIZE_FOR_ERROR_DISPLAY)
 
+    def draw_profile(self, layout):
+        profile = ocvl_globals.NODE_PROFILES.get(self.node_key)
+        if profile is not None and profile.records:
+            summary = profile.summary()
+            layout.label(text="Profile: {} runs, last {}".format(summary["runs"], summary["window"]))
+            for phase in ("total", "inputs", "cv", "outputs", "python"):
+                layout.label(text="{}: p50 {p50:.2f}ms, p90 {p90:.2f}ms, p99 {p99:.2f}ms".format(phase, **summary[phase]))
+        row = layout.row(align=True)
+        row.operator("ocvl.profile_node", text="cProfile", icon="TIME").origin = self.get_node_origin()
+        row.operator("ocvl.profile_trace", text="Save trace" if is_trace_recording() else "Record trace", icon="REC")
+
     def get_node_origin(self, props_name=None):
         node_tree = self.id_data.name
         node_name = self.name
@@ -551,11 +798,15 @@ class OCVLNodeBase(bpy.types.Node):
         #     col.operator('ocvl.point_select', text=', '.join(props_name), icon="CURSOR").origin = origin
 
     def free(self):
+        cancel_pass(self.id_data.name)
+        to_nodes = []
         for output in self.outputs:
             for link in output.links:
-                to_node = link.to_node
+                to_nodes.append(link.to_node)
                 bpy.data.node_groups[self.id_data.name].links.remove(link)
-                to_node.process()
+        self.socket_data_cache.drop_node(self.id_data.name, self.name)
+        drop_memo(self)
+        get_scheduler(self.id_data).process_many(to_nodes)
 
     @property
     def node_id(self):
@@ -575,11 +826,15 @@ class OCVLPreviewNodeBase(OCVLNodeBase):
 
 
     """
+    n_parallel_safe = False
+    n_disk_cache = False
     texture = ocvl_globals.TEXTURE_CACHE
 
     def delete_texture(self):
-        if self.node_id in self.texture:
-            bgl.glDeleteTextures(1, bgl.Buffer(bgl.GL_INT, 1, self.texture[self.node_id]["name"]))
+        if settings.IS_HEADLESS:
+            return
+        release_texture(self.node_id)
+        self.texture.pop(self.node_id, None)
 
     def free(self):
         callback_disable(node_id(self))
@@ -592,40 +847,13 @@ class OCVLPreviewNodeBase(OCVLNodeBase):
         node.process()
 
     def make_textures(self, image, color='RGBA', uuid_=None, width=200, height=200):
-        self.delete_texture()
-
-        resized_image = cv2.resize(image, (width, height))
-        resized_height, resized_width = resized_image.shape[:2]
-
-        name = bgl.Buffer(bgl.GL_INT, 1)
-        bgl.glGenTextures(1, name)
-        self.texture[self.node_id] = {"name": name, "uuid": uuid_}
-        self.texture[uuid_] = self.node_id
-        if len(image.shape) == 3:
-            if image.shape[2] == 4:
-                _ = add_background_to_image(resized_image)
-                internalFormat = bgl.GL_RGBA
-                format = bgl.GL_BGRA
-            elif image.shape[2] == 3:
-                internalFormat = bgl.GL_RGB
-                format = bgl.GL_BGR
-        elif len(image.shape) == 2:
-            # TODO bgl.GL_LUMINANCE - don't working
-            internalFormat = bgl.GL_RGB
-            format = bgl.GL_RGB
-            if not isinstance(resized_image[0][0], np.uint8):
-                resized_image = resized_image.astype(np.uint8)
-            resized_image = cv2.cvtColor(src=resized_image, code=cv2.COLOR_GRAY2RGB)
-
-
-        texture_mini = bgl.Buffer(bgl.GL_BYTE, resized_image.shape, resized_image)
-
-        init_texture(width=resized_width,
-                     height=resized_height,
-                     texname=name[0],
-                     texture=texture_mini,
-                     internalFormat=internalFormat,
-                     format=format)
+        """
+        Show image in preview. Downscale is made on worker thread and texture is updated in place,
+        nodes displaying the same socket data (uuid_) share texture, see ocvl.core.preview_textures.
+        """
+        if settings.IS_HEADLESS:
+            return
+        update_preview(self.node_id, image, uuid_=uuid_, width=width, height=height)
 
     def draw_preview(self, layout, prop_name="image_out", location_x=0, location_y=0, proportion=1):
         row = layout.row()
@@ -662,9 +890,13 @@ class OCVLPreviewNodeBase(OCVLNodeBase):
                                  "DType: {}".format(image.dtype),
                                  "Size: {}".format(image.size)])
 
+    @measured("outputs")
     def _update_node_cache(self, image=None, resize=False, uuid_=None):
         old_image_out = self.image_out
         self.socket_data_cache.pop(old_image_out, None)
-        uuid_ = uuid_ if uuid_ else str(uuid.uuid4())
-        self.socket_data_cache[uuid_] = image
+        # Data published again under the same UUID (Blender image name) gets new version for downstream fingerprints
+        uuid_ = DataHandle(uuid_, version=next_version()) if uuid_ else new_data_handle()
+        image_out_socket = self.outputs.get("image_out")
+        refs = len(image_out_socket.links) if image_out_socket else 0
+        self.socket_data_cache.set(uuid_, image, tree=self.id_data.name, node=self.name, refs=refs)
         return image, uuid_
@@ -1,20 +1,26 @@
 import logging
 import os
-from collections import defaultdict
-from importlib import util
+from collections import OrderedDict, defaultdict
 
 import bpy
 import ocvl
 from nodeitems_utils import NodeCategory, NodeItem, _node_categories, unregister_node_categories  # register_node_categories
 from ocvl.core import settings
-from ocvl.core.register_utils import register_node, unregister_node
+from ocvl.core.node_manifest import (LOADED_MODULES, SUBCATEGORY_SEPARATOR, exec_node_module, get_manifest_categories,
+                                     iter_manifest_classes, iter_node_classes, update_manifest)
+from ocvl.core.register_utils import ocvl_register, ocvl_unregister, register_node, unregister_node
 
 logger = logging.getLogger(__name__)
 
 
 CATEGORY_CONFIG_MAP = {}  # icon, name, description
 BUILD_CATEGORIES = defaultdict(lambda: [])
-SUBCATEGORY_SEPARATOR = "__"
+# Node files not imported yet: 'addon_module:path' -> (addon module, path, {class name: category})
+PENDING_NODE_FILES = OrderedDict()
+# Class name -> key of its file in PENDING_NODE_FILES
+NODE_FILE_KEYS = {}
+# Class name -> registered node class
+REGISTERED_NODE_CLASSES = {}
 
 
 def is_second_extension_path():
@@ -37,10 +43,26 @@ class OCVLNodeCategory(NodeCategory):
         return context.space_data.tree_type == settings.OCVL_NODE_TREE_TYPE
 
 
-def is_node_class_name(class_name):
-    return class_name.startswith(settings.PREFIX_NODE_CLASS) and \
-           class_name.endswith(settings.SUFFIX_NODE_CLASS) and \
-           class_name not in settings.BLACK_LIST_FOR_REGISTER_NODE
+class OCVLNodeItem(NodeItem):
+    """Item of Add menu, class of node may be not registered yet."""
+
+    @staticmethod
+    def draw(self, layout, _context):
+        props = layout.operator(OCVL_OT_AddNode.bl_idname, text=self.label)
+        props.type = self.nodetype
+
+
+class OCVL_OT_AddNode(bpy.types.Operator):
+    """Add node to node tree, class of node is registered first if needed"""
+    bl_idname = "ocvl.add_node"
+    bl_label = "Add Node"
+    bl_options = {'INTERNAL'}
+
+    type: bpy.props.StringProperty()
+
+    def invoke(self, context, event):
+        ensure_node_class(self.type)
+        return bpy.ops.node.add_node('INVOKE_DEFAULT', type=self.type, use_transform=True)
 
 
 def register_node_categories(identifier, cat_list):
@@ -99,92 +121,42 @@ def register_node_categories(identifier, cat_list):
 
 
 class AutoRegisterNodeCategories:
-    _ocvl_auto_register = None
+    """
+    Categories and Add menu built from manifest (see ocvl.core.node_manifest), node files are imported
+    and their classes registered later: on first use of node, by timer in background or before load of file.
+    """
     register_mode = None
-    node_classes_list = None
+    manifest = None
     node_categories_dict = None
-    nodes_module_path = None
 
     def __init__(self, register_mode=True):
         self.register_mode = register_mode
-        self._ocvl_auto_register = self._register_node if register_mode else self._unregister_node
-        self.node_classes_list = []
         self.node_categories_dict = defaultdict(list)
-        self.nodes_module_path = os.path.join(ocvl.__path__[0], settings.NAME_NODE_DIRECTORY)
-
-        ocvl_path = ocvl.__path__[0]
-        self.nodes_module_path = os.path.join(ocvl_path, settings.NAME_NODE_DIRECTORY)
-        self.recursive_register(self.nodes_module_path, addon_module='ocvl')
-
-        ocvl_pro_path = os.path.join(os.path.sep.join(ocvl_path.split(os.path.sep)[:-1]), settings.OCVL_PRO_DIR_NAME)
-        if os.path.exists(ocvl_pro_path):
-            self.nodes_module_path = os.path.join(ocvl_pro_path, settings.NAME_NODE_DIRECTORY)
-            self.recursive_register(self.nodes_module_path, addon_module='ocvl_pro')
+        if register_mode:
+            self.manifest = update_manifest()
+            self.collect_nodes()
         self.end_register()
 
-    def _register_node(self, *args, **kwargs):
-        return register_node(*args, **kwargs)
-
-    def _unregister_node(self, *args, **kwargs):
-        return unregister_node(*args, **kwargs)
-
-    def process_module(self, file_name, node_file_path, node_classes_list, _ocvl_auto_register, dir_category=False, addon_module="ocvl"):
-        deep_import_path = ".".join(node_file_path.replace(self.nodes_module_path, "").split(os.sep)[1:-1])
-        spec = util.spec_from_file_location("{}.{}.{}.{}".format(addon_module, settings.NAME_NODE_DIRECTORY, deep_import_path, file_name), node_file_path)
-        mod = util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
-        if file_name.startswith(SUBCATEGORY_SEPARATOR) or file_name.startswith("abc"):
-            return
-
-        for obj_name in dir(mod):
-            if is_node_class_name(obj_name):
-                node_class = getattr(mod, obj_name)
-                if dir_category:
-                    node_class.n_category = deep_import_path
-                    node_class.n_category = deep_import_path.replace(".", SUBCATEGORY_SEPARATOR)
-                    exec("import {}.nodes.{}".format(addon_module, deep_import_path))
-                    category_module_path = "{}.{}.{}".format(addon_module, settings.NAME_NODE_DIRECTORY, deep_import_path)
-                    icon = eval("getattr({}, 'icon', 'NONE')".format(category_module_path))
-                    name = eval("getattr({}, 'name', '{}')".format(category_module_path, node_class.n_category))
-                    description = eval("getattr({}, 'description', '{}')".format(category_module_path, node_class.n_category))
-                    CATEGORY_CONFIG_MAP[node_class.n_category] = {"icon": icon, "name": name, "description": description}
-
-                if node_class.n_category:
-                    node_classes_list.append(node_class)
-                    _ocvl_auto_register(node_class)
-
-    def recursive_register(self, module_path, addon_module='ocvl'):
-        for file_name in os.listdir(module_path):
-            if file_name in settings.BLACK_LIST_REGISTER_NODE_CATEGORY:
-                continue
-
-            node_file_path = node_file_path_in = os.path.join(module_path, file_name)
-            if os.path.isfile(node_file_path):
-                self.process_module(file_name, node_file_path, self.node_classes_list, self._ocvl_auto_register)
-            elif os.path.isdir(node_file_path):
-                for file_name_in in os.listdir(node_file_path_in):
-                    if not file_name_in.startswith(SUBCATEGORY_SEPARATOR):
-                        node_file_path_in = os.path.join(node_file_path, file_name_in)
-                        if os.path.isfile(node_file_path_in):
-                            self.process_module(file_name_in, node_file_path_in, self.node_classes_list, self._ocvl_auto_register, dir_category=True, addon_module=addon_module)
-                self.recursive_register(node_file_path, addon_module=addon_module)
-
-    def condition_registration_node(self, node_class):
-        if node_class.n_development_status:
-            if node_class.n_development_status == "BETA":
+    def collect_nodes(self):
+        CATEGORY_CONFIG_MAP.update(get_manifest_categories(self.manifest))
+        for addon_module, module_path, entry in iter_manifest_classes(self.manifest):
+            key = "{}:{}".format(addon_module, module_path)
+            if entry["name"] not in REGISTERED_NODE_CLASSES:
+                PENDING_NODE_FILES.setdefault(key, (addon_module, module_path, {}))[2][entry["name"]] = entry["category"]
+                NODE_FILE_KEYS[entry["name"]] = key
+            if self.condition_registration_node(entry):
+                self.node_categories_dict[entry["category"]].append(OCVLNodeItem(entry["name"], entry["label"]))
+
+    def condition_registration_node(self, entry):
+        if entry["development_status"]:
+            if entry["development_status"] == "BETA":
                 return is_second_extension_path()
         else:
             return True
         return False
 
     def end_register(self):
-        for node_class in self.node_classes_list:
-            if self.condition_registration_node(node_class):
-                node_class.n_category = node_class.n_category.replace(".", SUBCATEGORY_SEPARATOR)
-                self.node_categories_dict[node_class.n_category].append(NodeItem(node_class.__name__, node_class.__name__[4:-4]))
-
         for category_name in self.node_categories_dict.keys():
-            category_name = category_name.replace(".", SUBCATEGORY_SEPARATOR)
             if self.is_skip_category_name(category_name):
                 continue
 
@@ -196,7 +168,6 @@ class AutoRegisterNodeCategories:
             )
             node_category.icon = CATEGORY_CONFIG_MAP[category_name]["icon"]
             if SUBCATEGORY_SEPARATOR in category_name:
-                node_category.identifier = node_category.identifier.replace(".", SUBCATEGORY_SEPARATOR)
                 BUILD_CATEGORIES["{}".format(category_name.split(SUBCATEGORY_SEPARATOR)[0])].append(node_category)
             else:
                 BUILD_CATEGORIES[settings.OCVL_NODE_CATEGORIES].append(node_category)
@@ -207,7 +178,10 @@ class AutoRegisterNodeCategories:
                 except KeyError as e:
                     logger.info("{} already registered.".format(settings.OCVL_NODE_CATEGORIES))
         else:
-            unregister_node_categories(settings.OCVL_NODE_CATEGORIES)
+            for key in list(BUILD_CATEGORIES.keys()):
+                if key in _node_categories:
+                    unregister_node_categories(key)
+            BUILD_CATEGORIES.clear()
 
     def is_skip_category_name(self, category_name):
         if category_name == "uncategorized":
@@ -217,9 +191,71 @@ class AutoRegisterNodeCategories:
         return False
 
 
+def register_node_file(key):
+    """Import node file (once) and register its node classes from manifest."""
+    addon_module, module_path, categories = PENDING_NODE_FILES.pop(key)
+    mod = LOADED_MODULES.pop((addon_module, module_path), None) or exec_node_module(addon_module, module_path)
+    for node_class in iter_node_classes(mod):
+        if node_class.__name__ not in categories:
+            continue
+        # Source of class for graph export, runtime load node class from this file
+        node_class.n_addon_module = addon_module
+        node_class.n_module_path = module_path
+        node_class.n_category = categories[node_class.__name__]
+        register_node(node_class)
+        REGISTERED_NODE_CLASSES[node_class.__name__] = node_class
+
+
+def register_pending_nodes_of(key):
+    try:
+        register_node_file(key)
+    except Exception:
+        logger.exception("Node file {} not registered".format(key))
+
+
+def register_pending_nodes(limit=None):
+    """Register node classes of pending files, all or only limit of files."""
+    for key in list(PENDING_NODE_FILES.keys())[:limit]:
+        register_pending_nodes_of(key)
+
+
+def ensure_node_class(bl_idname):
+    """Register class of node before node is created."""
+    key = NODE_FILE_KEYS.get(bl_idname)
+    if key in PENDING_NODE_FILES:
+        register_pending_nodes_of(key)
+
+
+_timer = {"is_registered": False}
+
+
+def _register_nodes_step():
+    register_pending_nodes(limit=settings.NODE_REGISTER_BATCH)
+    if PENDING_NODE_FILES:
+        return settings.NODE_REGISTER_INTERVAL
+    _timer["is_registered"] = False
+    return None
+
+
 def register():
+    ocvl_register(OCVL_OT_AddNode)
     AutoRegisterNodeCategories(register_mode=True)
+    if settings.NODE_REGISTER_BATCH <= 0:
+        register_pending_nodes()
+    elif PENDING_NODE_FILES and not _timer["is_registered"]:
+        bpy.app.timers.register(_register_nodes_step, first_interval=settings.NODE_REGISTER_INTERVAL)
+        _timer["is_registered"] = True
 
 
 def unregister():
+    if _timer["is_registered"] and bpy.app.timers.is_registered(_register_nodes_step):
+        bpy.app.timers.unregister(_register_nodes_step)
+    _timer["is_registered"] = False
     AutoRegisterNodeCategories(register_mode=False)
+    for node_class in REGISTERED_NODE_CLASSES.values():
+        unregister_node(node_class)
+    REGISTERED_NODE_CLASSES.clear()
+    PENDING_NODE_FILES.clear()
+    NODE_FILE_KEYS.clear()
+    LOADED_MODULES.clear()
+    ocvl_unregister(OCVL_OT_AddNode)
@@ -0,0 +1,227 @@
+"""
+Manifest of node classes, Add menu and categories are built from it without import of node modules.
+
+For every node file manifest keeps modification time, size and node classes of file (name, label, category,
+development status), for every category directory icon, name and description from its __init__.py.
+Manifest is stored as JSON in settings.NODE_MANIFEST_DIR, on start only new and changed files are imported
+to update it. Node classes are imported and registered later, see ocvl.core.node_categories.
+
+Module don't import bpy.
+"""
+import hashlib
+import importlib
+import json
+import os
+import sys
+import uuid
+from importlib import util
+from logging import getLogger
+
+import ocvl
+from ocvl.core import settings
+
+
+logger = getLogger(__name__)
+
+
+MANIFEST_VERSION = 1
+SUBCATEGORY_SEPARATOR = "__"
+CATEGORY_FILE_NAME = "__init__.py"
+
+# Modules executed to update manifest, registration use them instead of second execution
+LOADED_MODULES = {}
+
+
+def is_node_class_name(class_name):
+    return class_name.startswith(settings.PREFIX_NODE_CLASS) and \
+           class_name.endswith(settings.SUFFIX_NODE_CLASS) and \
+           class_name not in settings.BLACK_LIST_FOR_REGISTER_NODE
+
+
+def get_addon_path(addon_module):
+    ocvl_path = ocvl.__path__[0]
+    if addon_module == "ocvl_pro":
+        return os.path.join(os.path.dirname(ocvl_path), settings.OCVL_PRO_DIR_NAME)
+    return ocvl_path
+
+
+def get_addon_modules():
+    """:return: <list> names of add-ons with nodes, 'ocvl_pro' only if installed"""
+    addon_modules = ["ocvl"]
+    if os.path.exists(get_addon_path("ocvl_pro")):
+        addon_modules.append("ocvl_pro")
+    return addon_modules
+
+
+def get_manifest_path():
+    # Every installation of add-on has own manifest
+    digest = hashlib.sha1(get_addon_path("ocvl").encode("utf-8")).hexdigest()[:12]
+    return os.path.join(settings.NODE_MANIFEST_DIR, "node_manifest_{}.json".format(digest))
+
+
+def get_deep_import_path(module_path):
+    """:return: <string> package of node file below nodes directory, example 'imgproc.image_filtering'"""
+    dir_path = os.path.dirname(os.path.relpath(module_path, settings.NAME_NODE_DIRECTORY))
+    return ".".join(dir_path.split(os.sep)) if dir_path else ""
+
+
+def get_category(module_path):
+    """:return: <string> category of nodes from file, None for files directly in nodes directory"""
+    deep_import_path = get_deep_import_path(module_path)
+    return deep_import_path.replace(".", SUBCATEGORY_SEPARATOR) if deep_import_path else None
+
+
+def scan_node_files(addon_module):
+    """:return: <dict> path relative to add-on -> [mtime_ns, size] of node files and category files"""
+    addon_path = get_addon_path(addon_module)
+    nodes_path = os.path.join(addon_path, settings.NAME_NODE_DIRECTORY)
+    files = {}
+    for dir_path, dir_names, file_names in os.walk(nodes_path):
+        dir_names[:] = sorted(name for name in dir_names if name not in settings.BLACK_LIST_REGISTER_NODE_CATEGORY)
+        for file_name in sorted(file_names):
+            if not file_name.endswith(".py") or file_name in settings.BLACK_LIST_REGISTER_NODE_CATEGORY:
+                continue
+            if file_name.startswith(SUBCATEGORY_SEPARATOR) and file_name != CATEGORY_FILE_NAME:
+                continue
+            if file_name.startswith("abc") or (file_name == CATEGORY_FILE_NAME and dir_path == nodes_path):
+                continue
+            file_path = os.path.join(dir_path, file_name)
+            stat = os.stat(file_path)
+            files[os.path.relpath(file_path, addon_path)] = [stat.st_mtime_ns, stat.st_size]
+    return files
+
+
+def exec_node_module(addon_module, module_path):
+    """Execute node file as module with the same name which AutoRegisterNodeCategories always used."""
+    node_file_path = os.path.join(get_addon_path(addon_module), module_path)
+    spec = util.spec_from_file_location("{}.{}.{}.{}".format(
+        addon_module, settings.NAME_NODE_DIRECTORY, get_deep_import_path(module_path), os.path.basename(module_path)),
+        node_file_path)
+    mod = util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def iter_node_classes(mod):
+    for obj_name in dir(mod):
+        if not is_node_class_name(obj_name):
+            continue
+        obj = getattr(mod, obj_name)
+        if isinstance(obj, type) and obj.__module__ == mod.__name__:
+            yield obj
+
+
+def describe_node_file(addon_module, module_path):
+    """:return: <list> manifest entries of node classes defined in file"""
+    mod = exec_node_module(addon_module, module_path)
+    category = get_category(module_path)
+    classes = []
+    for node_class in iter_node_classes(mod):
+        node_category = category or node_class.n_category
+        if not node_category:
+            continue
+        classes.append({
+            "name": node_class.__name__,
+            "label": node_class.__name__[4:-4],
+            "category": node_category.replace(".", SUBCATEGORY_SEPARATOR),
+            "development_status": node_class.n_development_status,
+        })
+    if classes:
+        LOADED_MODULES[(addon_module, module_path)] = mod
+    return classes
+
+
+def describe_category(addon_module, module_path):
+    """:return: <dict> icon, name and description of category from __init__.py of its directory"""
+    category = get_category(module_path)
+    package = importlib.import_module("{}.{}.{}".format(
+        addon_module, settings.NAME_NODE_DIRECTORY, get_deep_import_path(module_path)))
+    return {
+        "icon": getattr(package, "icon", "NONE"),
+        "name": getattr(package, "name", category),
+        "description": getattr(package, "description", category),
+    }
+
+
+def get_manifest_header():
+    return {
+        "version": MANIFEST_VERSION,
+        "python": list(sys.version_info[:2]),
+        "addons": {addon_module: get_addon_path(addon_module) for addon_module in get_addon_modules()},
+    }
+
+
+def read_manifest(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(path, manifest):
+    tmp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Node manifest {} not saved: {}".format(path, e))
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def update_manifest(path=None):
+    """
+    Read manifest, entries of new and changed files are rebuilt, removed files are dropped.
+
+    :return: <dict> manifest, "files": key 'addon_module:path' -> {"stat", "classes"} or {"stat", "category"}
+    """
+    path = path or get_manifest_path()
+    header = get_manifest_header()
+    old_manifest = read_manifest(path) or {}
+    is_valid = all(old_manifest.get(key) == value for key, value in header.items())
+    old_files = old_manifest.get("files", {}) if is_valid else {}
+
+    files = {}
+    is_changed = not is_valid
+    for addon_module in header["addons"]:
+        for module_path, stat in scan_node_files(addon_module).items():
+            key = "{}:{}".format(addon_module, module_path)
+            entry = old_files.get(key)
+            if entry is None or entry["stat"] != stat:
+                is_changed = True
+                try:
+                    if os.path.basename(module_path) == CATEGORY_FILE_NAME:
+                        entry = {"stat": stat, "category": describe_category(addon_module, module_path)}
+                    else:
+                        entry = {"stat": stat, "classes": describe_node_file(addon_module, module_path)}
+                except Exception:
+                    # Not stored, file is tried again on next start
+                    logger.exception("Node file {} not loaded".format(key))
+                    continue
+            files[key] = entry
+    is_changed = is_changed or files.keys() != old_files.keys()
+
+    manifest = dict(header, files=files)
+    if is_changed:
+        write_manifest(path, manifest)
+    return manifest
+
+
+def iter_manifest_classes(manifest):
+    """Yield (addon module, module path, entry of class)."""
+    for key, file_entry in manifest["files"].items():
+        addon_module, module_path = key.split(":", 1)
+        for entry in file_entry.get("classes", ()):
+            yield addon_module, module_path, entry
+
+
+def get_manifest_categories(manifest):
+    """:return: <dict> category -> {"icon", "name", "description"}"""
+    categories = {}
+    for key, file_entry in manifest["files"].items():
+        if "category" in file_entry:
+            categories[get_category(key.split(":", 1)[1])] = file_entry["category"]
+    return categories
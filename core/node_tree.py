@@ -5,6 +5,12 @@ import bpy
 from ocvl.core import settings
 from ocvl.core.register_utils import ocvl_register, ocvl_unregister
 from ocvl.core.exceptions import LackRequiredSocketException
+from ocvl.core.globals import SOCKET_DATA_CACHE
+from ocvl.core.link_index import invalidate_link_index
+from ocvl.core.async_process import cancel_pass
+from ocvl.core.scheduler import EVALUATION_MODE_ITEMS, MODE_PUSH, get_scheduler
+from ocvl.core.socket_cache import collect_references
+from ocvl.core.update_queue import UPDATE_POLICY_ITEMS
 
 
 logger = logging.getLogger(__name__)
@@ -23,6 +29,12 @@ class LinkPointer:
 LINKS_POINTER_MAP = defaultdict(dict)
 
 
+def update_evaluation_mode(self, context):
+    # Nodes skipped in PULL mode are evaluated after switch to PUSH mode
+    if self.evaluation_mode == MODE_PUSH:
+        get_scheduler(self).process_stale(self)
+
+
 class OCVLNodeTree(bpy.types.NodeTree):
     """
     Node tree consisting of linked nodes used for shading, textures and compositing.
@@ -32,12 +44,26 @@ class OCVLNodeTree(bpy.types.NodeTree):
     bl_label = "OCVL Group Tree type"
     bl_icon = "COLOR"
 
+    use_async_process: bpy.props.BoolProperty(
+        default=settings.IS_ASYNC_PROCESS, name="Async processing",
+        description="Process changes of nodes on background thread, editor is not blocked by slow nodes")
+    update_policy: bpy.props.EnumProperty(
+        items=UPDATE_POLICY_ITEMS, default=settings.UPDATE_POLICY, name="Update policy",
+        description="Evaluation of nodes during drag of property")
+    evaluation_mode: bpy.props.EnumProperty(
+        items=EVALUATION_MODE_ITEMS, default=settings.EVALUATION_MODE, name="Evaluation mode",
+        description="Evaluate every changed node (push) or only nodes observed by sinks (pull)",
+        update=update_evaluation_mode)
+
     @classmethod
     def pull(cls, node_tree):
         logger.info("Node Tree Pull", node_tree.bl_idname is settings.OCVL_NODE_TREE_TYPE)
         return node_tree.bl_idname is settings.OCVL_NODE_TREE_TYPE
 
     def update(self):
+        # Asynchronous pass reading old links is stopped and started again
+        cancel_pass(self.name)
+        invalidate_link_index(self.name)
         previous_links = LINKS_POINTER_MAP[self.name]
         current_links = {}
         for link in self.links:
@@ -55,9 +81,9 @@ class OCVLNodeTree(bpy.types.NodeTree):
                 # LINKS_POINTER_MAP[self.name][link_pointer].to_node.process()
                 # TODO: crash here :( to_node may not exist
 
-        for link_pointer in new_links:
-            current_links[link_pointer].from_node.process()
+        get_scheduler(self).process_many([current_links[link_pointer].from_node for link_pointer in new_links])
         LINKS_POINTER_MAP[self.name] = current_links
+        SOCKET_DATA_CACHE.update_references(self.name, collect_references(self))
 
 
 def register():
@@ -67,6 +93,22 @@ def register():
 
 
 def unregister():
+    from ocvl.core.parallel import shutdown_executor
+    from ocvl.core.process_pool import shutdown_process_pool
+    from ocvl.core.async_process import shutdown_async
+    from ocvl.core.update_queue import clear_updates
+    from ocvl.core.load_planner import clear_load_plan
+    from ocvl.core.disk_cache import shutdown_disk_cache
+    from ocvl.core.preview_textures import clear_previews
+    from ocvl.core.video_capture import release_all_captures
+    clear_load_plan()
+    clear_updates()
+    shutdown_async()
+    shutdown_executor()
+    shutdown_process_pool()
+    release_all_captures()
+    clear_previews()
+    shutdown_disk_cache()
     ocvl_unregister(OCVLNodeTree)
     from ocvl.core.node_categories import unregister as node_categories_unregister
     node_categories_unregister()
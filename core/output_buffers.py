@@ -0,0 +1,71 @@
+"""
+Reuse of output arrays between runs of node.
+
+Node opt in by n_output_buffers: name of argument of cv2 function -> output property, example {"dst": "dst_out"}.
+process_cv pass array published by last run as that argument, cv2 write result into it when shape and type match
+(otherwise cv2 allocates new array). refresh_output_socket republish reused array under the same UUID with next
+version of DataHandle, so cache entry stays and fingerprints of downstream nodes change.
+
+Array is reused only when nothing else references it: downstream node in progress, preview, memo, disk cache
+writer, views made by other nodes, results kept by caller of runtime. Module don't import bpy.
+"""
+import itertools
+import sys
+
+import numpy as np
+
+from ocvl.core import settings
+
+
+_versions = itertools.count(1)
+
+
+def next_version():
+    return next(_versions)
+
+
+def _count_references(array):
+    return sys.getrefcount(array)
+
+
+def _count_exclusive_references():
+    """References of array held only by one container, seen from get_reusable_buffer."""
+    holder = {"value": np.empty(1)}
+    array = holder["value"]
+    return _count_references(array)
+
+
+EXCLUSIVE_REFERENCES = _count_exclusive_references()
+
+
+def get_reusable_buffer(node, prop_name):
+    """:return: <ndarray> published by last run of node in output prop_name if nobody else use it, or None"""
+    array = node.socket_data_cache.get(getattr(node, prop_name, None))
+    if not isinstance(array, np.ndarray) or isinstance(array, np.memmap):
+        return None
+    # Views (shared memory, slices) and read only arrays are not reused
+    if not (array.flags.owndata and array.flags.writeable and array.flags.c_contiguous):
+        return None
+    if _count_references(array) > EXCLUSIVE_REFERENCES:
+        return None
+    return array
+
+
+def add_output_buffers(node, kwargs):
+    """Add reusable arrays to cleaned kwargs of process_cv."""
+    if not settings.IS_OUTPUT_BUFFERS:
+        return kwargs
+    for arg_name, prop_name in node.n_output_buffers.items():
+        if arg_name in kwargs:
+            continue
+        buffer = get_reusable_buffer(node, prop_name)
+        if buffer is not None:
+            kwargs[arg_name] = buffer
+    return kwargs
+
+
+def is_reused_buffer(node, prop_name, value):
+    """True if value is array already published in output prop_name, written in place."""
+    if not node.n_output_buffers or not isinstance(value, np.ndarray):
+        return False
+    return value is node.socket_data_cache.get(getattr(node, prop_name, None))
@@ -0,0 +1,320 @@
+"""
+Parallel execution of independent nodes on thread pool.
+
+Nodes of one topological level don't depend on each other, so they can be processed at the same time.
+Blender data is not thread safe, so worker thread hold BATON (global lock) whole time of process,
+except call of cv2 function in OCVLNodeBase.process_cv - most of cv2 functions release GIL and work
+in parallel there. Writes back to node (output sockets, status) are deferred and applied by main
+thread after level is finished. Nodes which are not parallel safe (write Blender data in wrapped_process)
+are processed by main thread, also in asynchronous pass (run_on_main_thread).
+
+Module don't import bpy.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from logging import getLogger
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.exceptions import ProcessCancelledException
+
+
+logger = getLogger(__name__)
+
+
+EXECUTOR_KEY = "node_executor"
+
+BATON = threading.RLock()
+
+_local = threading.local()
+
+
+def is_worker_thread():
+    return getattr(_local, "deferred", None) is not None
+
+
+def defer(fn, *args, **kwargs):
+    """Call fn on main thread after level is processed, called immediately outside of worker thread."""
+    if is_worker_thread():
+        _local.deferred.append((fn, args, kwargs))
+    else:
+        fn(*args, **kwargs)
+
+
+def is_async_thread():
+    return getattr(_local, "async_task", None) is not None
+
+
+def async_baton():
+    """BATON for asynchronous pass reading nodes and links outside of node (planning of pass)."""
+    return holding_baton() if is_async_thread() else nullcontext()
+
+
+def is_delegated_call():
+    """True on main thread during node processed for asynchronous pass (run_on_main_thread)."""
+    return getattr(_local, "delegated_task", None) is not None
+
+
+@contextmanager
+def holding_baton():
+    """Hold BATON, depth is counted so run_on_main_thread can release it whole."""
+    BATON.acquire()
+    _local.baton_depth = getattr(_local, "baton_depth", 0) + 1
+    try:
+        yield
+    finally:
+        _local.baton_depth -= 1
+        BATON.release()
+
+
+@contextmanager
+def async_thread(task):
+    """
+    Mark current thread as asynchronous pass of node tree (see ocvl.core.async_process): it works like
+    worker thread, but deferred writes are applied by main thread after every level (sync_deferred)
+    and pass is stopped when task is superseded (check_cancelled).
+    """
+    _local.deferred = []
+    _local.async_task = task
+    _local.cancel_task = task
+    try:
+        yield
+    finally:
+        _local.deferred = None
+        _local.async_task = None
+        _local.cancel_task = None
+
+
+def check_cancelled():
+    """Stop node of asynchronous pass (also in worker thread of its level) when pass is superseded."""
+    task = getattr(_local, "cancel_task", None)
+    if task is not None and task.is_cancelled():
+        raise ProcessCancelledException()
+
+
+def run_on_main_thread(fn):
+    """
+    In asynchronous pass call fn on main thread and wait for its result, used for nodes which are not parallel
+    safe. Deferred writes made so far go with it, BATON is released for time of wait.
+    """
+    task = _local.async_task
+    pending, _local.deferred = _local.deferred, []
+    outcome = {}
+
+    def call():
+        _local.delegated_task = task
+        try:
+            outcome["result"] = fn()
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            _local.delegated_task = None
+
+    depth = getattr(_local, "baton_depth", 0)
+    for _ in range(depth):
+        BATON.release()
+    try:
+        task.apply_on_main_thread(pending + [(call, (), {})])
+    finally:
+        for _ in range(depth):
+            BATON.acquire()
+    check_cancelled()
+    if "error" in outcome:
+        raise outcome["error"]
+    if "result" not in outcome:
+        # Task was closed, main thread don't apply writes anymore
+        raise ProcessCancelledException()
+    return outcome["result"]
+
+
+def sync_deferred():
+    """In asynchronous pass apply deferred writes of level on main thread and wait for them."""
+    task = getattr(_local, "async_task", None)
+    if task is None or getattr(_local, "level_depth", 0) > 0:
+        # Level of nested pass (process called by node) is applied with level of outer pass
+        return
+    deferred, _local.deferred = _local.deferred, []
+    if deferred:
+        # BATON is free between levels, main thread take it for writes
+        task.apply_on_main_thread(deferred)
+    check_cancelled()
+
+
+def is_stage_thread():
+    return getattr(_local, "is_stage", False)
+
+
+@contextmanager
+def stage_thread():
+    """
+    Mark current thread as stage of pipeline (see ocvl.runtime.pipeline): like main thread it process nodes
+    under BATON and write to them directly, but release BATON for cv2 call, so stages overlap there.
+    """
+    _local.is_stage = True
+    try:
+        yield
+    finally:
+        _local.is_stage = False
+
+
+@contextmanager
+def released_baton():
+    """Release BATON for time of work which don't touch Blender data (cv2 call)."""
+    if not is_worker_thread() and not is_stage_thread():
+        yield
+        return
+    BATON.release()
+    try:
+        yield
+    finally:
+        BATON.acquire()
+    # Tree could be edited meanwhile, cancelled pass don't touch its nodes again
+    check_cancelled()
+
+
+def get_executor(workers=None):
+    workers = workers or settings.NODE_EXECUTOR_WORKERS
+    executor = ocvl_globals.THREAD_WORKERS.get(EXECUTOR_KEY)
+    if executor is None or executor._max_workers != workers:
+        if executor is not None:
+            executor.shutdown(wait=False)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocvl_node")
+        ocvl_globals.THREAD_WORKERS[EXECUTOR_KEY] = executor
+    return executor
+
+
+def shutdown_executor():
+    executor = ocvl_globals.THREAD_WORKERS.pop(EXECUTOR_KEY, None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def is_parallel_safe(node):
+    return getattr(node, "n_parallel_safe", False)
+
+
+def split_levels(order, edges):
+    """
+    Group topologically ordered nodes by level: longest path from roots of pass.
+
+    :return: <list> of lists of nodes, nodes in one list are independent
+    """
+    names = {node.name for node in order}
+    parents = {node.name: [] for node in order}
+    for from_name, to_name in edges:
+        if from_name in names and to_name in names:
+            parents[to_name].append(from_name)
+    level_of = {}
+    levels = []
+    for node in order:
+        level = max((level_of.get(parent, -1) + 1 for parent in parents[node.name]), default=0)
+        level_of[node.name] = level
+        while len(levels) <= level:
+            levels.append([])
+        levels[level].append(node)
+    return levels
+
+
+def _process_in_worker(task, cancel_task):
+    _local.deferred = []
+    _local.cancel_task = cancel_task
+    BATON.acquire()
+    # CPU time of thread, waiting for BATON or for free core is not counted as work
+    start = time.thread_time()
+    try:
+        result = task()
+    finally:
+        busy = time.thread_time() - start
+        BATON.release()
+        deferred, _local.deferred = _local.deferred, None
+        _local.cancel_task = None
+    return result, deferred, busy
+
+
+class LevelRunner:
+    """
+    Run tasks of one level, parallel safe tasks on thread pool, others on main thread.
+
+    :param workers: <int> number of worker threads
+    :param stats: <dict> metrics of pass: levels, parallel_nodes, max_concurrency, busy (CPU time of nodes),
+        wall (time of levels), parallelism (busy / wall, 1.0 for serial work)
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or settings.NODE_EXECUTOR_WORKERS
+        self.stats = {"workers": self.workers, "levels": 0, "parallel_nodes": 0, "max_concurrency": 0,
+                      "busy": 0.0, "wall": 0.0, "parallelism": 1.0}
+
+    @property
+    def is_enabled(self):
+        return self.workers > 1
+
+    def run_level(self, nodes, task_fn):
+        """
+        :param nodes: <list> independent nodes
+        :param task_fn: function(node) -> result, called once for every node
+        :return: <list> results in order of nodes
+        """
+        start = time.perf_counter()
+        _local.level_depth = getattr(_local, "level_depth", 0) + 1
+        try:
+            results = self._run_level(nodes, task_fn)
+        finally:
+            _local.level_depth -= 1
+        self.stats["wall"] += time.perf_counter() - start
+        if self.stats["wall"] > 0:
+            self.stats["parallelism"] = self.stats["busy"] / self.stats["wall"]
+        sync_deferred()
+        return results
+
+    def _run_level(self, nodes, task_fn):
+        self.stats["levels"] += 1
+        parallel = [node for node in nodes if is_parallel_safe(node)] if self.is_enabled else []
+        if len(parallel) < 2:
+            parallel = []
+
+        futures = {}
+        if parallel:
+            executor = get_executor(self.workers)
+            cancel_task = getattr(_local, "cancel_task", None)
+            for node in parallel:
+                futures[node.name] = executor.submit(_process_in_worker, lambda node=node: task_fn(node), cancel_task)
+            self.stats["parallel_nodes"] += len(parallel)
+            self.stats["max_concurrency"] = max(self.stats["max_concurrency"], min(len(parallel), self.workers))
+
+        results = {}
+        for node in nodes:
+            if node.name in futures:
+                continue
+            node_start = time.thread_time()
+            if is_async_thread() and not is_parallel_safe(node):
+                # Node writes Blender data, asynchronous pass hand it over to main thread
+                results[node.name] = run_on_main_thread(lambda: task_fn(node))
+            else:
+                with holding_baton():
+                    # Workers may be in flight, main thread take Blender data only between their cv2 calls
+                    results[node.name] = task_fn(node)
+            self.stats["busy"] += time.thread_time() - node_start
+
+        error = None
+        for node in parallel:
+            try:
+                result, deferred, busy = futures[node.name].result()
+            except ProcessCancelledException as e:
+                error = error or e
+                continue
+            except Exception as e:
+                logger.exception("Node {} fail in worker thread".format(node.name))
+                error = error or e
+                continue
+            self.stats["busy"] += busy
+            for fn, args, kwargs in deferred:
+                # Applied now on main thread, in asynchronous pass with writes of level
+                defer(fn, *args, **kwargs)
+            results[node.name] = result
+
+        if error is not None:
+            raise error
+        return [results.get(node.name) for node in nodes]
@@ -0,0 +1,269 @@
+"""
+Persistent preview textures of OCVLPreviewNodeBase.
+
+Texture is GL object reused between processes: when size and format are unchanged new image is uploaded
+in place (glTexSubImage2D). Downscale and conversion of image to preview pixels are made on worker thread
+(INTER_AREA, with pyrDown for big reduction), upload is made on main thread in draw callback, when GL context
+is active. Preparing is throttled to settings.PREVIEW_MAX_FPS, only latest image of node is prepared.
+
+Textures are keyed by socket data UUID, so viewers of the same socket share one texture and one upload.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+import bgl
+import bpy
+import cv2
+import numpy as np
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.image_utils import add_background_to_image, tag_redraw_all_nodeviews
+
+
+logger = getLogger(__name__)
+
+
+EXECUTOR_KEY = "preview_executor"
+
+# Released textures ready for reuse, GL objects are not deleted and created for every new socket UUID
+_free_textures = []
+_timer = {"is_registered": False}
+
+
+def get_preview_executor():
+    executor = ocvl_globals.THREAD_WORKERS.get(EXECUTOR_KEY)
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=settings.PREVIEW_WORKERS, thread_name_prefix="ocvl_preview")
+        ocvl_globals.THREAD_WORKERS[EXECUTOR_KEY] = executor
+    return executor
+
+
+def downscale(image, width, height):
+    """Resize for preview: pyrDown while image is 2 times bigger than target, next INTER_AREA."""
+    while image.shape[1] >= 2 * width and image.shape[0] >= 2 * height:
+        image = cv2.pyrDown(image)
+    if image.shape[1] == width and image.shape[0] == height:
+        return image
+    interpolation = cv2.INTER_AREA if image.shape[1] >= width else cv2.INTER_LINEAR
+    return cv2.resize(image, (width, height), interpolation=interpolation)
+
+
+def prepare_pixels(image, width, height):
+    """
+    Preview pixels for texture, called on worker thread.
+
+    :return: (<ndarray> uint8 pixels, internal format, format)
+    """
+    resized_image = downscale(image, width, height)
+    if len(image.shape) == 3 and image.shape[2] == 4:
+        if resized_image is image or not resized_image.flags.writeable:
+            # Background is added in place, socket data can't be changed
+            resized_image = resized_image.copy()
+        _ = add_background_to_image(resized_image)
+        internal_format, format = bgl.GL_RGBA, bgl.GL_BGRA
+    elif len(image.shape) == 3 and image.shape[2] == 3:
+        internal_format, format = bgl.GL_RGB, bgl.GL_BGR
+    else:
+        # TODO bgl.GL_LUMINANCE - don't working
+        internal_format, format = bgl.GL_RGB, bgl.GL_RGB
+        if resized_image.dtype != np.uint8:
+            resized_image = resized_image.astype(np.uint8)
+        resized_image = cv2.cvtColor(src=resized_image, code=cv2.COLOR_GRAY2RGB)
+    if resized_image.dtype != np.uint8:
+        resized_image = resized_image.astype(np.uint8)
+    return np.ascontiguousarray(resized_image), internal_format, format
+
+
+class PreviewTexture:
+    """
+    GL texture with latest preview of socket data.
+
+    :param key: <tuple> (socket data UUID, width, height) or <string> node id
+    :param name: <bgl.Buffer> GL name of texture, None before first upload
+    :param size: <tuple> (width, height) of uploaded pixels
+    :param formats: <tuple> (internal format, format) of uploaded pixels
+    :param users: <set> node ids which display texture
+    :param latest: <tuple> (image, width, height) waiting for prepare
+    :param pending: <tuple> (bgl.Buffer, width, height, internal format, format) waiting for upload
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.name = None
+        self.size = None
+        self.formats = None
+        self.users = set()
+        self.lock = threading.Lock()
+        self.latest = None
+        self.pending = None
+        self.future = None
+        self.last_prepare = 0.0
+
+    def update(self, image, width, height):
+        """Prepare image on worker thread, next upload it in draw callback."""
+        with self.lock:
+            self.latest = image, width, height
+            if self.future is not None and not self.future.done():
+                # Running job take latest image
+                return
+            self.future = get_preview_executor().submit(self._prepare)
+        register_timer()
+
+    def _prepare(self):
+        while True:
+            delay = self.last_prepare + 1.0 / settings.PREVIEW_MAX_FPS - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            with self.lock:
+                latest, self.latest = self.latest, None
+            if latest is None:
+                return
+            self.last_prepare = time.perf_counter()
+            try:
+                pixels, internal_format, format = prepare_pixels(*latest)
+                buffer = bgl.Buffer(bgl.GL_BYTE, pixels.shape, pixels)
+            except Exception as e:
+                logger.warning("Preview not prepared: {}".format(e))
+                continue
+            with self.lock:
+                self.pending = buffer, pixels.shape[1], pixels.shape[0], internal_format, format
+
+    @property
+    def is_busy(self):
+        return self.pending is not None or (self.future is not None and not self.future.done())
+
+    def upload(self):
+        """Upload pending pixels, called on main thread with GL context (draw callback)."""
+        with self.lock:
+            pending, self.pending = self.pending, None
+        if pending is None:
+            return
+        buffer, width, height, internal_format, format = pending
+        if self.name is None:
+            self.name = bgl.Buffer(bgl.GL_INT, 1)
+            bgl.glGenTextures(1, self.name)
+        bgl.glBindTexture(bgl.GL_TEXTURE_2D, self.name[0])
+        if self.size == (width, height) and self.formats == (internal_format, format):
+            bgl.glTexSubImage2D(bgl.GL_TEXTURE_2D, 0, 0, 0, width, height, format, bgl.GL_UNSIGNED_BYTE, buffer)
+            return
+        bgl.glTexParameterf(bgl.GL_TEXTURE_2D, bgl.GL_TEXTURE_WRAP_S, bgl.GL_CLAMP_TO_EDGE)
+        bgl.glTexParameterf(bgl.GL_TEXTURE_2D, bgl.GL_TEXTURE_WRAP_T, bgl.GL_CLAMP_TO_EDGE)
+        bgl.glTexParameterf(bgl.GL_TEXTURE_2D, bgl.GL_TEXTURE_MAG_FILTER, bgl.GL_LINEAR)
+        bgl.glTexParameterf(bgl.GL_TEXTURE_2D, bgl.GL_TEXTURE_MIN_FILTER, bgl.GL_LINEAR)
+        bgl.glTexImage2D(bgl.GL_TEXTURE_2D, 0, internal_format, width, height, 0, format, bgl.GL_UNSIGNED_BYTE, buffer)
+        self.size = width, height
+        self.formats = internal_format, format
+
+    def delete(self):
+        if self.name is not None:
+            bgl.glDeleteTextures(1, self.name)
+            self.name = None
+
+
+def get_texture_entry(node_id):
+    entry = ocvl_globals.TEXTURE_CACHE.get(node_id)
+    return entry if isinstance(entry, dict) else None
+
+
+def acquire_texture(node_id, key):
+    """
+    Texture for node which display data with key. Texture of other node with the same key is shared,
+    texture used only by this node is reused for new key.
+
+    :return: (<PreviewTexture>, <bool> True if texture has no image for key yet)
+    """
+    textures = ocvl_globals.PREVIEW_TEXTURES
+    entry = get_texture_entry(node_id)
+    current = entry["texture"] if entry else None
+    if current is not None and current.key == key:
+        # The same UUID is the same data, image of node without UUID is new on every call
+        return current, key == node_id
+
+    shared = textures.get(key)
+    if shared is not None:
+        release_texture(node_id)
+        shared.users.add(node_id)
+        return shared, False
+
+    if current is not None and current.users == {node_id}:
+        # Only this node display texture, new image is uploaded in place
+        textures.pop(current.key, None)
+        current.key = key
+        textures[key] = current
+        return current, True
+
+    release_texture(node_id)
+    texture = _free_textures.pop() if _free_textures else PreviewTexture(key)
+    texture.key = key
+    texture.users = {node_id}
+    textures[key] = texture
+    return texture, True
+
+
+def release_texture(node_id):
+    """Node don't display texture, unused texture is kept for reuse or deleted."""
+    entry = get_texture_entry(node_id)
+    if entry is None:
+        return
+    texture = entry["texture"]
+    texture.users.discard(node_id)
+    if texture.users:
+        return
+    if ocvl_globals.PREVIEW_TEXTURES.get(texture.key) is texture:
+        ocvl_globals.PREVIEW_TEXTURES.pop(texture.key)
+    if len(_free_textures) < settings.PREVIEW_TEXTURE_POOL_SIZE:
+        with texture.lock:
+            texture.latest = texture.pending = None
+        _free_textures.append(texture)
+    else:
+        texture.delete()
+
+
+def update_preview(node_id, image, uuid_=None, width=200, height=200):
+    """
+    Show image in preview of node.
+
+    :param uuid_: <string> UUID of socket data, nodes showing the same UUID share texture
+    :return: <dict> entry of TEXTURE_CACHE for node
+    """
+    # Array reused in place keeps UUID, version of data handle tell it is new image
+    key = (uuid_, getattr(uuid_, "version", 0), width, height) if uuid_ else node_id
+    texture, is_stale = acquire_texture(node_id, key)
+    if is_stale:
+        texture.update(image, width, height)
+    entry = {"name": texture.name, "uuid": uuid_, "texture": texture}
+    ocvl_globals.TEXTURE_CACHE[node_id] = entry
+    if uuid_:
+        ocvl_globals.TEXTURE_CACHE[uuid_] = node_id
+    return entry
+
+
+def register_timer():
+    if _timer["is_registered"]:
+        return
+    _timer["is_registered"] = True
+    bpy.app.timers.register(_poll_previews, first_interval=1.0 / settings.PREVIEW_MAX_FPS)
+
+
+def _poll_previews():
+    """Redraw node editors when prepared previews are waiting for upload."""
+    textures = list(ocvl_globals.PREVIEW_TEXTURES.values())
+    if any(texture.pending is not None for texture in textures):
+        tag_redraw_all_nodeviews()
+    if any(texture.is_busy for texture in textures):
+        return 1.0 / settings.PREVIEW_MAX_FPS
+    _timer["is_registered"] = False
+    return None
+
+
+def clear_previews():
+    executor = ocvl_globals.THREAD_WORKERS.pop(EXECUTOR_KEY, None)
+    if executor is not None:
+        executor.shutdown(wait=True)
+    for texture in list(ocvl_globals.PREVIEW_TEXTURES.values()) + _free_textures:
+        texture.delete()
+    ocvl_globals.PREVIEW_TEXTURES.clear()
+    _free_textures.clear()
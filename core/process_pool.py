@@ -0,0 +1,98 @@
+"""
+Optional process pool for node work which is pure Python (loops over matches, custom scripts),
+threads don't help there because of GIL.
+
+Arguments and results are moved by ocvl.core.shared_arrays: ndarrays through shared memory blocks,
+arrays from socket cache in shared memory (settings.IS_SOCKET_DATA_CACHE_SHARED) without any copy.
+Function sent to pool must be defined on module level in module without bpy (see ocvl.core.process_worker).
+
+Pool is disabled when settings.PROCESS_POOL_WORKERS is 0, function is called in current process then.
+
+Module don't import bpy.
+"""
+import importlib
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logging import getLogger
+
+import ocvl
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.shared_arrays import Decoder, Encoder
+
+
+logger = getLogger(__name__)
+
+
+PROCESS_POOL_KEY = "process_pool"
+
+
+def is_process_pool_enabled():
+    return settings.PROCESS_POOL_WORKERS > 0
+
+
+def get_python_executable():
+    """Blender before 2.91 has own binary in sys.executable, workers need Python interpreter."""
+    if settings.PROCESS_POOL_PYTHON:
+        return settings.PROCESS_POOL_PYTHON
+    if os.path.basename(sys.executable).lower().startswith("blender"):
+        bin_dir = os.path.join(sys.prefix, "bin")
+        for name in sorted(os.listdir(bin_dir)) if os.path.isdir(bin_dir) else []:
+            if name.startswith("python"):
+                return os.path.join(bin_dir, name)
+    return sys.executable
+
+
+def get_process_pool():
+    pool = ocvl_globals.THREAD_WORKERS.get(PROCESS_POOL_KEY)
+    if pool is None:
+        context = multiprocessing.get_context(settings.PROCESS_POOL_START_METHOD)
+        if settings.PROCESS_POOL_START_METHOD != "fork":
+            context.set_executable(get_python_executable())
+        # Worker import addon package by real name, package alias itself as "ocvl" for node modules
+        pool = ProcessPoolExecutor(max_workers=settings.PROCESS_POOL_WORKERS, mp_context=context,
+                                   initializer=importlib.import_module, initargs=(ocvl.__name__,))
+        ocvl_globals.THREAD_WORKERS[PROCESS_POOL_KEY] = pool
+    return pool
+
+
+def shutdown_process_pool():
+    pool = ocvl_globals.THREAD_WORKERS.pop(PROCESS_POOL_KEY, None)
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def call_in_worker(fn, args, kwargs):
+    """Entry of worker process: decode arguments, call function, encode result."""
+    decoder = Decoder()
+    try:
+        result = fn(*decoder.decode(args), **decoder.decode(kwargs))
+        return Encoder(min_bytes=settings.SHARED_MEMORY_MIN_BYTES, is_transfer=True).encode(result)
+    finally:
+        decoder.close()
+
+
+def submit(fn, args=(), kwargs=None):
+    """
+    Call fn in worker process and wait for result, without pool call fn directly.
+
+    :param fn: function from module without bpy
+    :return: result of fn
+    """
+    kwargs = kwargs or {}
+    if not is_process_pool_enabled():
+        return fn(*args, **kwargs)
+
+    encoder = Encoder(min_bytes=settings.SHARED_MEMORY_MIN_BYTES)
+    try:
+        future = get_process_pool().submit(call_in_worker, fn, encoder.encode(args), encoder.encode(kwargs))
+        return Decoder(is_owner=True).decode(future.result())
+    except BrokenProcessPool:
+        logger.warning("Process pool broken, new pool is created for next call")
+        ocvl_globals.THREAD_WORKERS.pop(PROCESS_POOL_KEY, None)
+        raise
+    finally:
+        encoder.release()
@@ -0,0 +1,41 @@
+"""
+Node work which can be sent to process pool (ocvl.core.process_pool.submit).
+
+Functions are pure: arguments are data (ndarrays, lists of cv2.KeyPoint/DMatch, numbers), not nodes.
+Module don't import bpy.
+"""
+import types
+
+import cv2
+import numpy as np
+
+
+def filter_matches(matches, max_distance):
+    return [dmatch for dmatch in matches if dmatch.distance < max_distance]
+
+
+def draw_matches(img1, keypoints1, img2, keypoints2, matches, max_distance, draw_params):
+    """Filter matches by distance and draw them, work of OCVLdrawMatchesNode."""
+    good = filter_matches(matches, max_distance)
+    return cv2.drawMatches(img1, keypoints1, img2, keypoints2, good, None, **draw_params)
+
+
+def points_from_matches(matches, keypoints1, keypoints2, max_distance):
+    """Source and destination points of good matches, work of OCVLfindHomographyNode in MATCHES mode."""
+    good = filter_matches(matches, max_distance)
+    src_points = np.float32([keypoints1[m.queryIdx].pt for m in good]).reshape(-1, 1, 2)
+    dst_points = np.float32([keypoints2[m.trainIdx].pt for m in good]).reshape(-1, 1, 2)
+    return src_points, dst_points
+
+
+def run_custom_code(code, context):
+    """
+    Execute code of OCVLCustomInputNode.
+
+    :return: <dict> new variables, modules and functions are skipped - they can't be sent between processes
+    """
+    context = dict(context, np=np, cv2=cv2)
+    old_locals = set(context.keys())
+    exec(code, {}, context)
+    return {name: value for name, value in context.items()
+            if name not in old_locals and not isinstance(value, (types.ModuleType, types.FunctionType))}
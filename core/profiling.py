@@ -0,0 +1,272 @@
+"""
+Profiling of node processing.
+
+Every run of node is recorded in NODE_PROFILES (ocvl.core.globals), key (tree name, node name).
+Time of run is split into phases:
+inputs - get_from_props and copy of inputs in clean_kwargs,
+cv - calls of process_cv and process_in_pool,
+outputs - publish of outputs (refresh_output_socket, _update_node_cache),
+python - rest of wrapped_process (with waits for BATON in worker threads).
+Last settings.PROFILE_WINDOW runs are kept for percentiles.
+
+Recorded trace of tree evaluations can be exported as Chrome trace (chrome://tracing, Perfetto).
+Single node can be profiled by cProfile on next run (request_cprofile).
+
+Module don't import bpy.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from logging import getLogger
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+
+
+logger = getLogger(__name__)
+
+
+PHASES = ("inputs", "cv", "outputs", "python")
+PERCENTILES = (50, 90, 99)
+
+_local = threading.local()
+_trace_lock = threading.Lock()
+# Events of recorded trace, None - trace is not recorded
+_trace = {"events": None, "start": 0.0}
+# Node keys profiled by cProfile on next run
+_cprofile_requests = set()
+
+
+def now():
+    return time.perf_counter()
+
+
+def percentile(values, q):
+    """Nearest rank percentile of sorted values."""
+    if not values:
+        return 0.0
+    index = min(int(round(q / 100.0 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+class RunRecord:
+    """
+    Times of one run of node in seconds.
+
+    :param phases: <dict> phase -> seconds, python is computed at end of run
+    :param depth: <int> nesting of measured sections, only outer section is counted
+    """
+    __slots__ = ("start", "total", "phases", "depth", "error")
+
+    def __init__(self):
+        self.start = now()
+        self.total = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.depth = 0
+        self.error = ""
+
+
+class NodeProfile:
+    """
+    Rolling statistics of node.
+
+    :param runs: <int> number of all runs
+    :param records: <deque> last runs
+    :param cprofile: <string> report of last cProfile snapshot
+    """
+
+    def __init__(self, window=None):
+        self.runs = 0
+        self.records = deque(maxlen=window or settings.PROFILE_WINDOW)
+        self.cprofile = ""
+
+    def add(self, record):
+        self.runs += 1
+        self.records.append(record)
+
+    @property
+    def last(self):
+        return self.records[-1] if self.records else None
+
+    def get_percentiles(self, phase="total"):
+        """:return: <dict> percentile -> seconds"""
+        if phase == "total":
+            values = sorted(record.total for record in self.records)
+        else:
+            values = sorted(record.phases[phase] for record in self.records)
+        return {q: percentile(values, q) for q in PERCENTILES}
+
+    def summary(self):
+        """:return: <dict> for JSON, times in milliseconds"""
+        result = {"runs": self.runs, "window": len(self.records)}
+        for phase in ("total",) + PHASES:
+            result[phase] = {"p{}".format(q): value * 1000 for q, value in self.get_percentiles(phase).items()}
+        return result
+
+
+def get_profile(node_key):
+    profile = ocvl_globals.NODE_PROFILES.get(node_key)
+    if profile is None:
+        profile = ocvl_globals.NODE_PROFILES[node_key] = NodeProfile()
+    return profile
+
+
+def current_record():
+    return getattr(_local, "record", None)
+
+
+@contextmanager
+def profile_run(node):
+    """Record run of node, node is processed inside context."""
+    if not settings.IS_NODE_PROFILING:
+        yield None
+        return
+    record = RunRecord()
+    previous, _local.record = current_record(), record
+    profiler = None
+    if node.node_key in _cprofile_requests:
+        _cprofile_requests.discard(node.node_key)
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield record
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        _local.record = previous
+        record.total = now() - record.start
+        measured = sum(record.phases[phase] for phase in PHASES if phase != "python")
+        record.phases["python"] = max(record.total - measured, 0.0)
+        profile = get_profile(node.node_key)
+        profile.add(record)
+        if profiler is not None:
+            profile.cprofile = format_cprofile(profiler)
+        add_trace_event(node.name, "node", record.start, record.total,
+                        args=dict({"tree": node.id_data.name, "error": record.error},
+                                  **{phase: value * 1000 for phase, value in record.phases.items()}))
+
+
+@contextmanager
+def measure(phase):
+    """Add time of section to phase of current run, nested sections are counted once."""
+    record = current_record()
+    if record is None or record.depth:
+        yield
+        return
+    record.depth += 1
+    start = now()
+    try:
+        yield
+    finally:
+        record.phases[phase] += now() - start
+        record.depth -= 1
+
+
+def measured(phase):
+    """Decorator of node method, time of call is added to phase of current run (see measure)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            record = current_record()
+            if record is None or record.depth:
+                return fn(*args, **kwargs)
+            record.depth += 1
+            start = now()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record.phases[phase] += now() - start
+                record.depth -= 1
+        return wrapper
+    return decorator
+
+
+def request_cprofile(node_key):
+    """Profile next run of node by cProfile, report is kept in NodeProfile.cprofile."""
+    _cprofile_requests.add(node_key)
+
+
+def cancel_cprofile(node_key):
+    _cprofile_requests.discard(node_key)
+
+
+def format_cprofile(profiler, limit=30):
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+    return stream.getvalue()
+
+
+def start_trace():
+    with _trace_lock:
+        _trace["events"] = []
+        _trace["start"] = now()
+
+
+def is_trace_recording():
+    return _trace["events"] is not None
+
+
+def add_trace_event(name, category, start, duration, args=None):
+    """Complete event of Chrome trace, times in seconds from perf_counter."""
+    if _trace["events"] is None:
+        return
+    event = {"name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+             "ts": (start - _trace["start"]) * 1e6, "dur": duration * 1e6}
+    if args:
+        event["args"] = args
+    with _trace_lock:
+        if _trace["events"] is not None:
+            _trace["events"].append(event)
+
+
+@contextmanager
+def trace_section(name, category="tree", args=None):
+    """Record section (pass of scheduler, level) as event of trace."""
+    if _trace["events"] is None:
+        yield
+        return
+    start = now()
+    try:
+        yield
+    finally:
+        add_trace_event(name, category, start, now() - start, args=args)
+
+
+def stop_trace():
+    """:return: <list> recorded events"""
+    with _trace_lock:
+        events, _trace["events"] = _trace["events"] or [], None
+    return events
+
+
+def export_chrome_trace(filepath, events=None):
+    """
+    Save events (default: stop current recording) in Chrome trace format, with summary of node profiles.
+
+    :return: <int> number of events
+    """
+    events = stop_trace() if events is None else events
+    thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+    metadata = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+                for tid, name in thread_names.items() if any(event["tid"] == tid for event in events)]
+    data = {
+        "traceEvents": metadata + events,
+        "displayTimeUnit": "ms",
+        "otherData": {"profiles": {"{}/{}".format(*key): profile.summary()
+                                   for key, profile in ocvl_globals.NODE_PROFILES.items()}},
+    }
+    with open(filepath, "w") as f:
+        json.dump(data, f)
+    return len(events)
+
+
+def clear_profiles(tree_name=None):
+    for key in [key for key in ocvl_globals.NODE_PROFILES if tree_name is None or key[0] == tree_name]:
+        ocvl_globals.NODE_PROFILES.pop(key)
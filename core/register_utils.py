@@ -34,7 +34,7 @@ def reload_ocvl_modules():
 
 
 def register_node(cls):
-    from ocvl.core.node_categories import is_node_class_name
+    from ocvl.core.node_manifest import is_node_class_name
     if is_node_class_name(cls.__name__):
         cls.__annotations__.update({"n_id": bpy.props.StringProperty(default='')})
         cls.__annotations__.update({"n_meta": bpy.props.StringProperty(default='')})
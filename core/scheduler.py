@@ -0,0 +1,368 @@
+"""
+Topological scheduler for OCVL node trees.
+
+When node changes, scheduler collects dirty downstream nodes (reroutes collapsed),
+sorts them topologically once and process every node exactly once. Old recursive cascade
+(every output link call `to_node.process()`) process node once per upstream path, so for
+comparison scheduler count how many executions that cascade would do.
+
+Nodes downstream of roots are processed with force=False, so node with unchanged input fingerprint
+is skipped and propagation stops there (see OCVLNodeBase.process_single).
+
+Independent nodes (same topological level) are processed on thread pool (see ocvl.core.parallel).
+
+In PULL evaluation mode of tree (OCVLNodeTree.evaluation_mode) pass process only nodes demanded by sinks:
+nodes with n_is_sink (viewers, stethoscope), nodes with exposed outputs (ocvl.runtime) and their upstream.
+Other nodes are remembered as stale and processed by later pass which make them demanded (new link to sink,
+switch to PUSH mode).
+
+Module don't import bpy, works on any objects with Blender like nodes/sockets/links API.
+"""
+from collections import OrderedDict
+from logging import getLogger
+
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.parallel import (LevelRunner, async_baton, check_cancelled, is_async_thread, is_delegated_call,
+                                is_worker_thread, split_levels)
+from ocvl.core.profiling import trace_section
+
+
+logger = getLogger(__name__)
+
+
+REROUTE_NODE_IDNAME = "NodeReroute"
+
+MODE_PUSH = "PUSH"
+MODE_PULL = "PULL"
+
+EVALUATION_MODE_ITEMS = (
+    (MODE_PUSH, "Push", "Every node downstream of change is evaluated", "", 0),
+    (MODE_PULL, "Pull", "Only nodes observed by viewers, stethoscopes and exposed outputs are evaluated", "", 1),
+)
+
+
+def is_reroute(node):
+    return getattr(node, "bl_idname", None) == REROUTE_NODE_IDNAME
+
+
+def is_processable(node):
+    return hasattr(node, "process_single")
+
+
+def iter_linked_nodes(node):
+    """Yield nodes linked to outputs of node, one item for every link, reroutes collapsed."""
+    for output in node.outputs:
+        if not output.is_linked:
+            continue
+        for link in output.links:
+            to_node = link.to_node
+            if is_reroute(to_node):
+                yield from iter_linked_nodes(to_node)
+            elif is_processable(to_node):
+                yield to_node
+
+
+def iter_upstream_nodes(node):
+    """Yield nodes linked to inputs of node, reroutes collapsed."""
+    for socket in node.inputs:
+        if not socket.is_linked:
+            continue
+        for link in socket.links:
+            from_node = resolve_upstream_node(link.from_node)
+            if from_node is not None and is_processable(from_node):
+                yield from_node
+
+
+def resolve_upstream_node(node):
+    """For reroute return first real node upstream, for other nodes return node."""
+    while is_reroute(node):
+        socket = node.inputs[0]
+        if not socket.is_linked or not socket.links:
+            return None
+        node = socket.links[0].from_node
+    return node
+
+
+def collect_downstream(roots):
+    """
+    Collect roots and every node reachable from them.
+
+    :param roots: <list> start nodes
+    :return: (<OrderedDict> name -> node, <list> edges (from_name, to_name) one per link)
+    """
+    nodes = OrderedDict()
+    edges = []
+    queue = []
+    for root in roots:
+        if root.name not in nodes:
+            nodes[root.name] = root
+            queue.append(root)
+    while queue:
+        node = queue.pop(0)
+        for to_node in iter_linked_nodes(node):
+            edges.append((node.name, to_node.name))
+            if to_node.name not in nodes:
+                nodes[to_node.name] = to_node
+                queue.append(to_node)
+    return nodes, edges
+
+
+def topological_sort(nodes, edges):
+    """
+    Kahn sort of nodes, stable with order of nodes dict.
+    Nodes in cycle (Blender allow it in editor) are appended at the end in discovery order.
+    """
+    in_degree = {name: 0 for name in nodes}
+    children = {name: [] for name in nodes}
+    for from_name, to_name in edges:
+        in_degree[to_name] += 1
+        children[from_name].append(to_name)
+
+    ready = [name for name in nodes if in_degree[name] == 0]
+    order = []
+    while ready:
+        name = ready.pop(0)
+        order.append(name)
+        for child in children[name]:
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                ready.append(child)
+
+    if len(order) != len(nodes):
+        cycle = [name for name in nodes if name not in order]
+        logger.warning("Cycle in node tree, nodes: {}".format(cycle))
+        order.extend(cycle)
+    return [nodes[name] for name in order]
+
+
+def is_pull_mode(node_tree):
+    return getattr(node_tree, "evaluation_mode", MODE_PUSH) == MODE_PULL
+
+
+def is_sink(node):
+    if getattr(node, "n_is_sink", False):
+        return True
+    return any(getattr(socket, "is_exposed", False) for socket in node.outputs)
+
+
+def select_demanded(order, edges):
+    """:return: <set> names of nodes from order which are sinks or have sink downstream"""
+    children = {node.name: [] for node in order}
+    for from_name, to_name in edges:
+        children[from_name].append(to_name)
+    demanded = set()
+    for node in reversed(order):
+        if is_sink(node) or any(child in demanded for child in children[node.name]):
+            demanded.add(node.name)
+    return demanded
+
+
+def collect_stale_upstream(nodes, stale_names):
+    """:return: <list> nodes from stale_names in upstream of nodes"""
+    stale = []
+    visited = set()
+    queue = list(nodes)
+    while queue:
+        node = queue.pop()
+        for from_node in iter_upstream_nodes(node):
+            if from_node.name in visited:
+                continue
+            visited.add(from_node.name)
+            queue.append(from_node)
+            if from_node.name in stale_names:
+                stale.append(from_node)
+    return stale
+
+
+def count_cascade_executions(order, edges, roots_names):
+    """
+    Number of executions made by old recursive cascade: every node is processed once per path from roots.
+    """
+    paths = {node.name: 0 for node in order}
+    for name in roots_names:
+        paths[name] = 1
+    children = {node.name: [] for node in order}
+    for from_name, to_name in edges:
+        children[from_name].append(to_name)
+    for node in order:
+        for child in children[node.name]:
+            paths[child] += paths[node.name]
+    return sum(paths.values())
+
+
+class TreeScheduler:
+    """
+    Scheduler for one node tree.
+
+    :param tree_name: <string> name of node tree
+    :param is_running: <bool> True during pass
+    :param pending: <set> names of nodes not yet processed in current pass
+    :param executing: <set> names of nodes processed in this moment
+    :param workers: <int> number of worker threads, None - from settings
+    :param stale: <set> names of nodes not processed in PULL mode because nothing observe them
+    :param content_hashes: <dict> node name -> disk cache hash shared by nodes of current pass, None between passes
+    :param last_stats: <dict> statistics of last pass
+    :param total_stats: <dict> statistics accumulated from all passes
+    """
+
+    def __init__(self, tree_name, workers=None):
+        self.tree_name = tree_name
+        self.workers = workers
+        self.is_running = False
+        self.pending = set()
+        self.executing = set()
+        self.stale = set()
+        self.content_hashes = None
+        self.last_stats = {}
+        self.total_stats = {"runs": 0, "executed": 0, "skipped": 0, "cascade": 0, "saved": 0, "pruned": 0,
+                            "parallel_nodes": 0}
+
+    def process(self, node):
+        """Process node and whole downstream, every node exactly once."""
+        self.process_many([node])
+
+    def process_many(self, nodes, include_roots=True):
+        roots = []
+        for node in nodes:
+            node = resolve_upstream_node(node)
+            if node is not None and is_processable(node) and node not in roots:
+                roots.append(node)
+        if not roots:
+            return
+
+        task = ocvl_globals.OCVL_REGISTERED_TASKS.get(self.tree_name)
+        if task is not None and task.is_running and not is_worker_thread() and not is_delegated_call():
+            # Asynchronous pass of tree in progress (see ocvl.core.async_process), change is joined to it
+            task.schedule([root.name for root in roots])
+            return
+
+        if self.is_running:
+            if include_roots and all(root.name in self.pending for root in roots):
+                # Roots are waiting in current pass, they will be processed anyway
+                return
+            if not include_roots and all(root.name in self.executing for root in roots):
+                # Current pass will process downstream of executing node
+                return
+        self._run(roots, include_roots)
+
+    def process_downstream(self, node):
+        """Process nodes downstream of node, without node itself."""
+        self.process_many([node], include_roots=False)
+
+    def process_stale(self, node_tree):
+        """Process nodes skipped in PULL mode, after switch to PUSH mode."""
+        self.process_many([node for node in node_tree.nodes if node.name in self.stale])
+
+    def get_content_hashes(self):
+        """:return: <dict> hashes shared by current pass, outside of pass new dict (properties could change)"""
+        return self.content_hashes if self.content_hashes is not None else {}
+
+    def _plan_pull(self, roots):
+        """
+        Roots extended by stale nodes upstream of demanded nodes, their data is needed by this pass.
+
+        :return: <list> roots, <OrderedDict> nodes, <list> edges, <list> order, <set> names of demanded nodes
+        """
+        while True:
+            nodes, edges = collect_downstream(roots)
+            order = topological_sort(nodes, edges)
+            demanded = select_demanded(order, edges)
+            stale_roots = []
+            if self.stale:
+                stale_roots = [node for node in collect_stale_upstream([nodes[name] for name in demanded], self.stale)
+                               if node.name not in nodes]
+            if not stale_roots:
+                return roots, nodes, edges, order, demanded
+            roots = roots + stale_roots
+
+    def _run(self, roots, include_roots):
+        excluded_names = set() if include_roots else {root.name for root in roots}
+        with async_baton():
+            if is_pull_mode(roots[0].id_data):
+                roots, nodes, edges, order, demanded = self._plan_pull(roots)
+            else:
+                nodes, edges = collect_downstream(roots)
+                order = topological_sort(nodes, edges)
+                demanded = None
+        roots_names = [root.name for root in roots]
+        cascade = count_cascade_executions(order, edges, roots_names)
+        if excluded_names:
+            order = [node for node in order if node.name not in excluded_names]
+            cascade -= len(excluded_names)
+        pruned = []
+        if demanded is not None:
+            pruned = [node.name for node in order if node.name not in demanded]
+            order = [node for node in order if node.name in demanded]
+        self.stale.difference_update(node.name for node in order)
+        self.stale.update(pruned)
+
+        previous_state = self.is_running, self.pending, self.executing, self.content_hashes
+        self.is_running = True
+        self.pending = {node.name for node in order}
+        self.executing = set()
+        self.content_hashes = {}
+        # Nested pass started from worker thread is processed serially, pool can be busy by its caller
+        runner = LevelRunner(workers=1 if is_worker_thread() and not is_async_thread() else self.workers)
+        executed = skipped = 0
+        try:
+            with trace_section("Pass {}".format(self.tree_name), args={"roots": roots_names}):
+                for index, level in enumerate(split_levels(order, edges)):
+                    with trace_section("Level {}".format(index), args={"nodes": [node.name for node in level]}):
+                        results = runner.run_level(level, lambda node: self._process_node(node, roots_names))
+                    for result in results:
+                        if result is True:
+                            executed += 1
+                        elif result is False:
+                            skipped += 1
+        finally:
+            self.is_running, self.pending, self.executing, self.content_hashes = previous_state
+
+        self._update_stats(roots_names, executed, skipped, cascade, len(pruned), runner.stats)
+
+    def _process_node(self, node, roots_names):
+        """
+        :return: <bool> True if processed, False if skipped by fingerprint, None if requirements fall
+        """
+        check_cancelled()
+        self.pending.discard(node.name)
+        self.executing.add(node.name)
+        try:
+            is_root = node.name in roots_names
+            if not is_root and not self._check_requirements(node):
+                return None
+            return node.process_single(force=is_root)
+        finally:
+            self.executing.discard(node.name)
+
+    def _check_requirements(self, node):
+        try:
+            node.check_input_requirements()
+        except Exception as e:
+            logger.debug("Quick link requirements fall: {}".format(e))
+            return False
+        return True
+
+    def _update_stats(self, roots_names, executed, skipped, cascade, pruned, parallel_stats):
+        saved = max(cascade - executed, 0)
+        self.last_stats = {"roots": roots_names, "executed": executed, "skipped": skipped, "cascade": cascade,
+                           "saved": saved, "pruned": pruned}
+        self.last_stats.update(parallel_stats)
+        self.total_stats["runs"] += 1
+        self.total_stats["executed"] += executed
+        self.total_stats["skipped"] += skipped
+        self.total_stats["cascade"] += cascade
+        self.total_stats["saved"] += saved
+        self.total_stats["pruned"] += pruned
+        self.total_stats["parallel_nodes"] += parallel_stats["parallel_nodes"]
+        logger.debug("Scheduler tree={}, roots={}, executed={}, skipped={}, cascade={}, saved={}, pruned={}, "
+                     "levels={}, parallel_nodes={}, parallelism={:.2f}".format(
+                         self.tree_name, roots_names, executed, skipped, cascade, saved, pruned, parallel_stats["levels"],
+                         parallel_stats["parallel_nodes"], parallel_stats["parallelism"]))
+
+
+def get_scheduler(node_tree):
+    tree_name = node_tree.name
+    scheduler = ocvl_globals.TREE_SCHEDULERS.get(tree_name)
+    if scheduler is None:
+        scheduler = ocvl_globals.TREE_SCHEDULERS[tree_name] = TreeScheduler(tree_name)
+    return scheduler
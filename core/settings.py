@@ -4,14 +4,87 @@ import os
 
 # In draw_buttons_ext width text
 WRAP_TEXT_SIZE_FOR_ERROR_DISPLAY = 75
-# In NodeBase if True make copy for "image_in/img_in" sockets data
-IS_WORK_ON_COPY_INPUT = True
+# In NodeBase if True every ndarray kwarg is copied (legacy), otherwise only inputs declared in n_mutable_inputs;
+# arrays read from socket cache by get_from_props are read-only views
+IS_WORK_ON_COPY_INPUT = os.environ.get("OCVL_COPY_INPUTS", "0") != "0"
+# In NodeBase if True output equal to previous one keep old UUID and downstream nodes are not processed
+IS_REUSE_EQUAL_OUTPUT = True
+# Memory budget in bytes for arrays of Blender images (BLENDER_IMAGE_CACHE), least recently used are dropped
+BLENDER_IMAGE_CACHE_BUDGET = int(os.environ.get("OCVL_IMAGE_CACHE_MB", 512)) * 1024 * 1024
+# Memory budget in bytes for SOCKET_DATA_CACHE, entries without links are evicted over budget
+SOCKET_DATA_CACHE_MEMORY_BUDGET = int(os.environ.get("OCVL_CACHE_BUDGET_MB", 2048)) * 1024 * 1024
+# If True evicted arrays are saved to .npy files and loaded back as memory-mapped arrays
+IS_SOCKET_DATA_CACHE_SPILL = os.environ.get("OCVL_CACHE_SPILL", "0") != "0"
+# Directory for spilled arrays, temporary directory if empty
+SOCKET_DATA_CACHE_SPILL_DIR = os.environ.get("OCVL_CACHE_SPILL_DIR", "")
 # Category nodes which don't should appear in interface
 BLACK_LIST_REGISTER_NODE_CATEGORY = ["__pycache__", "interface", "TODO"]
 # Max number lines displayed on Stethoscope node
 STETHOSCOPE_NODE_MAX_LINES = 30
 # Default filter during use ocvl.ocvl_image_importer operator
 DEFAULT_IMAGE_IMPORTER_FILTER = "*.tif;*.png;*.jpeg;*.jpg"
+# Number of worker threads for independent nodes of node tree, 1 - every node on main thread
+NODE_EXECUTOR_WORKERS = max(int(os.environ.get("OCVL_NODE_WORKERS", min(4, os.cpu_count() or 1))), 1)
+# Number of worker processes for pure Python node work, 0 - process pool disabled
+PROCESS_POOL_WORKERS = int(os.environ.get("OCVL_PROCESS_WORKERS", 0))
+# Start method of worker processes {'spawn', 'forkserver', 'fork'}
+PROCESS_POOL_START_METHOD = os.environ.get("OCVL_PROCESS_START_METHOD", "spawn")
+# Python interpreter for worker processes, empty - detected from sys.executable
+PROCESS_POOL_PYTHON = os.environ.get("OCVL_PROCESS_PYTHON", "")
+# If True ndarrays in SOCKET_DATA_CACHE live in shared memory, process pool read them without copy
+IS_SOCKET_DATA_CACHE_SHARED = os.environ.get("OCVL_CACHE_SHARED", "0") != "0"
+# Smaller arrays are pickled instead of shared memory
+SHARED_MEMORY_MIN_BYTES = 64 * 1024
+# Batch runner: images decoded ahead of processed one, threads for decode and for write of outputs
+BATCH_PREFETCH_IMAGES = int(os.environ.get("OCVL_BATCH_PREFETCH", 8))
+BATCH_DECODE_WORKERS = int(os.environ.get("OCVL_BATCH_DECODE_WORKERS", 2))
+BATCH_WRITE_WORKERS = int(os.environ.get("OCVL_BATCH_WRITE_WORKERS", 2))
+# Files taken by batch runner from directory
+BATCH_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".tif", ".tiff", ".bmp", ".webp")
+# Pipeline runtime: default number of stages and frames waiting between two stages
+PIPELINE_STAGES = int(os.environ.get("OCVL_PIPELINE_STAGES", 3))
+PIPELINE_QUEUE_SIZE = int(os.environ.get("OCVL_PIPELINE_QUEUE", 2))
+# If True every run of node is recorded in NODE_PROFILES, see ocvl.core.profiling
+IS_NODE_PROFILING = os.environ.get("OCVL_PROFILING", "1") != "0"
+# Number of last runs of node kept for percentiles
+PROFILE_WINDOW = int(os.environ.get("OCVL_PROFILE_WINDOW", 100))
+# If False output arrays of nodes with n_output_buffers are not reused as dst of cv2 calls, see ocvl.core.output_buffers
+IS_OUTPUT_BUFFERS = os.environ.get("OCVL_OUTPUT_BUFFERS", "1") != "0"
+# If False results of nodes are not memoized even if node set n_memo_size, see ocvl.core.memo
+IS_NODE_MEMO = os.environ.get("OCVL_MEMO", "1") != "0"
+# Disk cache of node results between sessions, see ocvl.core.disk_cache: results of nodes processed
+# longer than DISK_CACHE_MIN_SECONDS are stored in DISK_CACHE_DIR, least recently used over DISK_CACHE_MAX_BYTES are removed
+IS_DISK_CACHE = os.environ.get("OCVL_DISK_CACHE", "1") != "0"
+DISK_CACHE_DIR = os.environ.get("OCVL_DISK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ocvl", "results"))
+DISK_CACHE_MAX_BYTES = int(os.environ.get("OCVL_DISK_CACHE_MB", 4096)) * 1024 * 1024
+DISK_CACHE_MIN_SECONDS = float(os.environ.get("OCVL_DISK_CACHE_MIN_SECONDS", 0.25))
+# Default of OCVLNodeTree.use_async_process: changes of nodes are processed on background thread, UI is not blocked
+IS_ASYNC_PROCESS = os.environ.get("OCVL_ASYNC", "0") != "0"
+# Property updates of node in this window (seconds) are coalesced and node is evaluated once, 0 - at once
+UPDATE_DEBOUNCE_SECONDS = float(os.environ.get("OCVL_UPDATE_DEBOUNCE", 0.05))
+# Default of OCVLNodeTree.update_policy {'LATEST', 'PREVIEW'}
+UPDATE_POLICY = os.environ.get("OCVL_UPDATE_POLICY", "LATEST")
+# Default of OCVLNodeTree.evaluation_mode {'PUSH', 'PULL'}, PULL evaluate only nodes observed by sinks
+EVALUATION_MODE = os.environ.get("OCVL_EVALUATION_MODE", "PUSH")
+# Seconds between applies of results of asynchronous processing on main thread
+ASYNC_POLL_INTERVAL = float(os.environ.get("OCVL_ASYNC_POLL_INTERVAL", 0.02))
+# Previews: maximal refresh rate, threads downscaling images and released textures kept for reuse
+PREVIEW_MAX_FPS = float(os.environ.get("OCVL_PREVIEW_MAX_FPS", 30))
+PREVIEW_WORKERS = int(os.environ.get("OCVL_PREVIEW_WORKERS", 1))
+PREVIEW_TEXTURE_POOL_SIZE = int(os.environ.get("OCVL_PREVIEW_TEXTURE_POOL", 8))
+# Evaluation of trees after load of file: 'VISIBLE' - trees shown in node editors, others when they are shown,
+# 'ALL' - visible trees first then others, 'SYNC' - every tree at once in load handler. Trees are evaluated one per step
+LOAD_EVALUATION = os.environ.get("OCVL_LOAD_EVALUATION", "VISIBLE")
+LOAD_STEP_INTERVAL = float(os.environ.get("OCVL_LOAD_STEP_INTERVAL", 0.05))
+# Seconds between checks if tree waiting for evaluation is shown in node editor
+LOAD_VISIBILITY_INTERVAL = float(os.environ.get("OCVL_LOAD_VISIBILITY_INTERVAL", 0.5))
+# Directory of manifest of node classes (see ocvl.core.node_manifest), menus are built without import of nodes
+NODE_MANIFEST_DIR = os.environ.get("OCVL_NODE_MANIFEST_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ocvl"))
+# Node files registered in background after start, per step of timer; 0 - all node classes registered at start
+NODE_REGISTER_BATCH = int(os.environ.get("OCVL_NODE_REGISTER_BATCH", 8))
+NODE_REGISTER_INTERVAL = float(os.environ.get("OCVL_NODE_REGISTER_INTERVAL", 0.1))
+# True when nodes are processed by ocvl.runtime without Blender, previews and textures are not made
+IS_HEADLESS = False
 # Debug flag if on display in log many additional information
 DEBUG = os.environ.get("OCVL_DEBUG", False)
 # Maximum value for float number from sys.float_info.max
@@ -37,6 +110,8 @@ NODE_COLOR_REQUIRE_DATE = (1, 0.3, 0)
 NODE_COLOR_REQUIRE_TYPE_DATE = (1, 0.9, 0.5)
 # Color node with CV error
 NODE_COLOR_CV_ERROR = (0.6, 0.0, 0.0)
+# Color node waiting for result of asynchronous processing
+NODE_COLOR_COMPUTING = (0.25, 0.35, 0.6)
 
 ##################################################
 # Quick link settings ###
@@ -0,0 +1,275 @@
+"""
+Transport of data between processes: ndarrays in multiprocessing.shared_memory blocks,
+cv2.KeyPoint and cv2.DMatch lists as plain arrays (they are not picklable).
+
+shared_memory is available from Python 3.8, without it arrays are pickled.
+
+Module don't import bpy.
+"""
+import threading
+from logging import getLogger
+
+import cv2
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+    from multiprocessing import resource_tracker
+except ImportError:
+    shared_memory = None
+    resource_tracker = None
+
+
+logger = getLogger(__name__)
+
+
+KEYPOINTS_TAG = "__keypoints__"
+DMATCHES_TAG = "__dmatches__"
+
+# Data address -> (SharedArray, SharedMemory) for arrays which live in blocks of this process
+_SHARED_BLOCKS = {}
+_lock = threading.Lock()
+
+
+def is_shared_memory_available():
+    return shared_memory is not None
+
+
+class SharedArray:
+    """
+    Picklable description of ndarray in shared memory block.
+
+    :param name: <string> name of shared memory block
+    :param shape: <tuple> shape of array
+    :param dtype: <string> dtype of array
+    """
+    __slots__ = ("name", "shape", "dtype")
+
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = tuple(shape)
+        self.dtype = str(dtype)
+
+    def __getstate__(self):
+        return self.name, self.shape, self.dtype
+
+    def __setstate__(self, state):
+        self.name, self.shape, self.dtype = state
+
+    def __repr__(self):
+        return "<SharedArray {} {} {}>".format(self.name, self.shape, self.dtype)
+
+
+def get_address(array):
+    return array.__array_interface__["data"][0]
+
+
+def share_array(array):
+    """
+    Copy array to new shared memory block.
+
+    :return: (<ndarray> view on block, <SharedArray> description)
+    """
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+    shared[...] = array
+    descriptor = SharedArray(block.name, array.shape, array.dtype)
+    with _lock:
+        _SHARED_BLOCKS[get_address(shared)] = (descriptor, block)
+    return shared, descriptor
+
+
+def export_array(array):
+    """
+    Copy array to new shared memory block owned by receiver: block is closed in this process
+    and receiver unlink it after read (see Decoder with is_owner=True).
+    """
+    array = np.ascontiguousarray(array)
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    descriptor = SharedArray(block.name, array.shape, array.dtype)
+    untrack_block(block)
+    block.close()
+    return descriptor
+
+
+def untrack_block(block):
+    try:
+        resource_tracker.unregister(block._name, "shared_memory")
+    except Exception as e:
+        logger.debug("Shared memory not unregistered from tracker: {}".format(e))
+
+
+def find_shared(array):
+    """Description of array if array (or view on whole array) already lives in shared memory block."""
+    if not isinstance(array, np.ndarray) or not array.flags.c_contiguous:
+        return None
+    item = _SHARED_BLOCKS.get(get_address(array))
+    if item is None:
+        return None
+    descriptor = item[0]
+    if descriptor.shape != array.shape or descriptor.dtype != str(array.dtype):
+        return None
+    return descriptor
+
+
+def release_array(array):
+    """Release block of array created by share_array. Views of array can live after, block name is removed."""
+    with _lock:
+        item = _SHARED_BLOCKS.pop(get_address(array), None)
+    if item is not None:
+        release_block(item[1])
+
+
+def release_block(block):
+    try:
+        block.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        block.close()
+    except BufferError:
+        # Views on block are still alive, memory is released with last of them
+        pass
+
+
+def attach_block(name, is_owner=False):
+    """
+    Open existing block. Worker processes share resource tracker with main process, so block is
+    registered once by owner and unregistered when owner unlink it.
+    """
+    if is_owner:
+        return shared_memory.SharedMemory(name=name)
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attach register block again, it is no-op for the same name in tracker
+        return shared_memory.SharedMemory(name=name)
+
+
+def attach_array(descriptor, blocks):
+    """
+    Array on existing block.
+
+    :param blocks: <list> opened blocks, caller close them when work is finished
+    """
+    block = attach_block(descriptor.name)
+    blocks.append(block)
+    array = np.ndarray(descriptor.shape, dtype=np.dtype(descriptor.dtype), buffer=block.buf)
+    # Block can be storage of socket cache in other process, it mustn't be modified
+    array.flags.writeable = False
+    return array
+
+
+def keypoints_to_array(keypoints):
+    return np.array([(kp.pt[0], kp.pt[1], kp.size, kp.angle, kp.response, kp.octave, kp.class_id)
+                     for kp in keypoints], dtype=np.float64).reshape(-1, 7)
+
+
+def array_to_keypoints(array):
+    return [cv2.KeyPoint(x, y, size, angle, response, int(octave), int(class_id))
+            for x, y, size, angle, response, octave, class_id in array.tolist()]
+
+
+def dmatches_to_array(dmatches):
+    return np.array([(m.queryIdx, m.trainIdx, m.imgIdx, m.distance) for m in dmatches], dtype=np.float64).reshape(-1, 4)
+
+
+def array_to_dmatches(array):
+    return [cv2.DMatch(int(query_idx), int(train_idx), int(img_idx), distance)
+            for query_idx, train_idx, img_idx, distance in array.tolist()]
+
+
+def is_list_of(value, cls):
+    return isinstance(value, (list, tuple)) and len(value) > 0 and all(isinstance(item, cls) for item in value)
+
+
+class Encoder:
+    """
+    Encode values for other process. Arrays bigger than min_bytes go through shared memory,
+    arrays which already live in shared memory (socket cache) are passed without copy.
+
+    :param min_bytes: <int> smaller arrays are pickled
+    :param is_transfer: <bool> blocks are owned by receiver (results of worker process)
+    :param blocks: <list> blocks created for this transport, released by release()
+    """
+
+    def __init__(self, min_bytes=0, is_transfer=False):
+        self.min_bytes = min_bytes
+        self.is_transfer = is_transfer
+        self.blocks = []
+
+    def encode(self, value):
+        if isinstance(value, np.ndarray):
+            return self.encode_array(value)
+        if is_list_of(value, cv2.KeyPoint):
+            return KEYPOINTS_TAG, self.encode_array(keypoints_to_array(value))
+        if is_list_of(value, cv2.DMatch):
+            return DMATCHES_TAG, self.encode_array(dmatches_to_array(value))
+        if isinstance(value, tuple):
+            return tuple(self.encode(item) for item in value)
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.encode(item) for key, item in value.items()}
+        return value
+
+    def encode_array(self, array):
+        if not is_shared_memory_available() or array.nbytes < self.min_bytes or array.dtype.hasobject:
+            return array
+        if self.is_transfer:
+            return export_array(array)
+        descriptor = find_shared(array)
+        if descriptor is not None:
+            return descriptor
+        shared, descriptor = share_array(array)
+        self.blocks.append(shared)
+        return descriptor
+
+    def release(self):
+        for shared in self.blocks:
+            release_array(shared)
+        self.blocks = []
+
+
+class Decoder:
+    """
+    Decode values from other process.
+
+    :param is_owner: <bool> blocks are transferred to this process, arrays are copied out and blocks unlinked
+    :param blocks: <list> attached blocks, closed by close()
+    """
+
+    def __init__(self, is_owner=False):
+        self.is_owner = is_owner
+        self.blocks = []
+
+    def decode(self, value):
+        if isinstance(value, SharedArray):
+            if not self.is_owner:
+                return attach_array(value, self.blocks)
+            block = attach_block(value.name, is_owner=True)
+            array = np.ndarray(value.shape, dtype=np.dtype(value.dtype), buffer=block.buf).copy()
+            release_block(block)
+            return array
+        if isinstance(value, tuple):
+            if len(value) == 2 and isinstance(value[0], str):
+                if value[0] == KEYPOINTS_TAG:
+                    return array_to_keypoints(self.decode(value[1]))
+                if value[0] == DMATCHES_TAG:
+                    return array_to_dmatches(self.decode(value[1]))
+            return tuple(self.decode(item) for item in value)
+        if isinstance(value, list):
+            return [self.decode(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.decode(item) for key, item in value.items()}
+        return value
+
+    def close(self):
+        for block in self.blocks:
+            try:
+                block.close()
+            except BufferError:
+                pass
+        self.blocks = []
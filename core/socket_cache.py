@@ -0,0 +1,292 @@
+"""
+Data cache for sockets (UUID -> ndarray or other value) shared by all node trees.
+
+Cache keeps byte accounting per tree and per node, reference counts derived from live links
+and memory budget. When budget is exceeded entries without references are evicted in LRU order,
+ndarrays may be spilled to .npy files and loaded back as memory-mapped arrays on next access.
+With is_shared ndarrays are stored in shared memory blocks, so worker processes read them without copy.
+
+Module don't import bpy.
+"""
+import os
+import sys
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from logging import getLogger
+
+import numpy as np
+
+from ocvl.core import settings
+from ocvl.core.shared_arrays import find_shared, is_shared_memory_available, release_array, share_array
+
+
+logger = getLogger(__name__)
+
+
+sentinel = object()
+
+
+class DataHandle(str):
+    """
+    UUID of data in cache passed through socket. Readers recognize it by type without parsing string,
+    it compares and hashes like plain string, so it is valid key of cache and node property value.
+
+    :param version: <int> version of data under the same UUID, incremented when output array is reused
+        in place (see ocvl.core.output_buffers)
+    """
+
+    def __new__(cls, value, version=0):
+        handle = super().__new__(cls, value)
+        handle.version = version
+        return handle
+
+
+def new_data_handle():
+    return DataHandle(uuid.uuid4())
+
+
+def get_nbytes(value):
+    if isinstance(value, np.ndarray):
+        return 0 if isinstance(value, np.memmap) else value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(get_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class CacheEntry:
+    __slots__ = ("value", "nbytes", "tree", "node", "refs", "spill_path")
+
+    def __init__(self, value, tree=None, node=None, refs=None):
+        self.value = value
+        self.nbytes = get_nbytes(value)
+        self.tree = tree
+        self.node = node
+        self.refs = refs
+        self.spill_path = None
+
+    @property
+    def is_evictable(self):
+        # refs is None when nobody counted references yet, dict values are socket storage of node trees
+        return self.refs == 0 and not isinstance(self.value, dict)
+
+
+class SocketDataCache:
+    """
+    Dict like cache with memory budget.
+
+    :param budget: <int> maximum bytes kept in memory, None - without limit
+    :param is_spill: <bool> spill evicted ndarrays to disk instead of drop them
+    :param spill_dir: <string> directory for spilled arrays, temporary directory if empty
+    :param is_shared: <bool> store ndarrays bigger than settings.SHARED_MEMORY_MIN_BYTES in shared memory
+    """
+
+    def __init__(self, budget=None, is_spill=False, spill_dir=None, is_shared=False):
+        self.budget = budget
+        self.is_spill = is_spill
+        self.spill_dir = spill_dir
+        self.is_shared = is_shared and is_shared_memory_available()
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "evicted": 0, "spilled": 0, "loaded": 0}
+
+    def __contains__(self, key):
+        try:
+            return key in self._entries
+        except TypeError:
+            return False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(list(self._entries.keys()))
+
+    def keys(self):
+        return list(self._entries.keys())
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __getitem__(self, key):
+        with self._lock:
+            try:
+                entry = self._entries[key]
+            except (KeyError, TypeError):
+                self.stats["misses"] += 1
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            if entry.value is None and entry.spill_path:
+                entry.value = np.load(entry.spill_path, mmap_mode="r")
+                self.stats["loaded"] += 1
+            return entry.value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        with self._lock:
+            self._remove_entry(self._entries.pop(key))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, default=sentinel):
+        with self._lock:
+            try:
+                entry = self._entries.pop(key)
+            except (KeyError, TypeError):
+                if default is sentinel:
+                    raise KeyError(key)
+                return default
+            value = entry.value
+            self._remove_entry(entry)
+            return value
+
+    def clear(self):
+        with self._lock:
+            for entry in self._entries.values():
+                self._remove_entry(entry)
+            self._entries.clear()
+
+    def set(self, key, value, tree=None, node=None, refs=None):
+        """
+        Store value.
+
+        :param tree: <string> name of node tree owner of data
+        :param node: <string> name of node owner of data
+        :param refs: <int> number of live links which read data, None - unknown
+        """
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                if tree is None and refs is None:
+                    tree, node, refs = old_entry.tree, old_entry.node, old_entry.refs
+                if old_entry.value is not value:
+                    self._remove_entry(old_entry)
+            if self.is_shared and self._is_shareable(value):
+                value, _ = share_array(value)
+            self._entries[key] = CacheEntry(value, tree=tree, node=node, refs=refs)
+            self.enforce_budget()
+
+    def _is_shareable(self, value):
+        return isinstance(value, np.ndarray) and not isinstance(value, np.memmap) and not value.dtype.hasobject and \
+            value.nbytes >= settings.SHARED_MEMORY_MIN_BYTES and find_shared(value) is None
+
+    def _remove_entry(self, entry):
+        if isinstance(entry.value, np.ndarray):
+            release_array(entry.value)
+        if entry.spill_path:
+            try:
+                os.remove(entry.spill_path)
+            except OSError as e:
+                logger.debug("Spilled file can't be removed: {}".format(e))
+            entry.spill_path = None
+
+    def get_bytes(self, tree=None, node=None):
+        """Bytes kept in memory by whole cache, node tree or node."""
+        total = 0
+        for entry in list(self._entries.values()):
+            if tree is not None and entry.tree != tree:
+                continue
+            if node is not None and entry.node != node:
+                continue
+            if entry.value is not None and not entry.spill_path:
+                total += entry.nbytes
+        return total
+
+    @property
+    def total_bytes(self):
+        return self.get_bytes()
+
+    def update_references(self, tree, references):
+        """
+        Set reference counts for every entry of node tree.
+
+        :param tree: <string> name of node tree
+        :param references: <dict> key -> number of links reading key
+        """
+        with self._lock:
+            for key, count in references.items():
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refs = count
+                    if entry.tree is None:
+                        entry.tree = tree
+            for key, entry in self._entries.items():
+                if entry.tree == tree and key not in references:
+                    entry.refs = 0
+            self.enforce_budget()
+
+    def drop_node(self, tree, node):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.tree == tree and entry.node == node]:
+                self._remove_entry(self._entries.pop(key))
+
+    def drop_tree(self, tree):
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if entry.tree == tree or key == tree]:
+                self._remove_entry(self._entries.pop(key))
+
+    def enforce_budget(self):
+        if self.budget is None:
+            return
+        with self._lock:
+            resident = self.get_bytes()
+            if resident <= self.budget:
+                return
+            for key, entry in list(self._entries.items()):
+                if resident <= self.budget:
+                    break
+                if not entry.is_evictable or entry.value is None or entry.spill_path:
+                    continue
+                resident -= entry.nbytes
+                if self.is_spill and isinstance(entry.value, np.ndarray):
+                    self._spill(key, entry)
+                else:
+                    self._remove_entry(self._entries.pop(key))
+                    self.stats["evicted"] += 1
+        if resident > self.budget:
+            logger.debug("Socket data cache over budget: {} > {}".format(resident, self.budget))
+
+    def _spill(self, key, entry):
+        if not self.spill_dir:
+            self.spill_dir = tempfile.mkdtemp(prefix="ocvl_cache_")
+        os.makedirs(self.spill_dir, exist_ok=True)
+        spill_path = os.path.join(self.spill_dir, "{}.npy".format(abs(hash(key))))
+        np.save(spill_path, entry.value)
+        release_array(entry.value)
+        entry.value = None
+        entry.spill_path = spill_path
+        self.stats["spilled"] += 1
+
+
+def collect_references(node_tree):
+    """
+    Count live links reading every data key of node tree outputs.
+    Output socket property of node keep key (UUID) of data, links from reroutes are skipped
+    because link to reroute is counted.
+    """
+    references = {}
+    for link in node_tree.links:
+        from_node = link.from_node
+        if from_node.bl_idname == "NodeReroute":
+            continue
+        key = getattr(from_node, link.from_socket.name, None)
+        if isinstance(key, str):
+            references[key] = references.get(key, 0) + 1
+    return references
+
+
+def create_socket_data_cache():
+    return SocketDataCache(
+        budget=settings.SOCKET_DATA_CACHE_MEMORY_BUDGET,
+        is_spill=settings.IS_SOCKET_DATA_CACHE_SPILL,
+        spill_dir=settings.SOCKET_DATA_CACHE_SPILL_DIR,
+        is_shared=settings.IS_SOCKET_DATA_CACHE_SHARED,
+    )
@@ -19,6 +19,8 @@ from ocvl.core import settings
 from ocvl.core import globals as ocvl_globals
 from ocvl.core.exceptions import LackRequiredSocketException
 from ocvl.core.globals import SOCKET_DATA_CACHE
+from ocvl.core.link_index import get_output_socket_id, get_socket_id, get_upstream_socket_id
+from ocvl.core.node_categories import ensure_node_class
 from ocvl.core.register_utils import ocvl_register, ocvl_unregister
 
 from ocvl_addon_pro.tutorial_engine.engine import in_node_context
@@ -27,10 +29,6 @@ from ocvl_addon_pro.tutorial_engine.engine import in_node_context
 sentinel = object()
 
 
-def get_socket_id(socket):
-    return str(hash(socket.id_data.name + socket.node.name + socket.identifier))
-
-
 def process_from_socket(self, context):
     """Update function of exposed properties in Sockets"""
     self.node.process_node(context)
@@ -73,33 +71,30 @@ def set_socket(socket, out):
     SOCKET_DATA_CACHE[s_ng][s_id] = out
 
 
-def get_socket(socket, deepcopy_=True):
+def get_socket(socket, deepcopy_=False):
     """gets socket data from socket,
     if deep copy is True a deep copy is make_dep_dict,
-    to increase performance if the node doesn't mutate input
-    set to False and increase performance substanstilly
+    by default data is returned without copy, nodes which mutate input
+    declare it in n_mutable_inputs and get copy in OCVLNodeBase.clean_kwargs
     """
-    if socket.is_linked:
-        other = socket.other
-        if other:
-            s_id = other.socket_id
-            s_ng = other.id_data.name
-            if s_ng not in SOCKET_DATA_CACHE:
-                if not ocvl_globals.MUTE_LOOKUP_ERROR:
-                    raise LookupError
-                else:
-                    raise LackRequiredSocketException(socket)
-            if s_id in SOCKET_DATA_CACHE[s_ng]:
-                out = SOCKET_DATA_CACHE[s_ng][s_id]
-                if deepcopy_:
-                    return deepcopy(out)
-                else:
-                    return out
+    s_id = get_upstream_socket_id(socket)
+    if s_id is not None:
+        s_ng = socket.id_data.name
+        if s_ng not in SOCKET_DATA_CACHE:
+            if not ocvl_globals.MUTE_LOOKUP_ERROR:
+                raise LookupError
             else:
-                # if data_structure.DEBUG_MODE:
-                #     debug("cache miss: %s -> %s from: %s -> %s",
-                #             socket.node.name, socket.name, other.node.name, other.name)
                 raise LackRequiredSocketException(socket)
+        if s_id in SOCKET_DATA_CACHE[s_ng]:
+            out = SOCKET_DATA_CACHE[s_ng][s_id]
+            if deepcopy_:
+                return deepcopy(out)
+            else:
+                return out
+        else:
+            # if data_structure.DEBUG_MODE:
+            #     debug("cache miss: %s -> %s", socket.node.name, socket.name)
+            raise LackRequiredSocketException(socket)
     # not linked
     raise LackRequiredSocketException(socket)
 
@@ -111,10 +106,8 @@ def get_socket_info(socket):
     if socket.is_output:
         s_id = socket.socket_id
     elif socket.is_linked:
-        other = socket.other
-        if other:
-            s_id = other.socket_id
-        else:
+        s_id = get_upstream_socket_id(socket)
+        if s_id is None:
             return ''
     else:
         return ''
@@ -193,6 +186,7 @@ class OCVL_OT_LinkNewNodeInput(bpy.types.Operator):
         nodes, links = tree.nodes, tree.links
 
         caller_node = nodes.get(self.origin)
+        ensure_node_class(self.new_node_idname)
         new_node = nodes.new(self.new_node_idname)
         self.set_location_new_node(new_node, caller_node)
         n_quick_link_requirements = getattr(caller_node, "n_quick_link_requirements", {})
@@ -318,7 +312,9 @@ class OCVLSocketBase:
 
     @property
     def socket_id(self):
-        return str(hash(self.id_data.name + self.node.name + self.identifier))
+        if self.is_output:
+            return get_output_socket_id(self)
+        return get_socket_id(self.id_data.name, self.node.name, self.identifier)
 
     @property
     def other(self):
@@ -0,0 +1,138 @@
+"""
+Coalescing of property updates of nodes.
+
+update_node don't process node at once: node is queued in PENDING_UPDATES (ocvl.core.globals) and processed
+by bpy.app.timers callback when it has no new update for settings.UPDATE_DEBOUNCE_SECONDS, so burst of updates
+from dragged slider is evaluated once, with latest values. Nodes of one tree due at the same time are processed
+in one pass of scheduler (asynchronous if OCVLNodeTree.use_async_process).
+
+With PREVIEW policy (OCVLNodeTree.update_policy) node is evaluated during drag at most once per window, only
+with its directly linked preview nodes (viewers); full downstream is processed after release (end of burst).
+"""
+import time
+from logging import getLogger
+
+import bpy
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.async_process import schedule_nodes
+from ocvl.core.scheduler import get_scheduler, iter_linked_nodes
+
+
+logger = getLogger(__name__)
+
+
+POLICY_LATEST = "LATEST"
+POLICY_PREVIEW = "PREVIEW"
+
+UPDATE_POLICY_ITEMS = (
+    (POLICY_LATEST, "Latest", "Evaluate node and downstream once with latest values, after burst of changes", "", 0),
+    (POLICY_PREVIEW, "Preview", "Evaluate node and its viewers while dragging, full downstream after release", "", 1),
+)
+
+_timer = {"is_registered": False}
+
+
+class PendingUpdate:
+    """
+    :param first: <float> time of first update of burst
+    :param last: <float> time of last update
+    :param last_preview: <float> time of last preview evaluation, 0 - no preview in burst
+    """
+    __slots__ = ("first", "last", "last_preview")
+
+    def __init__(self, now):
+        self.first = now
+        self.last = now
+        self.last_preview = 0.0
+
+
+def process_now(node_tree, nodes):
+    if getattr(node_tree, "use_async_process", False):
+        schedule_nodes(node_tree, nodes)
+    else:
+        get_scheduler(node_tree).process_many(nodes)
+
+
+def queue_update(node):
+    """Called by update_node on main thread."""
+    window = settings.UPDATE_DEBOUNCE_SECONDS
+    if window <= 0:
+        process_now(node.id_data, [node])
+        return
+    now = time.monotonic()
+    key = node.id_data.name, node.name
+    pending = ocvl_globals.PENDING_UPDATES.get(key)
+    if pending is None:
+        ocvl_globals.PENDING_UPDATES[key] = PendingUpdate(now)
+    else:
+        pending.last = now
+    register_timer()
+
+
+def process_preview(node):
+    """Node and its directly linked preview nodes, rest of downstream waits for release."""
+    node.process_single(force=True)
+    for to_node in iter_linked_nodes(node):
+        if hasattr(to_node, "make_textures"):
+            to_node.process_single(force=False)
+
+
+def flush_updates(now=None):
+    """
+    Process queued nodes without update for debounce window.
+
+    :return: <bool> True while some nodes are queued
+    """
+    now = time.monotonic() if now is None else now
+    window = settings.UPDATE_DEBOUNCE_SECONDS
+    due = {}
+    for key, pending in list(ocvl_globals.PENDING_UPDATES.items()):
+        tree_name, node_name = key
+        node_tree = bpy.data.node_groups.get(tree_name)
+        node = node_tree.nodes.get(node_name) if node_tree is not None else None
+        if node is None:
+            del ocvl_globals.PENDING_UPDATES[key]
+            continue
+        if now - pending.last >= window:
+            del ocvl_globals.PENDING_UPDATES[key]
+            due.setdefault(tree_name, (node_tree, []))[1].append(node)
+        elif (getattr(node_tree, "update_policy", POLICY_LATEST) == POLICY_PREVIEW and
+              not getattr(node_tree, "use_async_process", False) and now - pending.last_preview >= window):
+            pending.last_preview = now
+            try:
+                process_preview(node)
+            except Exception as e:
+                logger.warning("Preview of node {} fail: {}".format(node_name, e))
+
+    for node_tree, nodes in due.values():
+        process_now(node_tree, nodes)
+    return bool(ocvl_globals.PENDING_UPDATES)
+
+
+def register_timer():
+    if _timer["is_registered"]:
+        return
+    _timer["is_registered"] = True
+    bpy.app.timers.register(_poll_updates, first_interval=settings.UPDATE_DEBOUNCE_SECONDS)
+
+
+def _poll_updates():
+    try:
+        is_pending = flush_updates()
+    except Exception:
+        logger.exception("Queued node updates fail")
+        ocvl_globals.PENDING_UPDATES.clear()
+        is_pending = False
+    if is_pending:
+        return settings.UPDATE_DEBOUNCE_SECONDS / 2
+    _timer["is_registered"] = False
+    return None
+
+
+def clear_updates():
+    ocvl_globals.PENDING_UPDATES.clear()
+    if _timer["is_registered"] and bpy.app.timers.is_registered(_poll_updates):
+        bpy.app.timers.unregister(_poll_updates)
+    _timer["is_registered"] = False
@@ -0,0 +1,214 @@
+"""
+Video capture on dedicated thread.
+
+Thread read frames from cv2.VideoCapture into bounded ring buffer, node take frame from ring
+in frame_change_pre handler, so decode latency don't block UI. Consumer policy:
+LATEST - newest frame, older unread frames are dropped (live camera),
+EVERY - oldest unread frame, capture wait when ring is full (movie file).
+
+Module don't import bpy.
+"""
+import threading
+import time
+from collections import deque
+from logging import getLogger
+
+import cv2
+
+from ocvl.core.globals import CAMERA_DEVICE_DICT
+
+
+logger = getLogger(__name__)
+
+
+POLICY_LATEST = "LATEST"
+POLICY_EVERY = "EVERY"
+
+
+class CaptureConfig:
+    """
+    Source and capture properties, capture is reopened when they are changed.
+
+    :param source: <int> camera device or <string> stream url / file path
+    :param width: <int> requested frame width, 0 - default of device
+    :param height: <int> requested frame height, 0 - default of device
+    :param fps: <float> requested frame rate, 0 - default of device
+    :param fourcc: <string> requested codec, example MJPG, empty - default of device
+    :param capacity: <int> size of ring buffer
+    :param policy: <string> POLICY_LATEST or POLICY_EVERY
+    """
+    __slots__ = ("source", "width", "height", "fps", "fourcc", "capacity", "policy")
+
+    def __init__(self, source, width=0, height=0, fps=0, fourcc="", capacity=4, policy=POLICY_LATEST):
+        self.source = source
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.capacity = max(capacity, 1)
+        self.policy = policy
+
+    def _key(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        return isinstance(other, CaptureConfig) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def open(self):
+        capture = cv2.VideoCapture(self.source)
+        if self.fourcc:
+            capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc[:4].ljust(4)))
+        if self.width:
+            capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        if self.height:
+            capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            capture.set(cv2.CAP_PROP_FPS, self.fps)
+        return capture
+
+
+class FrameRing:
+    """
+    Bounded buffer of frames with sequence numbers.
+
+    :param captured: <int> frames put to ring
+    :param dropped: <int> frames never given to consumer
+    :param duplicated: <int> times consumer got frame which was given before
+    """
+
+    def __init__(self, capacity):
+        self.frames = deque(maxlen=capacity)
+        self.condition = threading.Condition()
+        self.captured = 0
+        self.dropped = 0
+        self.duplicated = 0
+        self.last_seq = -1
+        self.last_frame = None
+
+    def is_full(self):
+        return len(self.frames) == self.frames.maxlen
+
+    def put(self, frame, block=False, timeout=None):
+        """
+        :param block: <bool> wait for free place, else oldest frame is dropped
+        :return: <bool> frame was put
+        """
+        with self.condition:
+            if block and not self.condition.wait_for(lambda: not self.is_full(), timeout=timeout):
+                return False
+            if self.is_full():
+                self.dropped += 1
+            self.frames.append((self.captured, frame))
+            self.captured += 1
+            self.condition.notify_all()
+            return True
+
+    def get(self, policy=POLICY_LATEST):
+        """
+        Frame for consumer, don't wait. Without new frame last one is returned again.
+
+        :return: (<int> sequence number, <ndarray> frame), (-1, None) before first frame
+        """
+        with self.condition:
+            if not self.frames:
+                if self.last_frame is not None:
+                    self.duplicated += 1
+                return self.last_seq, self.last_frame
+            if policy == POLICY_LATEST:
+                seq, frame = self.frames.pop()
+                self.dropped += len(self.frames)
+                self.frames.clear()
+            else:
+                seq, frame = self.frames.popleft()
+            self.last_seq, self.last_frame = seq, frame
+            self.condition.notify_all()
+            return seq, frame
+
+    @property
+    def stats(self):
+        return {"captured": self.captured, "dropped": self.dropped, "duplicated": self.duplicated,
+                "buffered": len(self.frames)}
+
+
+class CaptureThread(threading.Thread):
+    """
+    Read frames from capture into ring until stop.
+
+    :param config: <CaptureConfig>
+    :param fps: <float> measured frame rate of capture
+    """
+
+    def __init__(self, config):
+        super().__init__(name="ocvl_capture_{}".format(config.source), daemon=True)
+        self.config = config
+        self.ring = FrameRing(config.capacity)
+        self.capture = config.open()
+        self.stop_event = threading.Event()
+        self.fps = 0.0
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def run(self):
+        is_blocking = self.config.policy == POLICY_EVERY
+        start, count = time.perf_counter(), 0
+        while not self.stop_event.is_set():
+            success, frame = self.capture.read()
+            if not success or frame is None:
+                if is_blocking:
+                    # End of movie, consumer get last frame again
+                    break
+                self.stop_event.wait(0.01)
+                continue
+            while not self.ring.put(frame, block=is_blocking, timeout=0.1):
+                if self.stop_event.is_set():
+                    return
+            count += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= 1.0:
+                self.fps, start, count = count / elapsed, time.perf_counter(), 0
+
+    def read(self, policy=None):
+        """cv2.VideoCapture like read from ring: (<bool> success, <ndarray> frame)."""
+        _, frame = self.ring.get(policy or self.config.policy)
+        return frame is not None, frame
+
+    def stop(self):
+        self.stop_event.set()
+        with self.ring.condition:
+            self.ring.condition.notify_all()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout=1.0)
+        self.capture.release()
+
+    release = stop
+
+
+def get_capture(config):
+    """Running capture thread for config, capture of the same source with other properties is reopened."""
+    capture = CAMERA_DEVICE_DICT.get(config.source)
+    if capture is not None and capture.config == config:
+        return capture
+    if capture is not None:
+        capture.stop()
+    capture = CaptureThread(config)
+    CAMERA_DEVICE_DICT[config.source] = capture
+    if capture.isOpened():
+        capture.start()
+    else:
+        logger.warning("Video source {} can't be opened".format(config.source))
+    return capture
+
+
+def release_capture(source):
+    capture = CAMERA_DEVICE_DICT.pop(source, None)
+    if capture is not None:
+        capture.stop()
+
+
+def release_all_captures():
+    for source in list(CAMERA_DEVICE_DICT):
+        release_capture(source)
@@ -9,6 +9,7 @@ class OCVLcompleteSymmNode(OCVLNodeBase):
 
     n_doc = "Copies the lower or the upper half of a square matrix to another half."
     n_requirements = {"__and__": ["m_in"]}
+    n_mutable_inputs = ("m_in",)
     n_input_output_only = True
 
     m_in: bpy.props.StringProperty(name="m_in", default=str(uuid.uuid4()), description="Input-output floating-point square matrix.")
@@ -27,8 +28,7 @@ class OCVLcompleteSymmNode(OCVLNodeBase):
             'lowerToUpper_in': self.get_from_props("lowerToUpper_in"),
             }
 
-        m_out = self.get_from_props("m_in")
-        _ = self.process_cv(fn=cv2.completeSymm, kwargs=kwargs)
+        m_out = self.process_cv(fn=cv2.completeSymm, kwargs=kwargs)
         self.refresh_output_socket("m_out", m_out, is_uuid_type=True)
 
     def draw_buttons(self, context, layout):
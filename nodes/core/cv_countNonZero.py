@@ -9,6 +9,7 @@ class OCVLcountNonZeroNode(OCVLNodeBase):
 
     n_doc = "Counts non-zero array elements."
     n_requirements = {"__and__": ["src_in"]}
+    n_parallel_safe = False
     n_quick_link_requirements = {"src_in": {"code_in": "COLOR_BGR2GRAY", "color_in": (0, 0, 0, 0)}}
 
     src_in: bpy.props.StringProperty(name="src", default=str(uuid.uuid4()), description="First input single channel array or a scalar.")
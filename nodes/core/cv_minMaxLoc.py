@@ -9,6 +9,7 @@ class OCVLminMaxLocNode(OCVLNodeBase):
 
     n_doc = "Finds the global minimum and maximum in an array."
     n_requirements = {"__and__": ["src_in"]}
+    n_parallel_safe = False
     n_quick_link_requirements = {"src_in": {"code_in": "COLOR_BGR2GRAY"}}
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), description="Input single-channel array.")
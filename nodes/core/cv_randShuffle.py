@@ -10,6 +10,7 @@ class OCVLrandShuffleNode(OCVLNodeBase):
 
     n_doc = "Shuffles the array elements randomly."
     n_requirements = {"__and__": ["dst_in"]}
+    n_mutable_inputs = ("dst_in",)
 
     dst_in: bpy.props.StringProperty(name="dst_in", default=str(uuid.uuid4()),  description="Input/output numerical 1D array.")
     iterFactor_in: bpy.props.FloatProperty(name="iterFactor_in", default=1, min=0, max=100, update=update_node, description="Scale factor that determines the number of random swap operations.")
@@ -24,7 +25,7 @@ class OCVLrandShuffleNode(OCVLNodeBase):
 
     def wrapped_process(self):
         kwargs = {
-            'dst_in': self.get_from_props("dst_in").copy(),
+            'dst_in': self.get_from_props("dst_in"),
             'iterFactor_in': self.get_from_props("iterFactor_in"),
             }
 
@@ -10,6 +10,7 @@ class OCVLrandnNode(OCVLNodeBase):
 
     n_doc = "Fills the array with normally distributed random numbers."
     n_requirements = {"__and__": ["dst_in"]}
+    n_mutable_inputs = ("dst_in",)
 
     dst_in: bpy.props.StringProperty(name="dst_in", default=str(uuid.uuid4()),  description="Output array of random numbers; the array must be pre-allocated.")
     mean_in: bpy.props.IntProperty(name="mean_in", default=100, min=0, max=1000, update=update_node, description="Mean value (expectation) of the generated random numbers.")
@@ -28,7 +29,7 @@ class OCVLrandnNode(OCVLNodeBase):
         kwargs = {
             'mean_in': self.get_from_props("mean_in"),
             'stddev_in': self.get_from_props("stddev_in"),
-            'dst_in': self.get_from_props("dst_in").copy(),
+            'dst_in': self.get_from_props("dst_in"),
             }
 
         dst_out = self.process_cv(fn=cv2.randn, kwargs=kwargs)
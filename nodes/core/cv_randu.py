@@ -10,6 +10,7 @@ class OCVLranduNode(OCVLNodeBase):
 
     n_doc = "Generates a single uniformly-distributed random number or an array of random numbers."
     n_requirements = {"__and__": ["dst_in"]}
+    n_mutable_inputs = ("dst_in",)
     n_quick_link_requirements = {"dst_in": {"code_in": "COLOR_BGR2GRAY"}}
 
     dst_in: bpy.props.StringProperty(name="dst_in", default=str(uuid.uuid4()),  description="Output array of random numbers; the array must be pre-allocated.")
@@ -29,7 +30,7 @@ class OCVLranduNode(OCVLNodeBase):
         kwargs = {
             'low_in': self.get_from_props("low_in"),
             'high_in': self.get_from_props("high_in"),
-            'dst_in': self.get_from_props("dst_in").copy(),
+            'dst_in': self.get_from_props("dst_in"),
             }
 
         dst_out = self.process_cv(fn=cv2.randu, kwargs=kwargs)
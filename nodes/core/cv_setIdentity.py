@@ -10,6 +10,7 @@ class OCVLsetIdentityNode(OCVLNodeBase):
 
     n_doc = "Initializes a scaled identity matrix."
     n_requirements = {"__and__": ["mtx_in"]}
+    n_mutable_inputs = ("mtx_in",)
 
     mtx_in: bpy.props.StringProperty(name="mtx_in", default=str(uuid.uuid4()),  description="Matrix to initialize (not necessarily square).")
     s_in: bpy.props.IntProperty(name="s_in", default=150, min=0, max=255, update=update_node, description="Value to assign to diagonal elements.")
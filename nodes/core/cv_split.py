@@ -21,6 +21,7 @@ class OCVLsplitNode(OCVLNodeBase):
 
     n_doc = "Divides a multi-channel array into several single-channel arrays."
     n_requirements = {"__and__": ["src_in"]}
+    n_parallel_safe = False
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), description="Input multi-channel array.")
 
@@ -12,6 +12,7 @@ class OCVLarrowedLineNode(OCVLNodeBase):
     n_doc = "Draws a arrow segment pointing from the first point to the second one."
     n_quick_link_requirements = {"img_in": {"loc_image_mode": "PLANE"}}
     n_requirements = {"__and__": ["img_in"]}
+    n_mutable_inputs = ("img_in",)
 
     img_in: bpy.props.StringProperty(name="img_in", default=str(uuid.uuid4()), description="Input image.")
     pt1_in: bpy.props.IntVectorProperty(default=(0, 0), size=2, update=update_node, description="First point of the line segment.")
@@ -12,6 +12,7 @@ class OCVLcircleNode(OCVLNodeBase):
     n_doc = "Draws a circle."
     n_quick_link_requirements = {"img_in": {"loc_image_mode": "PLANE"}}
     n_requirements = {"__and__": ["img_in"]}
+    n_mutable_inputs = ("img_in",)
 
     img_in: bpy.props.StringProperty(name="img_in", default=str(uuid.uuid4()), description="Input image.")
     img_out: bpy.props.StringProperty(name="img_out", default=str(uuid.uuid4()), description="Output image.")
@@ -11,6 +11,7 @@ class OCVLdrawContoursNode(OCVLNodeBase):
     n_doc = "Draws contours outlines or filled contours."
     n_quick_link_requirements = {"image_in": {"code_in": "COLOR_BGR2GRAY", "color_in": (0, 0, 0, 0)}, "multi_link": ["contours_in", "image_in", "hierarchy_in"]}
     n_requirements = {"__and__": ["image_in", "contours_in"]}
+    n_mutable_inputs = ("image_in",)
 
     image_in: bpy.props.StringProperty(name="image_in", default=str(uuid.uuid4()), description="Input image.")
     image_out: bpy.props.StringProperty(name="image_out", default=str(uuid.uuid4()), description="Output image.")
@@ -23,6 +23,7 @@ class OCVLellipseNode(OCVLNodeBase):
     n_doc = "Draws a simple or thick elliptic arc or fills an ellipse sector."
     n_quick_link_requirements = {"image_in": {"loc_image_mode": "PLANE"}}
     n_requirements = {"__and__": ["image_in"]}
+    n_mutable_inputs = ("img_in",)
 
     def update_layout(self, context):
         self.update_sockets(context)
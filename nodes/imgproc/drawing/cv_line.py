@@ -10,6 +10,7 @@ class OCVLlineNode(OCVLNodeBase):
     bl_icon = 'GREASEPENCIL'
     n_doc = "Draws a line segment connecting two points."
     n_requirements = {"__and__": ["img_in"]}
+    n_mutable_inputs = ("img_in",)
     n_quick_link_requirements = {"img_in": {"loc_image_mode": "PLANE"}}
 
     img_in: bpy.props.StringProperty(name="img_in", default=str(uuid.uuid4()), description="Input image")
@@ -11,6 +11,7 @@ class OCVLpolylinesNode(OCVLNodeBase):
     bl_icon = 'GREASEPENCIL'
     n_doc = "Draws several polygonal curves."
     n_requirements = {"__and__": ["img_in", "pts_in"]}
+    n_mutable_inputs = ("img_in",)
     n_quick_link_requirements = {
         "img_in": {"loc_image_mode": "PLANE"},
         "pts_in": {"__type_node__": "OCVLMatNode", "loc_input_mode": "MANUAL", "value_type_in": "float32", "loc_manual_input": "[[10, 10], [20, 80], [70, 90]]"},
@@ -20,6 +20,7 @@ class OCVLresizeNode(OCVLNodeBase):
 
     n_doc = "Resizes an image."
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "dst_out"}
 
     def update_layout(self, context):
         self.update_sockets(context)
@@ -10,6 +10,7 @@ class OCVLequalizeHistNode(OCVLNodeBase):
     n_doc = "Equalizes the histogram of a grayscale image."
     n_quick_link_requirements = {"src_in": {"code_in": "COLOR_BGR2GRAY"}}
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "dst_out"}
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), description="Source 8-bit single channel image.")
     dst_out: bpy.props.StringProperty(name="dst_out", default=str(uuid.uuid4()), description="Output image.")
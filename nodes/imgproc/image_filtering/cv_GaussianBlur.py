@@ -11,6 +11,7 @@ class OCVLGaussianBlurNode(OCVLNodeBase):
 
     n_doc = "Blurs an image using a Gaussian filter."
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "dst_out"}
 
     def set_ksize(self, value):
         ksize_x = value[0] if value[0] % 2 != 0 else value[0] + 1
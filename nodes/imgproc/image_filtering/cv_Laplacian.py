@@ -9,6 +9,7 @@ class OCVLLaplacianNode(OCVLNodeBase):
 
     n_doc = "Calculates the Laplacian of an image."
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "dst_out"}
 
     def set_ksize(self, value):
         if value % 2 == 0:
@@ -9,6 +9,7 @@ class OCVLScharrNode(OCVLNodeBase):
 
     n_doc = "Calculates the first x- or y- image derivative using Scharr operator."
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "dst_out"}
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), description="Input image.")
     dx_in: bpy.props.IntProperty(default=1, min=0, max=1, update=update_node, description="Order of the derivative x.")
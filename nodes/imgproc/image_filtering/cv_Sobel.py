@@ -9,6 +9,7 @@ class OCVLSobelNode(OCVLNodeBase):
 
     n_doc = "Calculates the first, second, third, or mixed image derivatives using an extended Sobel operator."
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "dst_out"}
 
     def set_ksize(self, value):
         if value % 2 == 0:
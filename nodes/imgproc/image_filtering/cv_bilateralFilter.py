@@ -11,6 +11,7 @@ class OCVLbilateralFilterNode(OCVLNodeBase):
 
     n_doc = "Applies the bilateral filter to an image."
     n_requirements = {"__and__": ["src_in"]}
+    n_memo_size = 8
 
     d_in: bpy.props.IntProperty(default=8, min=1, max=80, update=update_node, description="Diameter of each pixel neighborhood that is used during filtering. If it is non-positive, it is computed from sigmaSpace.")
     sigmaColor_in: bpy.props.FloatProperty(default=130, min=0, max=255, update=update_node, description="Filter sigma in the color space.")
@@ -11,6 +11,7 @@ class OCVLboxFilterNode(OCVLNodeBase):
 
     n_doc = "Blurs an image using the box filter."
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "dst_in"}
 
     def get_anchor(self):
         return self.get("anchor_in", (-1, -1))
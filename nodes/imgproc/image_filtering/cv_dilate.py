@@ -12,6 +12,7 @@ class OCVLdilateNode(OCVLNodeBase):
 
     n_doc = "Dilates an image by using a specific structuring element."
     n_requirements = {"__and__": ["src_in", "kernel_in"]}
+    n_output_buffers = {"dst": "dst_out"}
     n_quick_link_requirements = {
         "kernel_in": {"__type_node__": "OCVLMatNode", "loc_input_mode": "MANUAL", "loc_manual_input": "[[1, 1, 1], [1, 1, 1], [1, 1, 1]]"}
     }
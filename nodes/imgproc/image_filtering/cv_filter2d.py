@@ -11,6 +11,7 @@ class OCVLfilter2dNode(OCVLNodeBase):
 
     n_doc = "Convolves an image with the kernel."
     n_requirements = {"__and__": ["src_in", "kernel_in"]}
+    n_output_buffers = {"dst": "dst_out"}
     n_quick_link_requirements = {
         "kernel_in": {"__type_node__": "OCVLMatNode", "loc_input_mode": "MANUAL", "loc_manual_input": "[[1, 1, 0], [1, 0, 0], [0, 0, 0]]"}
     }
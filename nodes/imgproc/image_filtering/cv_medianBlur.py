@@ -9,6 +9,7 @@ class OCVLmedianBlurNode(OCVLNodeBase):
     n_doc = "The function smoothes an image using the median filter with the ksize aperture. Each channel of a multi-channel image is processed independently. In-place operation is supported."
     n_see_also = "bileteralFilter,blur,boxFilter,GaussianBlur"
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "dst_out"}
 
     def set_ksize(self, value):
         if value % 2 == 0:
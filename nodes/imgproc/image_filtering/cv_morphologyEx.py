@@ -11,6 +11,7 @@ class OCVLmorphologyExNode(OCVLNodeBase):
 
     n_doc = "Performs advanced morphological transformations."
     n_requirements = {"__and__": ["src_in", "kernel_in"]}
+    n_output_buffers = {"dst": "dst_out"}
     n_quick_link_requirements = {
         "kernel_in": {"__type_node__": "OCVLMatNode", "loc_input_mode": "MANUAL", "loc_manual_input": "[[1, 1, 1], [1, 1, 1], [1, 1, 1]]"}
     }
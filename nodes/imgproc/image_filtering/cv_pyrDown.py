@@ -2,6 +2,7 @@ import uuid
 
 import bpy
 import cv2
+from ocvl.core.socket_cache import DataHandle
 from ocvl.core.node_base import OCVLNodeBase, update_node
 
 
@@ -9,6 +10,7 @@ class OCVLpyrDownNode(OCVLNodeBase):
 
     n_doc = "Blurs an image and downsamples it."
     n_requirements = {"__and__": ["src_in"]}
+    n_parallel_safe = False
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), description="Input image.")
 
@@ -56,7 +58,7 @@ class OCVLpyrDownNode(OCVLNodeBase):
                     self.outputs.new("OCVLImageSocket", prop_name)
                 setattr(self, prop_name, _uuid)
                 self.socket_data_cache[_uuid] = pyramid[i]
-                self.outputs[prop_name].sv_set(_uuid)
+                self.outputs[prop_name].sv_set(DataHandle(_uuid))
             else:
                 if self.outputs.get(prop_name):
                     self.outputs.remove(self.outputs[prop_name])
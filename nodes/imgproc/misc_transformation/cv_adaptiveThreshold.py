@@ -23,6 +23,7 @@ class OCVLadaptiveThresholdNode(OCVLNodeBase):
     n_doc = "Applies an adaptive threshold to an array."
     n_quick_link_requirements = {"image_in": {"code_in": "COLOR_BGR2GRAY"}}
     n_requirements = {"__and__": ["image_in"]}
+    n_output_buffers = {"dst": "image_out"}
 
     image_in: bpy.props.StringProperty(name="image_in", default=str(uuid.uuid4()), description="Source 8-bit single-channel image.")
     maxValue_in: bpy.props.IntProperty(default=150, min=0, max=255, update=update_node, description="Non-zero value assigned to the pixels for which the condition is satisfied.")
@@ -11,6 +11,7 @@ class OCVLcvtColorNode(OCVLNodeBase):
 
     n_doc = "Converts an image from one color space to another."
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "dst_out"}
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), description="Input image: 8-bit unsigned, 16-bit unsigned ( CV_16UC... ), or single-precision floating-point.")
     dstCn_in: bpy.props.IntProperty(default=0, update=update_node, min=0, max=4, description="Number of channels in the destination image; if the parameter is 0, the number of the channels is derived automatically from input image and code.")
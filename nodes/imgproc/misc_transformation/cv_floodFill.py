@@ -21,6 +21,7 @@ class OCVLfloodFillNode(OCVLNodeBase):
 
     n_doc = "Fills a connected component with the given color."
     n_requirements = {"__and__": ["image_in", "mask_in"]}
+    n_mutable_inputs = ("image_in", "mask_in")
     n_quick_link_requirements = {"mask_in": {"width_in": 102, "height_in": 102},}
 
     image_in: bpy.props.StringProperty(name="image_in", default=str(uuid.uuid4()), description="Source 8-bit single-channel image.")
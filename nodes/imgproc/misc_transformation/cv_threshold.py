@@ -17,6 +17,7 @@ class OCVLthresholdNode(OCVLNodeBase):
 
     n_doc = "Applies a fixed-level threshold to each array element."
     n_requirements = {"__and__": ["src_in"]}
+    n_output_buffers = {"dst": "image_out"}
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), description="Input array (single-channel, 8-bit or 32-bit floating point).")
     thresh_in: bpy.props.IntProperty(default=127, min=0, max=255, update=update_node, subtype="FACTOR", description="Threshold value.")
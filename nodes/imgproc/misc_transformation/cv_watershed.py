@@ -11,6 +11,7 @@ class OCVLwatershedNode(OCVLNodeBase):
 
     n_doc = "Performs a marker-based image segmentation using the watershed algorithm."
     n_requirements = {"__and__": ["image_in", "markers_in"]}
+    n_mutable_inputs = ("markers_in",)
     n_quick_link_requirements = {
         "markers_in": {"__type_node__": "OCVLconnectedComponentsNode"}
     }
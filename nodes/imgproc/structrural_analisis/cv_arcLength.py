@@ -9,6 +9,7 @@ class OCVLarcLengthNode(OCVLNodeBase):
 
     n_doc = "Calculates a contour perimeter or a curve length."
     n_requirements = {"__and__": ["curve_in"]}
+    n_parallel_safe = False
 
     curve_in: bpy.props.StringProperty(default=str(uuid.uuid4()), description="Input vector of 2D points, stored in std::vector or Mat.")
     closed_in: bpy.props.BoolProperty(default=False, update=update_node, description="Flag indicating whether the curve is closed or not.")
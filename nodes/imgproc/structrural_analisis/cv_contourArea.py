@@ -9,6 +9,7 @@ class OCVLcontourAreaNode(OCVLNodeBase):
 
     n_doc = "Calculates a contour area."
     n_requirements = {"__and__": ["contour_in"]}
+    n_parallel_safe = False
 
     contour_in: bpy.props.StringProperty(name="contour_in", default=str(uuid.uuid4()), description="Input vector of 2D points (contour vertices), stored in std::vector or Mat.")
     oriented_in: bpy.props.BoolProperty(default=False, update=update_node, description="Oriented area flag. If it is true, the function returns a signed area value, depending on the contour orientation (clockwise or counter-clockwise).")
@@ -38,7 +38,7 @@ class OCVLfindContoursNode(OCVLNodeBase):
             }
 
         contours_out, hierarchy_out = self.process_cv(fn=cv2.findContours, kwargs=kwargs)
-        self.refresh_output_socket("image_out", image_in.copy(), is_uuid_type=True)
+        self.refresh_output_socket("image_out", image_in, is_uuid_type=True)
         self.refresh_output_socket("contours_out", contours_out, is_uuid_type=True)
         self.refresh_output_socket("hierarchy_out", hierarchy_out, is_uuid_type=True)
 
@@ -8,6 +8,8 @@ import numpy as np
 
 from ocvl.core.node_base import OCVLNodeBase
 from ocvl.core.globals import SOCKET_DATA_CACHE
+from ocvl.core.process_pool import is_process_pool_enabled
+from ocvl.core.process_worker import run_custom_code
 
 
 array_256_repr = """
@@ -63,6 +65,8 @@ class OCVLCustomInputNode(OCVLNodeBase):
 
     n_doc = "Custom Python code input."
     n_requirements = {}
+    n_always_process = True
+    n_parallel_safe = False
 
     def update_layout(self, context):
         self.update_sockets(context)
@@ -72,6 +76,7 @@ class OCVLCustomInputNode(OCVLNodeBase):
     val_in: bpy.props.StringProperty(default=str(uuid.uuid4()), update=update_layout)
     loc_vars_code: bpy.props.StringProperty(update=update_layout)
     loc_template: bpy.props.EnumProperty(items=INPUT_TEMPLATES_ITEMS, default="None", update=update_layout, description="Template for custom input")
+    loc_run_in_process: bpy.props.BoolProperty(default=False, update=update_layout, name="Run in process", description="Execute code in worker process (without bpy), if process pool is enabled")
 
     def init(self, context):
         self.width = 200
@@ -99,15 +104,21 @@ class OCVLCustomInputNode(OCVLNodeBase):
         old_locals = set(context.keys())
 
         loc_vars_code = "\n".join([line.body for line in bpy.data.texts.get(self.name).lines])
-        try:
-            exec(loc_vars_code, {}, context)
-            self.n_error = ""
-        except Exception as e:
-
-            self.n_error =  str(e)
-            self.n_error_line = inspect.getinnerframes(sys.exc_info()[2])[-1].lineno
-            raise
-        new_vars = set(context.keys()) - old_locals
+        if self.loc_run_in_process and is_process_pool_enabled():
+            context.pop("bpy", None)
+            new_values = self.process_in_pool(fn=run_custom_code, args=(loc_vars_code, context))
+            context.update(new_values)
+            new_vars = set(new_values.keys())
+        else:
+            try:
+                exec(loc_vars_code, {}, context)
+                self.n_error = ""
+            except Exception as e:
+
+                self.n_error =  str(e)
+                self.n_error_line = inspect.getinnerframes(sys.exc_info()[2])[-1].lineno
+                raise
+            new_vars = set(context.keys()) - old_locals
 
         for socket_name in self.outputs.keys():
             if socket_name in ["image_out", "points_out", 'loc_vars_code']:
@@ -132,6 +143,8 @@ class OCVLCustomInputNode(OCVLNodeBase):
 
         row.prop_search(self, "loc_vars_code", bpy.data, "texts", text="")
         row.operator('text.get_array_from_text', icon="FILE_REFRESH", text="").origin = self.get_node_origin(props_name=["val_in"])
+        if is_process_pool_enabled():
+            self.add_button(layout, "loc_run_in_process")
 
     def _refresh_inputs(self):
         for i, input in enumerate(reversed(self.inputs)):
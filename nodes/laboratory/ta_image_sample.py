@@ -1,3 +1,5 @@
+import os
+
 import bpy
 import cv2
 import uuid
@@ -6,6 +8,7 @@ import numpy as np
 from logging import getLogger
 
 from ocvl.core import settings
+from ocvl.core.globals import PREFETCHED_IMAGES
 from ocvl.core.node_base import OCVLPreviewNodeBase
 from ocvl.core.image_utils import convert_to_cv_image
 
@@ -81,6 +84,22 @@ class OCVLImageSampleNode(OCVLPreviewNodeBase):
 
         self.update_layout(context)
 
+    def get_content_salt(self):
+        if self.loc_image_mode == "RANDOM":
+            return None
+        if self.loc_image_mode != "FILE":
+            return ()
+        if self.loc_name_image in bpy.data.images:
+            filepath = bpy.path.abspath(bpy.data.images[self.loc_name_image].filepath)
+        else:
+            filepath = self.loc_filepath
+        try:
+            stat = os.stat(filepath)
+        except (OSError, ValueError):
+            # Generated or packed image, content is not known from file
+            return None
+        return filepath, stat.st_mtime_ns, stat.st_size
+
     def wrapped_process(self):
         logger.info("Process: self: {}, loc_image_mode: {}, loc_filepath: {}".format(self, self.loc_image_mode, self.loc_filepath))
         image = None
@@ -105,7 +124,9 @@ class OCVLImageSampleNode(OCVLPreviewNodeBase):
                 image = convert_to_cv_image(bpy.data.images[self.loc_name_image])
                 uuid_ = self.loc_name_image
             elif self.loc_filepath:
-                image = cv2.imread(self.loc_filepath, flags=cv2.IMREAD_UNCHANGED)
+                image = PREFETCHED_IMAGES.pop(self.loc_filepath, None)
+                if image is None:
+                    image = cv2.imread(self.loc_filepath, flags=cv2.IMREAD_UNCHANGED)
             if image is None:
                 image = np.zeros((200, 200, 3), np.uint8)
 
@@ -115,11 +136,12 @@ class OCVLImageSampleNode(OCVLPreviewNodeBase):
         if value_type_in != "NONE":
             image = image.astype(getattr(np, value_type_in))
 
-        image, self.image_out = self._update_node_cache(image=image, resize=False, uuid_=uuid_)
-        self.outputs['image_out'].sv_set(self.image_out)
+        image, image_out = self._update_node_cache(image=image, resize=False, uuid_=uuid_)
+        self.image_out = image_out
+        self.outputs['image_out'].sv_set(image_out)
         self.refresh_output_socket("height_out", image.shape[0])
         self.refresh_output_socket("width_out", image.shape[1])
-        self.make_textures(image, uuid_=self.image_out)
+        self.make_textures(image, uuid_=image_out)
         self.add_image_meta_info(image)
 
     def draw_buttons(self, context, layout):
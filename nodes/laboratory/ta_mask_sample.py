@@ -6,6 +6,7 @@ import numpy as np
 from logging import getLogger
 
 from ocvl.core import settings
+from ocvl.core.socket_cache import DataHandle
 from ocvl.core.node_base import OCVLPreviewNodeBase
 
 logger = getLogger(__name__)
@@ -78,7 +79,7 @@ class OCVLMaskSampleNode(OCVLPreviewNodeBase):
             image = image.astype(getattr(np, value_type_in))
 
         image, self.image_out = self._update_node_cache(image=image, resize=False, uuid_=uuid_)
-        self.outputs['image_out'].sv_set(self.image_out)
+        self.outputs['image_out'].sv_set(DataHandle(self.image_out))
         self.refresh_output_socket("height_out", image.shape[0])
         self.refresh_output_socket("width_out", image.shape[1])
         self.make_textures(image, uuid_=self.image_out)
@@ -7,6 +7,7 @@ from ocvl.core.settings import STETHOSCOPE_NODE_MAX_LINES, WRAP_TEXT_SIZE_FOR_ER
 class OCVLStethoscopeNode(OCVLNodeBase):
 
     n_doc = "Stethoscope"
+    n_is_sink = True
     n_requirements = {"__and__": ["matrix_in"]}
 
     matrix_in: bpy.props.StringProperty(name="matrix_in", default="[]")
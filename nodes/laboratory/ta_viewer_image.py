@@ -14,6 +14,7 @@ class OCVLImageViewerNode(OCVLPreviewNodeBase):
     bl_icon = 'ZOOM_ALL'
 
     n_doc = "Image viewer"
+    n_is_sink = True
 
     image_in: bpy.props.StringProperty(default='')
 
@@ -25,7 +26,9 @@ class OCVLImageViewerNode(OCVLPreviewNodeBase):
         image = self.get_from_props("image_in")
         if image.dtype not in VALID_INPUT_DTYPES:
             image = image.astype("uint8")
-        self.make_textures(image)
+        # Preview texture of upstream node with the same data is shared
+        uuid_ = self.inputs["image_in"].sv_get()
+        self.make_textures(image, uuid_=uuid_ if self.is_uuid(uuid_) else None)
         self.add_image_meta_info(image)
 
     def generate_code(self):
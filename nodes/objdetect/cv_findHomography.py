@@ -2,8 +2,8 @@ import uuid
 
 import bpy
 import cv2
-import numpy as np
 from ocvl.core.node_base import OCVLNodeBase, update_node
+from ocvl.core.process_worker import points_from_matches
 
 METHOD_MODE_ITEMS = (
     ("0", "0", "0", "", 0),
@@ -77,15 +77,10 @@ class OCVLfindHomographyNode(OCVLNodeBase):
             dstPoints_in = self.get_from_props("srcPoints_in")
         elif work_mode == "MATCHES":
             matches_in = self.get_from_props("matches_in")
-
-            good = []
-            for dmatch in matches_in:
-                if dmatch.distance < 1000:
-                    good.append(dmatch)
             keypoints1_in = self.get_from_props("keypoints1_in")
             keypoints2_in = self.get_from_props("keypoints2_in")
-            srcPoints_in = np.float32([keypoints1_in[m.queryIdx].pt for m in good]).reshape(-1, 1, 2)
-            dstPoints_in = np.float32([keypoints2_in[m.trainIdx].pt for m in good]).reshape(-1, 1, 2)
+            srcPoints_in, dstPoints_in = self.process_in_pool(
+                fn=points_from_matches, args=(matches_in, keypoints1_in, keypoints2_in, 1000))
 
         kwargs = {
             'srcPoints_in': srcPoints_in,
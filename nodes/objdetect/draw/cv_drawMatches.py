@@ -1,9 +1,8 @@
 import uuid
-from functools import partial
 
 import bpy
-import cv2
 from ocvl.core.node_base import OCVLNodeBase, update_node
+from ocvl.core.process_worker import draw_matches
 
 
 class OCVLdrawMatchesNode(OCVLNodeBase):
@@ -55,11 +54,6 @@ class OCVLdrawMatchesNode(OCVLNodeBase):
         matches1to2_in = self.get_from_props("matches1to2_in")
         loc_max_distance_in = self.get_from_props("loc_max_distance_in")
 
-        good = []
-        for dmatch in matches1to2_in:
-            if dmatch.distance < loc_max_distance_in:
-                good.append(dmatch)
-
         draw_params = {
             'matchColor': self.get_from_props("matchColor_in"),
             'singlePointColor': self.get_from_props("singlePointColor_in"),
@@ -70,8 +64,9 @@ class OCVLdrawMatchesNode(OCVLNodeBase):
         if draw_params["matchesMask"] and self.is_uuid(draw_params["matchesMask"]):
             draw_params["matchesMask"] = None
 
-        drawMatches_partial = partial(cv2.drawMatches, img1, keypoints1_in, img2, keypoints2_in, good, None)
-        outImg_out = self.process_cv(fn=drawMatches_partial, kwargs=draw_params)
+        outImg_out = self.process_in_pool(
+            fn=draw_matches,
+            args=(img1, keypoints1_in, img2, keypoints2_in, matches1to2_in, loc_max_distance_in, draw_params))
         self.refresh_output_socket("outImg_out", outImg_out, is_uuid_type=True)
 
     def draw_buttons(self, context, layout):
@@ -12,6 +12,7 @@ class OCVLedgePreservingFilterNode(OCVLNodeBase):
 
     n_doc = "Filtering is the fundamental operation in image and video processing. Edge-preserving smoothing filters are used in many different applications."
     n_requirements = {"__and__": {"src_in": {"type": np.ndarray, "dtype": "uint8", "channels": 3}}}
+    n_memo_size = 8
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), description="Input image.")
     flags_in: bpy.props.BoolVectorProperty(default=[False for i in bl_flags_list.split(",")], size=len(bl_flags_list.split(",")), update=update_node, subtype="NONE", description=bl_flags_list)
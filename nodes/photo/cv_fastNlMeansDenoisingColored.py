@@ -9,6 +9,7 @@ class OCVLfastNlMeansDenoisingColoredNode(OCVLNodeBase):
 
     n_doc = "Modification of fastNlMeansDenoising function for colored images."
     n_requirements = {"__and__": ["src_in"]}
+    n_memo_size = 8
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), update=update_node, description="Input 8-bit 3-channel image.")
     templateWindowSize_in: bpy.props.IntProperty(name="templateWindowSize_in", default=7, min=1, max=124, update=update_node, description="Size in pixels of the template patch that is used to compute weights. Should be odd. Recommended value 7 pixels.")
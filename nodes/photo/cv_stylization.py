@@ -10,6 +10,7 @@ class OCVLstylizationNode(OCVLNodeBase):
 
     n_doc = "Stylization aims to produce digital imagery with a wide variety of effects not focused on photorealism. Edge-aware filters are ideal for stylization, as they can abstract regions of low contrast while preserving, or enhancing, high-contrast features."
     n_requirements = {"__and__": {"src_in": {"type": np.ndarray, "dtype": "uint8", "channels": 3}}}
+    n_memo_size = 8
 
     src_in: bpy.props.StringProperty(name="src_in", default=str(uuid.uuid4()), description="Input 8-bit 3-channel image.")
     sigma_s_in: bpy.props.FloatProperty(name="sigma_s_in ", default=5., min=0, max=200, update=update_node, description="Range between 0 to 200.")
@@ -3,8 +3,13 @@ import os
 
 import numpy as np
 import bpy
+from ocvl.core import settings
 from ocvl.core.exceptions import LackRequiredSocketException
-from ocvl.core.image_utils import convert_to_gl_image
+from ocvl.core.graph_export import export_node_tree, save_graph
+from ocvl.core.image_utils import convert_to_gl_image, write_blender_pixels
+from ocvl.core.profiling import (cancel_cprofile, export_chrome_trace, get_profile, is_trace_recording,
+                                 request_cprofile, start_trace)
+from ocvl.core.scheduler import get_scheduler
 from ocvl.core.scene_utils import filter_areas
 from ocvl.core.register_utils import ocvl_register, ocvl_unregister
 
@@ -24,7 +29,7 @@ class OCVL_OT_ImageFullScreenOperator(bpy.types.Operator):
         gl_img_data = convert_to_gl_image(img_data)
         height, width = img_data.shape[:2]
         bl_img = bpy.data.images.new(img_name, width, height)
-        bl_img.pixels = list(gl_img_data.flat)
+        write_blender_pixels(bl_img, gl_img_data)
         return bl_img
 
     def execute(self, context):
@@ -116,14 +121,113 @@ class OCVL_OT_SaveArrayToCSVOperator(bpy.types.Operator):
         return self.execute(context)
 
 
+class OCVL_OT_ExportGraphOperator(bpy.types.Operator):
+    bl_idname = "ocvl.export_graph"
+    bl_label = "Export graph"
+    bl_options = {'REGISTER'}
+
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    filepath: bpy.props.StringProperty(
+        name="File Path",
+        description="Filepath of graph for headless runtime",
+        maxlen=1024, default="", subtype='FILE_PATH'
+    )
+
+    def execute(self, context):
+        node_tree = context.space_data.edit_tree
+        if node_tree is None:
+            return {'CANCELLED'}
+        filepath = self.filepath if self.filepath.endswith(".json") else self.filepath + ".json"
+        graph = export_node_tree(node_tree)
+        save_graph(graph, filepath)
+        self.report({'INFO'}, f"Graph with {len(graph['nodes'])} nodes exported to: {filepath}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "{}.json".format(context.space_data.edit_tree.name)
+        wm = context.window_manager
+        wm.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+
+class OCVL_OT_ProfileNodeOperator(bpy.types.Operator):
+    bl_idname = "ocvl.profile_node"
+    bl_label = "Profile node"
+    bl_description = "Process node under cProfile, report is written to text block"
+    bl_options = {'REGISTER'}
+
+    origin: bpy.props.StringProperty("")
+
+    def execute(self, context):
+        node_tree, node_name = self.origin.split('|><|')[:2]
+        node = bpy.data.node_groups[node_tree].nodes[node_name]
+        if not settings.IS_NODE_PROFILING:
+            self.report({'WARNING'}, "Profiling is disabled (OCVL_PROFILING=0)")
+            return {'CANCELLED'}
+        # Node runs here on main thread: not scheduled (async tree), not restored from disk cache, not pruned
+        request_cprofile(node.node_key)
+        try:
+            node.process_single(force=True, use_disk_cache=False)
+        finally:
+            cancel_cprofile(node.node_key)
+        get_scheduler(node.id_data).process_downstream(node)
+        text_name = "cProfile_{}".format(node_name)
+        text = bpy.data.texts.get(text_name) or bpy.data.texts.new(text_name)
+        text.from_string(get_profile(node.node_key).cprofile)
+        self.report({'INFO'}, f"cProfile report in text block: {text_name}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        return self.execute(context)
+
+
+class OCVL_OT_ProfileTraceOperator(bpy.types.Operator):
+    bl_idname = "ocvl.profile_trace"
+    bl_label = "Record trace"
+    bl_description = "Start recording of tree evaluations, next call save them as Chrome trace"
+    bl_options = {'REGISTER'}
+
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    filepath: bpy.props.StringProperty(
+        name="File Path",
+        description="Filepath of Chrome trace (chrome://tracing, Perfetto)",
+        maxlen=1024, default="", subtype='FILE_PATH'
+    )
+
+    def execute(self, context):
+        filepath = self.filepath if self.filepath.endswith(".json") else self.filepath + ".json"
+        count = export_chrome_trace(filepath)
+        self.report({'INFO'}, f"Trace with {count} events saved to: {filepath}")
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        if not is_trace_recording():
+            start_trace()
+            self.report({'INFO'}, "Trace recording started")
+            return {'FINISHED'}
+        if not self.filepath:
+            self.filepath = "ocvl_trace.json"
+        wm = context.window_manager
+        wm.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
 
 def register():
     ocvl_register(OCVL_OT_ImageFullScreenOperator)
     ocvl_register(OCVL_OT_ImageImporterOperator)
     ocvl_register(OCVL_OT_SaveArrayToCSVOperator)
+    ocvl_register(OCVL_OT_ExportGraphOperator)
+    ocvl_register(OCVL_OT_ProfileNodeOperator)
+    ocvl_register(OCVL_OT_ProfileTraceOperator)
 
 
 def unregister():
+    ocvl_unregister(OCVL_OT_ProfileTraceOperator)
+    ocvl_unregister(OCVL_OT_ProfileNodeOperator)
+    ocvl_unregister(OCVL_OT_ExportGraphOperator)
     ocvl_unregister(OCVL_OT_SaveArrayToCSVOperator)
     ocvl_unregister(OCVL_OT_ImageImporterOperator)
     ocvl_unregister(OCVL_OT_ImageFullScreenOperator)
@@ -0,0 +1,10 @@
+"""
+Headless runtime: process node tree exported by ocvl.export_graph operator without Blender.
+
+    from ocvl.runtime import GraphRuntime
+
+    with GraphRuntime.from_file("pipeline.json") as runtime:
+        runtime.run()
+        image = runtime.get_value("blur", "dst_in")
+"""
+from ocvl.runtime.executor import GraphRuntime
@@ -0,0 +1,141 @@
+"""
+Command line: python -m ocvl_addon.runtime pipeline.json --save "Blur.dst_in=out.png" --set "Image.loc_filepath=in.png"
+Batch: python -m ocvl_addon.runtime pipeline.json --batch "Image=photos/*.jpg" --write "Blur.dst_in" --output-dir out
+Stream: python -m ocvl_addon.runtime pipeline.json --stream "Video=movie.mp4" --write "Blur.dst_in" --stages 3
+"""
+import os
+import argparse
+import json
+import logging
+import sys
+
+import cv2
+import numpy as np
+
+from ocvl.core.profiling import export_chrome_trace, start_trace
+from ocvl.runtime import GraphRuntime
+from ocvl.runtime.batch import BatchRunner, collect_files, write_image
+from ocvl.runtime.pipeline import Pipeline, iter_video_frames
+
+
+def parse_assignment(text):
+    target, _, value = text.partition("=")
+    node_name, _, socket_name = target.rpartition(".")
+    if not node_name or not value:
+        raise argparse.ArgumentTypeError("Expected NODE.NAME=VALUE, got: {}".format(text))
+    return node_name, socket_name, value
+
+
+def parse_value(value):
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def parse_socket(text):
+    node_name, _, socket_name = text.rpartition(".")
+    if not node_name:
+        raise argparse.ArgumentTypeError("Expected NODE.SOCKET, got: {}".format(text))
+    return node_name, socket_name
+
+
+def print_progress(report, filepath):
+    print("\r{}".format(report), end="", file=sys.stderr, flush=True)
+
+
+def run_batch(runtime, args):
+    source, _, pattern = args.batch.partition("=")
+    filepaths = collect_files(pattern)
+    if not filepaths:
+        print("No images for: {}".format(pattern), file=sys.stderr)
+        return 1
+    runner = BatchRunner(runtime, source, outputs=args.write, output_dir=args.output_dir,
+                         extension=args.extension, on_progress=print_progress)
+    report = runner.run(filepaths)
+    print(file=sys.stderr)
+    for filepath, message in report.failures:
+        print("Failed {}: {}".format(filepath, message), file=sys.stderr)
+    print(report)
+    return 1 if report.failures else 0
+
+
+def run_stream(graph, args):
+    source, _, stream = args.stream.partition("=")
+    stream = int(stream) if stream.isdigit() else stream
+    os.makedirs(args.output_dir, exist_ok=True)
+    failed = 0
+    with Pipeline.from_file(graph, source=source, outputs=args.write, stages=args.stages) as pipeline:
+        for index, values, errors in pipeline.run(iter_video_frames(stream, limit=args.frames)):
+            for node_name, error in errors.items():
+                print("Frame {} error in node {}: {}".format(index, node_name, error), file=sys.stderr)
+            failed += bool(errors)
+            for (node_name, socket_name), image in values.items():
+                if isinstance(image, np.ndarray):
+                    name = "{}_{}_{:06d}{}".format(node_name, socket_name, index, args.extension)
+                    write_image(os.path.join(args.output_dir, name), image)
+        print("{} frames, {} failed, {:.2f} frames/s".format(pipeline.stats["frames"], failed, pipeline.stats["fps"]))
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="ocvl.runtime", description="Process OCVL graph without Blender.")
+    parser.add_argument("graph", help="Graph file exported from node editor.")
+    parser.add_argument("--set", dest="properties", action="append", default=[], type=parse_assignment,
+                        help="Override node property: NODE.PROPERTY=VALUE (VALUE as JSON or string).")
+    parser.add_argument("--save", action="append", default=[], type=parse_assignment,
+                        help="Save image from socket: NODE.SOCKET=PATH.")
+    parser.add_argument("--print", dest="prints", action="append", default=[],
+                        help="Print value from socket: NODE.SOCKET.")
+    parser.add_argument("--batch", help="Run graph for every image: NODE=DIRECTORY or NODE=GLOB, NODE is image sample node.")
+    parser.add_argument("--stream", help="Run graph as pipeline for every frame: NODE=MOVIE, NODE=URL or NODE=CAMERA, "
+                                             "NODE is image or video sample node.")
+    parser.add_argument("--stages", type=int, default=None, help="In stream mode number of pipeline stages.")
+    parser.add_argument("--frames", type=int, default=None, help="In stream mode maximum number of frames.")
+    parser.add_argument("--write", action="append", default=[], type=parse_socket,
+                        help="In batch and stream mode save image from socket for every input: NODE.SOCKET.")
+    parser.add_argument("--output-dir", default="ocvl_output", help="In batch and stream mode directory for written images.")
+    parser.add_argument("--extension", default=".png", help="In batch and stream mode format of written images.")
+    parser.add_argument("--trace", help="Save Chrome trace of processing to file (chrome://tracing, Perfetto).")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    if args.trace:
+        start_trace()
+    try:
+        return run(args)
+    finally:
+        if args.trace:
+            export_chrome_trace(args.trace)
+
+
+def run(args):
+    if args.stream:
+        return run_stream(args.graph, args)
+
+    with GraphRuntime.from_file(args.graph) as runtime:
+        for node_name, prop_name, value in args.properties:
+            runtime.set_property(node_name, prop_name, parse_value(value))
+        if args.batch:
+            return run_batch(runtime, args)
+        errors = runtime.run()
+        for node_name, error in errors.items():
+            print("Error in node {}: {}".format(node_name, error), file=sys.stderr)
+
+        for node_name, socket_name, path in args.save:
+            image = runtime.get_value(node_name, socket_name)
+            if not isinstance(image, np.ndarray):
+                print("Socket {}.{} has no image".format(node_name, socket_name), file=sys.stderr)
+                errors[node_name] = "No image"
+                continue
+            cv2.imwrite(path, image)
+
+        for target in args.prints:
+            node_name, _, socket_name = target.rpartition(".")
+            print("{}: {}".format(target, runtime.get_value(node_name, socket_name)))
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
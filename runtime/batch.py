@@ -0,0 +1,206 @@
+"""
+Batch processing: one graph run for every image from directory or glob.
+
+OCVLImageSampleNode in FILE mode is bound to files, next images are decoded ahead on background
+threads (ocvl.core.globals.PREFETCHED_IMAGES) and chosen outputs are written by thread pool,
+so graph on main thread wait neither for disk nor for codecs.
+
+    with GraphRuntime.from_file("pipeline.json") as runtime:
+        runner = BatchRunner(runtime, "Image", outputs=[("Blur", "dst_in")], output_dir="out")
+        report = runner.run(collect_files("photos/*.jpg"))
+"""
+import glob
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+
+import cv2
+import numpy as np
+
+from ocvl.core import settings
+from ocvl.core.globals import PREFETCHED_IMAGES
+
+
+logger = getLogger(__name__)
+
+
+SOURCE_NODE_CLASS = "OCVLImageSampleNode"
+
+
+def collect_files(pattern):
+    """
+    :param pattern: <string> directory (images with settings.BATCH_IMAGE_EXTENSIONS) or glob pattern
+    :return: <list> sorted file paths
+    """
+    if os.path.isdir(pattern):
+        paths = [os.path.join(pattern, name) for name in os.listdir(pattern)
+                 if os.path.splitext(name)[1].lower() in settings.BATCH_IMAGE_EXTENSIONS]
+    else:
+        paths = glob.glob(pattern, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def read_image(filepath):
+    """Decode like OCVLImageSampleNode. cv2.imread don't support unicode paths on Windows, buffer is decoded."""
+    buffer = np.fromfile(filepath, dtype=np.uint8)
+    return cv2.imdecode(buffer, cv2.IMREAD_UNCHANGED)
+
+
+def write_image(filepath, image):
+    extension = os.path.splitext(filepath)[1]
+    success, buffer = cv2.imencode(extension, image)
+    if not success:
+        raise ValueError("Image can't be encoded as {}".format(extension))
+    buffer.tofile(filepath)
+
+
+class BatchReport:
+    """
+    Progress and result of batch.
+
+    :param total: <int> number of images
+    :param processed: <int> images processed without error
+    :param failures: <list> (file path, message)
+    :param elapsed: <float> seconds from start
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.processed = 0
+        self.failures = []
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def done(self):
+        return self.processed + len(self.failures)
+
+    @property
+    def throughput(self):
+        """Images per second."""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    def tick(self):
+        self.elapsed = time.perf_counter() - self.start
+
+    def __str__(self):
+        return "{}/{} images, {} failed, {:.1f} s, {:.2f} images/s".format(
+            self.done, self.total, len(self.failures), self.elapsed, self.throughput)
+
+
+class BatchRunner:
+    """
+    Run graph for many images.
+
+    :param runtime: <GraphRuntime>
+    :param source: <string> name of OCVLImageSampleNode, switched to FILE mode
+    :param outputs: <list> (node name, socket name) written for every image
+    :param output_dir: <string> directory for written outputs
+    :param name_format: <string> name of output file, keys: stem, node, socket
+    :param extension: <string> format of written outputs
+    :param prefetch: <int> images decoded ahead
+    :param decode_workers: <int> threads for decode
+    :param write_workers: <int> threads for write
+    :param on_progress: function(report, filepath) called after every image
+    """
+
+    def __init__(self, runtime, source, outputs=(), output_dir=None, name_format="{stem}_{node}_{socket}",
+                 extension=".png", prefetch=None, decode_workers=None, write_workers=None, on_progress=None):
+        self.runtime = runtime
+        self.source = runtime.nodes[source]
+        if self.source.bl_idname != SOURCE_NODE_CLASS:
+            raise ValueError("Node {} is not {}".format(source, SOURCE_NODE_CLASS))
+        self.outputs = list(outputs)
+        self.output_dir = output_dir
+        self.name_format = name_format
+        self.extension = extension
+        self.prefetch = max(prefetch or settings.BATCH_PREFETCH_IMAGES, 1)
+        self.decode_workers = max(decode_workers or settings.BATCH_DECODE_WORKERS, 1)
+        self.write_workers = max(write_workers or settings.BATCH_WRITE_WORKERS, 1)
+        self.on_progress = on_progress
+        if self.outputs and not self.output_dir:
+            raise ValueError("output_dir is required to write outputs")
+        runtime.expose_outputs(self.outputs)
+
+    def get_output_path(self, filepath, node_name, socket_name):
+        stem = os.path.splitext(os.path.basename(filepath))[0]
+        name = self.name_format.format(stem=stem, node=node_name, socket=socket_name)
+        return os.path.join(self.output_dir, name + self.extension)
+
+    def run(self, filepaths):
+        """
+        :param filepaths: <list> images, see collect_files
+        :return: <BatchReport>
+        """
+        report = BatchReport(len(filepaths))
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        self.source.loc_image_mode = "FILE"
+        self.source.loc_name_image = ""
+
+        queue = deque()
+        pending_writes = deque()
+        paths = iter(filepaths)
+        with ThreadPoolExecutor(self.decode_workers, thread_name_prefix="ocvl_decode") as decoder, \
+                ThreadPoolExecutor(self.write_workers, thread_name_prefix="ocvl_write") as writer:
+
+            def fill_queue():
+                while len(queue) < self.prefetch:
+                    path = next(paths, None)
+                    if path is None:
+                        return
+                    queue.append((path, decoder.submit(read_image, path)))
+
+            fill_queue()
+            while queue:
+                filepath, future = queue.popleft()
+                fill_queue()
+                try:
+                    self.process_one(filepath, future.result(), writer, pending_writes)
+                    report.processed += 1
+                except Exception as e:
+                    logger.debug("Batch image {} failed".format(filepath), exc_info=True)
+                    report.failures.append((filepath, str(e)))
+                self.collect_writes(pending_writes, report, limit=self.write_workers * 4)
+                report.tick()
+                if self.on_progress is not None:
+                    self.on_progress(report, filepath)
+
+            self.collect_writes(pending_writes, report, limit=0)
+        report.tick()
+        return report
+
+    def process_one(self, filepath, image, writer, pending_writes):
+        if image is None:
+            raise ValueError("Image can't be decoded")
+        PREFETCHED_IMAGES[filepath] = image
+        try:
+            self.source.loc_filepath = filepath
+            errors = self.runtime.run([self.source.name])
+        finally:
+            PREFETCHED_IMAGES.pop(filepath, None)
+        if errors:
+            raise RuntimeError("; ".join("{}: {}".format(name, error) for name, error in errors.items()))
+
+        for node_name, socket_name in self.outputs:
+            value = self.runtime.get_value(node_name, socket_name)
+            if not isinstance(value, np.ndarray):
+                raise ValueError("Socket {}.{} has no image".format(node_name, socket_name))
+            # Socket cache replace arrays by new ones on next run, writer keep reference to this one
+            path = self.get_output_path(filepath, node_name, socket_name)
+            pending_writes.append((filepath, writer.submit(write_image, path, value)))
+
+    @staticmethod
+    def collect_writes(pending_writes, report, limit):
+        """Wait for oldest writes until at most limit are pending, memory of outputs is bounded."""
+        while pending_writes and (len(pending_writes) > limit or pending_writes[0][1].done()):
+            filepath, future = pending_writes.popleft()
+            try:
+                future.result()
+            except Exception as e:
+                if any(path == filepath for path, _ in report.failures):
+                    continue
+                report.failures.append((filepath, "Write failed: {}".format(e)))
+                report.processed -= 1
@@ -0,0 +1,121 @@
+"""
+Execution of portable graph without Blender.
+
+Every node is processed by its own wrapped_process, in topological order by TreeScheduler,
+so result is the same like in node editor. Previews are not made (settings.IS_HEADLESS).
+"""
+from logging import getLogger
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.graph_export import check_graph, load_graph
+from ocvl.core.scheduler import TreeScheduler
+from ocvl.runtime import shim
+from ocvl.runtime.graph import build_node_tree
+
+
+logger = getLogger(__name__)
+
+
+class GraphRuntime:
+    """
+    Runtime for one graph.
+
+    :param graph: <dict> graph in portable format
+    :param tree_name: <string> key of data in SOCKET_DATA_CACHE, must be unique if many runtimes work in one process
+    :param outputs: <list> (node name, socket name) outputs which keep data without links, None - every output
+    :param workers: <int> worker threads for independent nodes, None - settings.NODE_EXECUTOR_WORKERS
+    :param evaluation_mode: <string> {'PUSH', 'PULL'}, PULL process only upstream of outputs, None - from settings
+    """
+
+    def __init__(self, graph, tree_name=None, outputs=None, workers=None, evaluation_mode=None):
+        shim.install()
+        settings.IS_HEADLESS = True
+        self.graph = check_graph(graph)
+        self.node_tree = build_node_tree(graph, tree_name=tree_name)
+        self.node_tree.evaluation_mode = evaluation_mode or settings.EVALUATION_MODE
+        self.scheduler = TreeScheduler(self.node_tree.name, workers=workers)
+        # Nodes which start downstream pass by themselves (video sample) use scheduler of runtime
+        ocvl_globals.TREE_SCHEDULERS[self.node_tree.name] = self.scheduler
+        self.expose_outputs(outputs)
+
+    @classmethod
+    def from_file(cls, filepath, **kwargs):
+        return cls(load_graph(filepath), **kwargs)
+
+    @property
+    def nodes(self):
+        return self.node_tree.nodes
+
+    @property
+    def source_nodes(self):
+        return [node for node in self.nodes if not any(socket.links for socket in node.inputs)]
+
+    def expose_outputs(self, outputs=None):
+        for node in self.nodes:
+            for socket in node.outputs:
+                socket.is_exposed = outputs is None or (node.name, socket.name) in outputs
+
+    def set_property(self, node_name, prop_name, value):
+        setattr(self.nodes[node_name], prop_name, value)
+
+    def run(self, nodes=None):
+        """
+        Process graph. Nodes from argument and sources are always processed, downstream nodes
+        with unchanged inputs are skipped.
+
+        :param nodes: <list> names of changed nodes, None - every source node
+        :return: <dict> node name -> error message, only nodes with error
+        """
+        roots = [self.nodes[name] for name in nodes] if nodes is not None else self.source_nodes
+        self.scheduler.process_many(roots)
+        return self.errors
+
+    @property
+    def errors(self):
+        return {node.name: node.n_error for node in self.nodes if node.n_error}
+
+    @property
+    def profiles(self):
+        """:return: <dict> node name -> summary of profile (see ocvl.core.profiling), times in milliseconds"""
+        profiles = {}
+        for node in self.nodes:
+            profile = ocvl_globals.NODE_PROFILES.get(node.node_key)
+            if profile is not None:
+                profiles[node.name] = profile.summary()
+        return profiles
+
+    def get_value(self, node_name, socket_name):
+        """
+        Data of output socket, for input socket data of linked output.
+
+        :return: value (ndarray for image sockets), None if node don't made data
+        """
+        node = self.nodes[node_name]
+        socket = node.outputs.get(socket_name)
+        if socket is None:
+            socket = node.inputs[socket_name].other
+            if socket is None:
+                return getattr(node, socket_name, None)
+        tree_data = ocvl_globals.SOCKET_DATA_CACHE.get(self.node_tree.name, {})
+        if socket.socket_id not in tree_data:
+            return None
+        value = tree_data[socket.socket_id]
+        if isinstance(value, str):
+            return ocvl_globals.SOCKET_DATA_CACHE.get(value)
+        if isinstance(value, list) and len(value) == 1 and isinstance(value[0], list) and len(value[0]) == 1:
+            return value[0][0]
+        return value
+
+    def close(self):
+        """Release data of graph from SOCKET_DATA_CACHE."""
+        ocvl_globals.SOCKET_DATA_CACHE.drop_tree(self.node_tree.name)
+        ocvl_globals.TREE_SCHEDULERS.pop(self.node_tree.name, None)
+        for node in self.nodes:
+            ocvl_globals.NODE_FINGERPRINTS.pop(node.node_key, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,291 @@
+"""
+Headless node tree build from portable graph (see ocvl.core.graph_export).
+
+Sockets, links and node tree mimic part of Blender API used by nodes: collections by name and index,
+sv_get/sv_set with data in SOCKET_DATA_CACHE like ocvl.core.sockets. Nodes are instances
+of real OCVL node classes, loaded from files like AutoRegisterNodeCategories do it.
+"""
+import os
+from logging import getLogger
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.exceptions import LackRequiredSocketException
+from ocvl.core.link_index import get_socket_id, get_upstream_socket_id, invalidate_link_index
+from ocvl.core.node_manifest import exec_node_module, get_addon_path
+from ocvl.runtime import shim
+
+
+logger = getLogger(__name__)
+
+
+NODE_MODULES = {}
+NODE_CLASSES_INDEX = {}
+
+
+class HeadlessCollection(list):
+    """List with access by name like bpy_prop_collection."""
+
+    def get(self, key, default=None):
+        for item in self:
+            if item.name == key:
+                return item
+        return default
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            item = self.get(key)
+            if item is None:
+                raise KeyError(key)
+            return item
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return self.get(key) is not None
+        return super().__contains__(key)
+
+    def keys(self):
+        return [item.name for item in self]
+
+
+class HeadlessSocket:
+    """
+    :param node: <OCVLNodeBase> owner of socket
+    :param is_exposed: <bool> output without links which keep data, so runtime can return it
+    """
+
+    def __init__(self, node, name, bl_idname, is_output, identifier=None, prop_name=""):
+        self.node = node
+        self.name = name
+        self.identifier = identifier or name
+        self.bl_idname = bl_idname
+        self.is_output = is_output
+        self.prop_name = prop_name
+        self.links = []
+        self.is_exposed = False
+        self.hide = False
+        self.enabled = True
+
+    def __repr__(self):
+        return "<HeadlessSocket {}.{}>".format(self.node.name, self.name)
+
+    def as_pointer(self):
+        return id(self)
+
+    @property
+    def id_data(self):
+        return self.node.id_data
+
+    @property
+    def is_linked(self):
+        return bool(self.links) or self.is_exposed
+
+    @property
+    def socket_id(self):
+        return get_socket_id(self.id_data.name, self.node.name, self.identifier)
+
+    @property
+    def other(self):
+        if not self.links:
+            return None
+        return self.links[0].to_socket if self.is_output else self.links[0].from_socket
+
+    @property
+    def index(self):
+        sockets = self.node.outputs if self.is_output else self.node.inputs
+        return sockets.index(self)
+
+    def sv_set(self, data):
+        cache = ocvl_globals.SOCKET_DATA_CACHE
+        tree_name = self.id_data.name
+        if tree_name not in cache:
+            cache[tree_name] = {}
+        cache[tree_name][self.socket_id] = data
+
+    def sv_get(self):
+        socket_id = get_upstream_socket_id(self)
+        tree_data = ocvl_globals.SOCKET_DATA_CACHE.get(self.id_data.name, {})
+        if socket_id is None or socket_id not in tree_data:
+            raise LackRequiredSocketException(self)
+        return tree_data[socket_id]
+
+
+class HeadlessSockets(HeadlessCollection):
+
+    def __init__(self, node, is_output):
+        super().__init__()
+        self.node = node
+        self.is_output = is_output
+
+    def new(self, bl_idname, name, identifier=None):
+        socket = HeadlessSocket(self.node, name, bl_idname, self.is_output, identifier=identifier)
+        self.append(socket)
+        return socket
+
+    def remove(self, socket):
+        for link in list(socket.links):
+            self.node.id_data.links.remove(link)
+        super().remove(socket)
+
+
+class HeadlessLink:
+
+    def __init__(self, from_socket, to_socket):
+        self.from_socket = from_socket
+        self.to_socket = to_socket
+        self.is_valid = True
+
+    @property
+    def from_node(self):
+        return self.from_socket.node
+
+    @property
+    def to_node(self):
+        return self.to_socket.node
+
+
+class HeadlessLinks(list):
+
+    def __init__(self, node_tree):
+        super().__init__()
+        self.node_tree = node_tree
+
+    def new(self, from_socket, to_socket):
+        invalidate_link_index(self.node_tree.name)
+        link = HeadlessLink(from_socket, to_socket)
+        from_socket.links.append(link)
+        to_socket.links.append(link)
+        self.append(link)
+        return link
+
+    def remove(self, link):
+        invalidate_link_index(self.node_tree.name)
+        link.from_socket.links.remove(link)
+        link.to_socket.links.remove(link)
+        super().remove(link)
+
+
+class HeadlessNodeTree:
+
+    def __init__(self, name):
+        self.name = name
+        self.bl_idname = settings.OCVL_NODE_TREE_TYPE
+        self.evaluation_mode = settings.EVALUATION_MODE
+        self.nodes = HeadlessCollection()
+        self.links = HeadlessLinks(self)
+
+    def __repr__(self):
+        return "<HeadlessNodeTree {}>".format(self.name)
+
+    def as_pointer(self):
+        return id(self)
+
+
+def load_node_module(addon_module, module_path):
+    """Load node file like AutoRegisterNodeCategories, every file only once."""
+    key = (addon_module, module_path)
+    if key in NODE_MODULES:
+        return NODE_MODULES[key]
+    shim.install()
+    mod = exec_node_module(addon_module, module_path)
+    NODE_MODULES[key] = mod
+    return mod
+
+
+def find_class_in_module(mod, bl_idname):
+    for obj in vars(mod).values():
+        if isinstance(obj, type) and obj.__module__ == mod.__name__ and \
+                (obj.__name__ == bl_idname or getattr(obj, "bl_idname", None) == bl_idname):
+            return obj
+    return None
+
+
+def index_node_classes(addon_module="ocvl"):
+    """Load every node file of addon, used when graph don't keep module of node."""
+    addon_path = get_addon_path(addon_module)
+    nodes_path = os.path.join(addon_path, settings.NAME_NODE_DIRECTORY)
+    for dir_path, dir_names, file_names in os.walk(nodes_path):
+        dir_names[:] = [name for name in dir_names if name not in settings.BLACK_LIST_REGISTER_NODE_CATEGORY]
+        for file_name in file_names:
+            if not file_name.endswith(".py") or file_name.startswith(("__", "abc")):
+                continue
+            module_path = os.path.relpath(os.path.join(dir_path, file_name), addon_path)
+            try:
+                mod = load_node_module(addon_module, module_path)
+            except Exception as e:
+                logger.debug("Node module {} not loaded: {}".format(module_path, e))
+                continue
+            for obj in vars(mod).values():
+                if isinstance(obj, type) and obj.__module__ == mod.__name__ and hasattr(obj, "wrapped_process"):
+                    NODE_CLASSES_INDEX[obj.__name__] = obj
+
+
+def get_node_class(node_data):
+    bl_idname = node_data["bl_idname"]
+    cls = None
+    if node_data.get("module"):
+        cls = find_class_in_module(load_node_module(node_data.get("addon") or "ocvl", node_data["module"]), bl_idname)
+    if cls is None:
+        if not NODE_CLASSES_INDEX:
+            index_node_classes()
+        cls = NODE_CLASSES_INDEX.get(bl_idname)
+    if cls is None:
+        raise LookupError("Node class {} not found".format(bl_idname))
+    cls.bl_idname = cls.bl_idname or cls.__name__
+    return cls
+
+
+def create_node(node_tree, node_data):
+    """
+    Create instance of node class without Blender.
+    Properties get defaults from annotations, next values from graph.
+    """
+    cls = get_node_class(node_data)
+    node = cls.__new__(cls)
+    for prop_name, spec in shim.get_property_specs(cls).items():
+        node.__dict__[prop_name] = spec.default
+    node.__dict__.update({
+        "name": node_data["name"],
+        "label": node_data.get("label", ""),
+        "bl_idname": node_data["bl_idname"],
+        "id_data": node_tree,
+        "location": list(node_data.get("location", (0, 0))),
+        "width": node_data.get("width", 200),
+        "hide": False,
+        "parent": None,
+        "n_id": "",
+        "n_meta": "",
+        "n_error": "",
+        "n_error_line": 0,
+        "inputs": HeadlessSockets(node, is_output=False),
+        "outputs": HeadlessSockets(node, is_output=True),
+    })
+    for prop_name, value in node_data.get("properties", {}).items():
+        node.__dict__[prop_name] = value
+    for sockets, sockets_data in ((node.inputs, node_data.get("inputs", [])), (node.outputs, node_data.get("outputs", []))):
+        for socket_data in sockets_data:
+            socket = sockets.new(socket_data["bl_idname"], socket_data["name"], socket_data.get("identifier"))
+            socket.prop_name = socket_data.get("prop_name", "")
+    return node
+
+
+def build_node_tree(graph, tree_name=None):
+    """
+    Build headless node tree from graph.
+
+    :param graph: <dict> graph in portable format
+    :param tree_name: <string> name of tree, default name from graph; key of tree data in SOCKET_DATA_CACHE
+    :return: <HeadlessNodeTree>
+    """
+    node_tree = HeadlessNodeTree(tree_name or graph.get("name", "NodeTree"))
+    for node_data in graph.get("nodes", []):
+        node_tree.nodes.append(create_node(node_tree, node_data))
+    for link_data in graph.get("links", []):
+        from_node = node_tree.nodes.get(link_data["from_node"])
+        to_node = node_tree.nodes.get(link_data["to_node"])
+        if from_node is None or to_node is None:
+            logger.warning("Link {} skipped, node not exists".format(link_data))
+            continue
+        node_tree.links.new(from_node.outputs[link_data["from_socket"]], to_node.inputs[link_data["to_socket"]])
+    return node_tree
@@ -0,0 +1,342 @@
+"""
+Pipelined execution of graph over stream of frames.
+
+Graph is split into stages (groups of consecutive topological levels), every stage is own GraphRuntime
+with own node instances and runs on own thread, so frame N+1 is in stage 1 while frame N is in stage 2.
+Stages are connected by bounded queues (backpressure: fast stage wait for slow one) and take frames
+in order, so results come in order of frames. Throughput depends on slowest stage, not on sum of them.
+
+Between stages values of outputs are moved in packets: arrays (data of UUID sockets) are passed by reference
+and stored in SOCKET_DATA_CACHE of next stage under new UUID. Stage threads hold BATON like main thread,
+but release it for cv2 call (see ocvl.core.parallel.stage_thread), so cv2 work of stages overlap.
+
+Frames come to source node (OCVLImageSampleNode, OCVLVideoSampleNode): source node is not processed,
+frame is put to its image_out, width_out and height_out outputs.
+
+    with Pipeline.from_file("camera.json", source="Video", outputs=[("Canny", "edges_out")]) as pipeline:
+        for index, values, errors in pipeline.run(iter_video_frames(0)):
+            ...
+"""
+import queue
+import threading
+import time
+from logging import getLogger
+
+import cv2
+import numpy as np
+
+from ocvl.core import settings
+from ocvl.core import globals as ocvl_globals
+from ocvl.core.graph_export import check_graph, load_graph
+from ocvl.core.parallel import BATON, stage_thread
+from ocvl.core.socket_cache import new_data_handle
+from ocvl.runtime.executor import GraphRuntime
+
+
+logger = getLogger(__name__)
+
+
+_END = object()
+
+
+def iter_video_frames(source, limit=None):
+    """
+    Frames of movie file, stream url or camera device, read on feed thread of pipeline.
+
+    :param source: <string> path, url or <int> camera device
+    :param limit: <int> maximum number of frames, None - until end of stream
+    """
+    capture = cv2.VideoCapture(source)
+    try:
+        count = 0
+        while capture.isOpened() and (limit is None or count < limit):
+            success, frame = capture.read()
+            if not success:
+                break
+            count += 1
+            yield frame
+    finally:
+        capture.release()
+
+
+def graph_levels(graph, skip=()):
+    """
+    Names of nodes grouped by topological level (longest path from sources).
+
+    :param skip: <list> names of nodes left out, their links are ignored
+    """
+    names = [node["name"] for node in graph["nodes"] if node["name"] not in skip]
+    parents = {name: set() for name in names}
+    for link in graph.get("links", []):
+        if link["from_node"] in parents and link["to_node"] in parents:
+            parents[link["to_node"]].add(link["from_node"])
+    level_of = {}
+    remaining = list(names)
+    while remaining:
+        ready = [name for name in remaining if all(parent in level_of for parent in parents[name])]
+        if not ready:
+            # Cycle, rest of nodes go to last level
+            ready = remaining
+            parents = {name: set() for name in names}
+        for name in ready:
+            level_of[name] = max((level_of[parent] + 1 for parent in parents[name] if parent in level_of), default=0)
+        remaining = [name for name in remaining if name not in level_of]
+    levels = [[] for _ in range(max(level_of.values(), default=-1) + 1)]
+    for name in names:
+        levels[level_of[name]].append(name)
+    return levels
+
+
+def split_stages(graph, count, skip=()):
+    """
+    Group consecutive levels into count stages with similar number of nodes.
+
+    :return: <list> of lists of node names
+    """
+    levels = graph_levels(graph, skip=skip)
+    count = max(min(count, len(levels)), 1)
+    total = sum(len(level) for level in levels)
+    stages = [[]]
+    done = 0
+    for index, level in enumerate(levels):
+        levels_left = len(levels) - index
+        stages_left = count - len(stages)
+        if stages[-1] and (done >= total * len(stages) / count or levels_left <= stages_left):
+            stages.append([])
+        stages[-1].extend(level)
+        done += len(level)
+    return stages
+
+
+class Packet:
+    """
+    Frame moving through stages.
+
+    :param index: <int> number of frame
+    :param values: <dict> (node name, socket name) -> value of output, arrays for UUID sockets
+    :param uuid_sockets: <set> keys of values which are data of UUID sockets
+    :param results: <dict> (node name, socket name) -> value of requested outputs
+    :param errors: <dict> node name -> error message
+    """
+    __slots__ = ("index", "values", "uuid_sockets", "results", "errors")
+
+    def __init__(self, index):
+        self.index = index
+        self.values = {}
+        self.uuid_sockets = set()
+        self.results = {}
+        self.errors = {}
+
+
+class Stage:
+    """
+    Part of graph with own runtime, nodes of earlier stages are there only as producers of inputs.
+
+    :param nodes: <list> names of nodes processed by stage
+    :param inputs: <list> (node name, socket name) outputs of earlier stages read by stage
+    :param forward: <list> keys of packet values needed by later stages
+    :param outputs: <list> requested outputs of nodes from stage
+    :param busy: <float> seconds of work
+    """
+
+    def __init__(self, graph, nodes, tree_name, forward, outputs, workers):
+        self.nodes = list(nodes)
+        names = set(self.nodes)
+        links = [link for link in graph.get("links", []) if link["to_node"] in names]
+        producers = {link["from_node"] for link in links} - names
+        self.inputs = sorted({(link["from_node"], link["from_socket"]) for link in links
+                              if link["from_node"] in producers})
+        self.forward = list(forward)
+        self.outputs = [output for output in outputs if output[0] in names]
+        boundary = [key for key in self.forward if key[0] in names]
+        self.exported = boundary
+        subgraph = dict(graph, nodes=[node for node in graph["nodes"] if node["name"] in names | producers],
+                        links=links, reroutes=[])
+        self.runtime = GraphRuntime(subgraph, tree_name=tree_name, outputs=boundary + self.outputs, workers=workers)
+        self.roots = [name for name in self.nodes
+                      if not any(link["to_node"] == name and link["from_node"] in names for link in links)]
+        self.injected = {}
+        self.busy = 0.0
+
+    def inject(self, packet):
+        """Put values from packet to outputs of producers in tree of stage."""
+        cache = ocvl_globals.SOCKET_DATA_CACHE
+        tree_name = self.runtime.node_tree.name
+        for node_name, socket_name in self.inputs:
+            key = node_name, socket_name
+            if key not in packet.values:
+                continue
+            socket = self.runtime.nodes[node_name].outputs[socket_name]
+            value = packet.values[key]
+            if key in packet.uuid_sockets:
+                uuid_ = new_data_handle()
+                cache.set(uuid_, value, tree=tree_name, node=node_name, refs=len(socket.links))
+                socket.sv_set(uuid_)
+                old_uuid = self.injected.get(key)
+                if old_uuid is not None:
+                    cache.pop(old_uuid, None)
+                self.injected[key] = uuid_
+            else:
+                socket.sv_set(value)
+
+    def collect(self, packet):
+        """Put values of exported outputs and requested outputs to packet."""
+        tree_data = ocvl_globals.SOCKET_DATA_CACHE.get(self.runtime.node_tree.name, {})
+        for node_name, socket_name in self.exported:
+            socket = self.runtime.nodes[node_name].outputs[socket_name]
+            if socket.socket_id not in tree_data:
+                continue
+            value = tree_data[socket.socket_id]
+            if isinstance(value, str) and value in ocvl_globals.SOCKET_DATA_CACHE:
+                packet.values[node_name, socket_name] = ocvl_globals.SOCKET_DATA_CACHE.get(value)
+                packet.uuid_sockets.add((node_name, socket_name))
+            else:
+                packet.values[node_name, socket_name] = value
+        for node_name, socket_name in self.outputs:
+            packet.results[node_name, socket_name] = self.runtime.get_value(node_name, socket_name)
+        for key in list(packet.values):
+            if key not in self.forward:
+                packet.values.pop(key)
+                packet.uuid_sockets.discard(key)
+
+    def process(self, packet):
+        start = time.perf_counter()
+        with BATON:
+            self.inject(packet)
+        errors = self.runtime.run(self.roots)
+        with BATON:
+            packet.errors.update({name: error for name, error in errors.items() if name in self.nodes})
+            self.collect(packet)
+        self.busy += time.perf_counter() - start
+        return packet
+
+    def close(self):
+        self.runtime.close()
+
+
+class Pipeline:
+    """
+    Pipelined runtime for graph.
+
+    :param graph: <dict> graph in portable format
+    :param source: <string> name of source node, frames are put to its outputs
+    :param outputs: <list> (node name, socket name) returned for every frame
+    :param stages: <int> number of stages or <list> of lists of node names, None - settings.PIPELINE_STAGES
+    :param queue_size: <int> frames waiting between two stages
+    :param workers: <int> worker threads in every stage for independent nodes
+    :param stats: <dict> frames, wall, fps, busy time of stages
+    """
+
+    def __init__(self, graph, source, outputs=(), stages=None, queue_size=None, workers=1, tree_name=None):
+        self.graph = check_graph(graph)
+        self.source = source
+        if source not in {node["name"] for node in graph["nodes"]}:
+            raise KeyError("Source node {} not in graph".format(source))
+        self.outputs = [tuple(output) for output in outputs]
+        self.queue_size = max(queue_size or settings.PIPELINE_QUEUE_SIZE, 1)
+        if stages is None or isinstance(stages, int):
+            stages = split_stages(graph, stages or settings.PIPELINE_STAGES, skip=(source,))
+        tree_name = tree_name or graph.get("name", "NodeTree")
+        self.stages = []
+        for index, nodes in enumerate(stages):
+            later = {name for names in stages[index + 1:] for name in names}
+            forward = sorted({(link["from_node"], link["from_socket"]) for link in graph.get("links", [])
+                              if link["to_node"] in later and link["from_node"] not in later})
+            self.stages.append(Stage(graph, nodes, "{}#stage{}".format(tree_name, index), forward,
+                                     self.outputs, workers))
+        self.stats = {}
+
+    @classmethod
+    def from_file(cls, filepath, **kwargs):
+        return cls(load_graph(filepath), **kwargs)
+
+    def make_packet(self, index, frame):
+        packet = Packet(index)
+        packet.values[self.source, "image_out"] = frame
+        packet.uuid_sockets.add((self.source, "image_out"))
+        packet.values[self.source, "height_out"] = [[frame.shape[0]]]
+        packet.values[self.source, "width_out"] = [[frame.shape[1]]]
+        return packet
+
+    def run(self, frames):
+        """
+        Process frames, generator of results in order of frames.
+
+        :param frames: iterable of ndarrays
+        :return: generator of (<int> index, <dict> (node, socket) -> value, <dict> node -> error)
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        stop = threading.Event()
+        failures = []
+
+        def feed():
+            try:
+                for index, frame in enumerate(frames):
+                    if stop.is_set():
+                        break
+                    queues[0].put(self.make_packet(index, np.asarray(frame)))
+            except Exception as e:
+                failures.append(e)
+                stop.set()
+            finally:
+                queues[0].put(_END)
+
+        def work(stage, input_queue, output_queue):
+            with stage_thread():
+                while True:
+                    packet = input_queue.get()
+                    if packet is _END:
+                        break
+                    if stop.is_set():
+                        continue
+                    try:
+                        output_queue.put(stage.process(packet))
+                    except Exception as e:
+                        logger.exception("Pipeline stage {} failed".format(stage.runtime.node_tree.name))
+                        failures.append(e)
+                        stop.set()
+            output_queue.put(_END)
+
+        threads = [threading.Thread(target=feed, name="ocvl_pipeline_feed", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            threads.append(threading.Thread(target=work, args=(stage, queues[index], queues[index + 1]),
+                                            name="ocvl_pipeline_stage{}".format(index), daemon=True))
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        frames_done = 0
+        try:
+            while True:
+                packet = queues[-1].get()
+                if packet is _END:
+                    break
+                if stop.is_set():
+                    continue
+                frames_done += 1
+                yield packet.index, packet.results, packet.errors
+        finally:
+            stop.set()
+            # Consumer can stop early, queues are drained so blocked threads finish
+            while any(thread.is_alive() for thread in threads):
+                for item_queue in queues:
+                    try:
+                        item_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+                time.sleep(0.001)
+            wall = time.perf_counter() - start
+            self.stats = {"frames": frames_done, "wall": wall, "fps": frames_done / wall if wall > 0 else 0.0,
+                          "stages": [{"nodes": stage.nodes, "busy": stage.busy} for stage in self.stages]}
+        if failures:
+            raise failures[0]
+
+    def close(self):
+        for stage in self.stages:
+            stage.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,230 @@
+"""
+Minimal stand-in of Blender modules (bpy, bgl, gpu, gpu_extras, blf, mathutils, nodeitems_utils).
+
+Node classes are defined as subclasses of bpy.types.Node with bpy.props annotations, so they need
+bpy at import time. Outside Blender this shim is installed in sys.modules, so node modules can be
+imported and their wrapped_process reused with only cv2 and NumPy. Properties become PropertySpec
+objects, their defaults are used by runtime to initialize node instances.
+"""
+import importlib.util
+import sys
+import types
+
+
+BLENDER_MODULES = ("bpy", "bgl", "gpu", "gpu_extras", "blf", "mathutils", "nodeitems_utils")
+
+
+class Anything:
+    """Object which accept every call and attribute access, used for GL and UI calls."""
+
+    def __call__(self, *args, **kwargs):
+        return Anything()
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Anything()
+
+    def __iter__(self):
+        return iter(())
+
+    def __bool__(self):
+        return False
+
+    def __getitem__(self, key):
+        return Anything()
+
+
+class StubModule(types.ModuleType):
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return Anything()
+
+
+class PropertyCollection(list):
+    """Replacement of bpy_prop_collection of CollectionProperty."""
+
+    def add(self):
+        item = types.SimpleNamespace(name="")
+        self.append(item)
+        return item
+
+    def remove(self, index):
+        del self[index]
+
+
+class PropertySpec:
+    """
+    Replacement of bpy.props.*Property result.
+
+    :param kind: <string> name of property function, example: IntProperty
+    :param kwargs: <dict> arguments of property
+    """
+
+    def __init__(self, kind, *args, **kwargs):
+        self.kind = kind
+        self.kwargs = kwargs
+
+    @property
+    def default(self):
+        if "default" in self.kwargs:
+            default = self.kwargs["default"]
+            return list(default) if isinstance(default, (tuple, list)) else default
+        if self.kind == "EnumProperty":
+            items = self.kwargs.get("items")
+            if isinstance(items, (list, tuple)) and items:
+                return items[0][0]
+            return ""
+        if self.kind == "CollectionProperty":
+            return PropertyCollection()
+        if self.kind.endswith("VectorProperty"):
+            size = self.kwargs.get("size", 3)
+            return [False if self.kind.startswith("Bool") else 0] * size
+        return {
+            "BoolProperty": False,
+            "IntProperty": 0,
+            "FloatProperty": 0.0,
+            "StringProperty": "",
+        }.get(self.kind)
+
+
+def property_factory(kind):
+    def factory(*args, **kwargs):
+        return PropertySpec(kind, *args, **kwargs)
+    factory.__name__ = kind
+    return factory
+
+
+class RNAProperty:
+
+    def __init__(self, identifier, spec):
+        self.identifier = identifier
+        self.spec = spec
+        self.is_runtime = True
+        self.type = spec.kind.replace("Property", "").upper()
+
+
+def get_property_specs(cls):
+    """Property specs from annotations of class and its bases, subclass override base."""
+    specs = {}
+    for klass in reversed(cls.__mro__):
+        for name, spec in getattr(klass, "__annotations__", {}).items():
+            if isinstance(spec, PropertySpec):
+                specs[name] = spec
+    return specs
+
+
+class StructRNA:
+
+    def __init__(self, cls):
+        self.identifier = cls.__name__
+        self.properties = [RNAProperty(name, spec) for name, spec in get_property_specs(cls).items()]
+
+
+class BlRNADescriptor:
+
+    def __get__(self, instance, owner):
+        return StructRNA(owner)
+
+
+class Struct:
+    bl_rna = BlRNADescriptor()
+
+    def get(self, key, default=None):
+        return self.__dict__.get("_id_properties", {}).get(key, default)
+
+    def __getitem__(self, key):
+        return self.__dict__.setdefault("_id_properties", {})[key]
+
+    def __setitem__(self, key, value):
+        self.__dict__.setdefault("_id_properties", {})[key] = value
+
+    def as_pointer(self):
+        return id(self)
+
+
+class SpaceNodeEditor(Struct):
+
+    @staticmethod
+    def draw_handler_add(*args, **kwargs):
+        return None
+
+    @staticmethod
+    def draw_handler_remove(*args, **kwargs):
+        return None
+
+
+def persistent(fn):
+    return fn
+
+
+def build_bpy():
+    bpy = StubModule("bpy")
+    bpy.__path__ = []
+
+    bpy_types = StubModule("bpy.types")
+    for name in ("Node", "NodeSocket", "NodeTree", "Operator", "Menu", "PropertyGroup", "Panel", "Header"):
+        setattr(bpy_types, name, type(name, (Struct,), {}))
+    bpy_types.SpaceNodeEditor = SpaceNodeEditor
+
+    bpy_props = types.ModuleType("bpy.props")
+    for kind in ("BoolProperty", "BoolVectorProperty", "IntProperty", "IntVectorProperty", "FloatProperty",
+                 "FloatVectorProperty", "StringProperty", "EnumProperty", "PointerProperty", "CollectionProperty"):
+        setattr(bpy_props, kind, property_factory(kind))
+    bpy_props.__all__ = [name for name in dir(bpy_props) if name.endswith("Property")]
+
+    bpy_app = StubModule("bpy.app")
+    bpy_app.__path__ = []
+    bpy_app_handlers = StubModule("bpy.app.handlers")
+    bpy_app_handlers.persistent = persistent
+    bpy_app_handlers.load_post = []
+    bpy_app_handlers.frame_change_pre = []
+    bpy_app.handlers = bpy_app_handlers
+    bpy_app.background = True
+
+    bpy_utils = StubModule("bpy.utils")
+    bpy_utils.register_class = lambda cls: None
+    bpy_utils.unregister_class = lambda cls: None
+
+    bpy.types = bpy_types
+    bpy.props = bpy_props
+    bpy.app = bpy_app
+    bpy.utils = bpy_utils
+    bpy.data = types.SimpleNamespace(images={}, node_groups={}, texts={}, window_managers=[])
+
+    return {
+        "bpy": bpy,
+        "bpy.types": bpy_types,
+        "bpy.props": bpy_props,
+        "bpy.app": bpy_app,
+        "bpy.app.handlers": bpy_app_handlers,
+        "bpy.utils": bpy_utils,
+    }
+
+
+def is_blender_available():
+    return "bpy" in sys.modules and not isinstance(sys.modules["bpy"], StubModule) or \
+        importlib.util.find_spec("bpy") is not None
+
+
+def install():
+    """
+    Install stand-in modules when real Blender modules are not available.
+
+    :return: <bool> True if shim was installed
+    """
+    if isinstance(sys.modules.get("bpy"), StubModule):
+        return True
+    if is_blender_available():
+        return False
+
+    modules = build_bpy()
+    for name in BLENDER_MODULES[1:]:
+        modules[name] = StubModule(name)
+    gpu_extras = modules["gpu_extras"]
+    gpu_extras.__path__ = []
+    modules["gpu_extras.batch"] = gpu_extras.batch = StubModule("gpu_extras.batch")
+    sys.modules.update(modules)
+    return True